@@ -0,0 +1,92 @@
+import argparse
+import numpy as np
+from helper_files import (
+    DEFAULT_GRID_RESOLUTION,
+    LOOKUP_TABLE_POLICY_FILE_EXTENSION,
+    TRAINED_MODELS_DIRECTORY,
+    compile_lookup_table_policy,
+    load_shared_model,
+    return_disagreement_rate,
+    return_sense_broadcast_observation_samples,
+)
+
+parser = argparse.ArgumentParser(
+    description="Compile a trained policy into a lookup table of actions"
+)
+
+parser.add_argument(
+    "--model_name",
+    type=str,
+    default="sense_broadcast_model",
+    help="Name of the saved policy to compile (default=sense_broadcast_model)",
+)
+parser.add_argument(
+    "--model_type",
+    type=str,
+    default="NumpyPolicy",
+    choices=["DQN", "NumpyPolicy"],
+    help="Model class the policy is loaded as (default=NumpyPolicy)",
+)
+parser.add_argument(
+    "--models_directory",
+    type=str,
+    default=TRAINED_MODELS_DIRECTORY,
+    help="Directory the policy is read from and the table written to",
+)
+parser.add_argument(
+    "--grid_resolution",
+    type=int,
+    nargs=3,
+    default=list(DEFAULT_GRID_RESOLUTION),
+    help=(
+        "Grid points for the ratio of cells observed, the opinion and the "
+        "collective opinion "
+        f"(default={' '.join(map(str, DEFAULT_GRID_RESOLUTION))})"
+    ),
+)
+parser.add_argument(
+    "--num_of_samples",
+    type=int,
+    default=100000,
+    help=(
+        "Random observations the disagreement rate is measured over " "(default=100000)"
+    ),
+)
+parser.add_argument(
+    "--seed",
+    type=int,
+    default=None,
+    help="Seed for the disagreement rate observations (default=None)",
+)
+
+args = parser.parse_args()
+
+
+if __name__ == "__main__":
+    policy = load_shared_model(
+        args.model_name,
+        models_directory=args.models_directory,
+        model_type=args.model_type,
+    )
+    lookup_table_policy = compile_lookup_table_policy(
+        policy, grid_resolution=args.grid_resolution
+    )
+    lookup_table_policy_path = (
+        f"{args.models_directory}/{args.model_name}"
+        f"{LOOKUP_TABLE_POLICY_FILE_EXTENSION}"
+    )
+    lookup_table_policy.save(lookup_table_policy_path)
+
+    disagreement_rate = return_disagreement_rate(
+        lookup_table_policy,
+        policy,
+        return_sense_broadcast_observation_samples(
+            args.num_of_samples, np.random.default_rng(args.seed)
+        ),
+    )
+
+    print(
+        f"{lookup_table_policy_path}: grid resolution {tuple(args.grid_resolution)}, "
+        f"{lookup_table_policy.actions.nbytes} bytes, "
+        f"disagreement rate {disagreement_rate:.4%}"
+    )
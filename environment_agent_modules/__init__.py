@@ -2,7 +2,36 @@ from .tile_properties import *
 from .utils import *
 from .swarm_agent import SwarmAgent
 from .malicious_agent import MaliciousAgent
+from .navigation import (
+    DIRECTION_DELTAS,
+    NAVIGATION_ACTION_HANDLERS,
+    return_next_cell_coordinate,
+)
+from .noise_model import NoiseModel, return_flip_mask
+from .adversary_strategies import (
+    ADVERSARY_STRATEGIES,
+    ADVERSARY_STRATEGY_HANDLERS,
+)
+from .opinion_fusion import (
+    OPINION_WEIGHT_HANDLERS,
+    OpinionFusion,
+    return_opinion_weight_handler,
+)
+from .visited_cells import VisitedCells, return_visited_cells
+from .swarm_state import SwarmState
+from .policy_inference import (
+    ACTION_CACHE_COUNTER,
+    ActionCache,
+    return_greedy_actions,
+    return_epsilon_greedy_actions,
+    choose_sense_broadcast_actions,
+    choose_commit_decision_actions,
+)
 from .swarm_agent_enums import *
+from .tile_grid import EMPTY_TILE, PackedColourArray, Tile, TileGrid
+from .chunked_tile_grid import ChunkedTileGrid, LazyChunkedArray
+from .environment_prefetcher import EnvironmentPrefetcher
+from .environment_corpus import EnvironmentCorpus, generate_environment_corpus
 from .tiled_environment import (
     create_nonclustered_tile_grid,
     create_clustered_inital_observation_useful_tile_grid,
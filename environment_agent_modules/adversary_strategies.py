@@ -0,0 +1,37 @@
+import numpy as np
+from typing import Any, Callable, Dict
+
+
+def return_fixed_wrong_opinions(swarm_state: Any) -> np.ndarray:
+    return swarm_state.malicious_opinions[: swarm_state.num_of_malicious_agents]
+
+
+def return_random_opinions(swarm_state: Any) -> np.ndarray:
+    return swarm_state.random_number_generator.integers(
+        2, size=swarm_state.num_of_malicious_agents
+    )
+
+
+def return_mimic_then_flip_opinions(swarm_state: Any) -> np.ndarray:
+    """
+    Broadcasts the opposite of the malicious opinion, as an honest agent
+    that had found the correct opinion would, until adversary_flip_step
+    ticks have passed, then the malicious opinion.
+    """
+
+    malicious_opinions = return_fixed_wrong_opinions(swarm_state)
+
+    if swarm_state.num_of_steps < swarm_state.adversary_flip_step:
+        return 1 - malicious_opinions
+
+    return malicious_opinions
+
+
+# opinions the malicious agents of a SwarmState broadcast on a tick, for each
+# adversary strategy
+ADVERSARY_STRATEGY_HANDLERS: Dict[str, Callable[[Any], np.ndarray]] = {
+    "fixed_wrong_opinion": return_fixed_wrong_opinions,
+    "random_opinion": return_random_opinions,
+    "mimic_then_flip": return_mimic_then_flip_opinions,
+}
+ADVERSARY_STRATEGIES = tuple(ADVERSARY_STRATEGY_HANDLERS)
@@ -0,0 +1,268 @@
+import numpy as np
+from typing import Any, Callable, Dict, List, Tuple, Union
+from .tile_properties import WallType
+from .tile_grid import EMPTY_TILE, WALL_BITMASK_TO_WALLS, TileGrid
+
+CHUNK_SIZE = 64
+
+
+def return_chunk_slices(
+    shape: Tuple[int, int], chunk_row: int, chunk_column: int
+) -> Tuple[slice, slice]:
+    return (
+        slice(chunk_row * CHUNK_SIZE, min((chunk_row + 1) * CHUNK_SIZE, shape[0])),
+        slice(
+            chunk_column * CHUNK_SIZE, min((chunk_column + 1) * CHUNK_SIZE, shape[1])
+        ),
+    )
+
+
+def return_num_of_chunks(shape: Tuple[int, int]) -> Tuple[int, int]:
+    return -(-shape[0] // CHUNK_SIZE), -(-shape[1] // CHUNK_SIZE)
+
+
+def return_chunk_sizes(shape: Tuple[int, int]) -> np.ndarray:
+    """
+    Number of tiles in each chunk, indexed by (chunk_row, chunk_column).
+    """
+
+    num_of_chunk_rows, num_of_chunk_columns = return_num_of_chunks(shape)
+    chunk_heights = np.minimum(
+        shape[0] - np.arange(num_of_chunk_rows) * CHUNK_SIZE, CHUNK_SIZE
+    )
+    chunk_widths = np.minimum(
+        shape[1] - np.arange(num_of_chunk_columns) * CHUNK_SIZE, CHUNK_SIZE
+    )
+
+    return np.outer(chunk_heights, chunk_widths)
+
+
+def return_wall_bitmask(row: Any, column: Any, width: int, height: int) -> Any:
+    """
+    Wall bitmask of a tile (or of a block of tiles when row and column are
+    broadcastable arrays), matching return_wall_bitmask_grid.
+    """
+
+    return (
+        ((row == 0) << WallType.TOP_WALL.value)
+        | ((column == width - 1) << WallType.RIGHT_WALL.value)
+        | ((row == height - 1) << WallType.BOTTOM_WALL.value)
+        | ((column == 0) << WallType.LEFT_WALL.value)
+    )
+
+
+class LazyChunkedArray:
+    """
+    2D array stored as CHUNK_SIZE x CHUNK_SIZE blocks that are only
+    allocated when first needed. With a chunk_factory, a chunk is built by
+    chunk_factory(chunk_row, chunk_column) the first time it is read;
+    without one, unallocated chunks read as fill_value and are only
+    allocated when written to.
+    """
+
+    def __init__(
+        self,
+        shape: Tuple[int, int],
+        dtype: Any,
+        chunk_factory: Union[Callable[[int, int], np.ndarray], None] = None,
+        fill_value: int = 0,
+    ) -> None:
+        self.shape = shape
+        self.size = shape[0] * shape[1]
+        self.dtype = np.dtype(dtype)
+        self.chunk_factory = chunk_factory
+        self.fill_value = fill_value
+        self.chunks: Dict[Tuple[int, int], np.ndarray] = {}
+
+    def return_chunk(
+        self, chunk_row: int, chunk_column: int, allocate: bool = True
+    ) -> Union[np.ndarray, None]:
+        chunk = self.chunks.get((chunk_row, chunk_column))
+
+        if chunk is None and (allocate or self.chunk_factory is not None):
+            if self.chunk_factory is None:
+                rows, columns = return_chunk_slices(self.shape, chunk_row, chunk_column)
+                chunk = np.full(
+                    (rows.stop - rows.start, columns.stop - columns.start),
+                    self.fill_value,
+                    dtype=self.dtype,
+                )
+            else:
+                chunk = np.asarray(
+                    self.chunk_factory(chunk_row, chunk_column), dtype=self.dtype
+                )
+
+            self.chunks[(chunk_row, chunk_column)] = chunk
+
+        return chunk
+
+    def __getitem__(self, key: Tuple[Any, Any]) -> Any:
+        row, column = key
+
+        if isinstance(row, slice) or isinstance(column, slice):
+            return self.return_region(row, column)
+
+        chunk = self.return_chunk(
+            row // CHUNK_SIZE, column // CHUNK_SIZE, allocate=False
+        )
+
+        if chunk is None:
+            return self.dtype.type(self.fill_value)
+
+        return chunk[row % CHUNK_SIZE, column % CHUNK_SIZE]
+
+    def __setitem__(self, key: Tuple[int, int], value: Any) -> None:
+        row, column = key
+
+        self.return_chunk(row // CHUNK_SIZE, column // CHUNK_SIZE)[
+            row % CHUNK_SIZE, column % CHUNK_SIZE
+        ] = value
+
+    def return_region(
+        self, rows: Union[slice, int], columns: Union[slice, int]
+    ) -> np.ndarray:
+        """
+        Copy of a rectangular region. Integer indices keep their axis, so
+        the result is always 2D.
+        """
+
+        row_start, row_stop, _ = (
+            rows if isinstance(rows, slice) else slice(rows, rows + 1)
+        ).indices(self.shape[0])
+        column_start, column_stop, _ = (
+            columns if isinstance(columns, slice) else slice(columns, columns + 1)
+        ).indices(self.shape[1])
+
+        region = np.full(
+            (max(0, row_stop - row_start), max(0, column_stop - column_start)),
+            self.fill_value,
+            dtype=self.dtype,
+        )
+
+        if not region.size:
+            return region
+
+        for chunk_row in range(
+            row_start // CHUNK_SIZE, (row_stop - 1) // CHUNK_SIZE + 1
+        ):
+            for chunk_column in range(
+                column_start // CHUNK_SIZE, (column_stop - 1) // CHUNK_SIZE + 1
+            ):
+                chunk = self.return_chunk(chunk_row, chunk_column, allocate=False)
+
+                if chunk is None:
+                    continue
+
+                chunk_rows, chunk_columns = return_chunk_slices(
+                    self.shape, chunk_row, chunk_column
+                )
+                first_row = max(row_start, chunk_rows.start)
+                last_row = min(row_stop, chunk_rows.stop)
+                first_column = max(column_start, chunk_columns.start)
+                last_column = min(column_stop, chunk_columns.stop)
+
+                region[
+                    first_row - row_start : last_row - row_start,
+                    first_column - column_start : last_column - column_start,
+                ] = chunk[
+                    first_row - chunk_rows.start : last_row - chunk_rows.start,
+                    first_column
+                    - chunk_columns.start : last_column
+                    - chunk_columns.start,
+                ]
+
+        return region
+
+
+class ChunkedTileGrid(TileGrid):
+    """
+    TileGrid backend for huge arenas with few agents. Colour, occupancy and
+    walls are LazyChunkedArrays, so only the chunks agents enter or sense
+    are ever allocated. The environment generators install a colour chunk
+    factory rather than writing colours, which lets an unvisited chunk cost
+    nothing while staying reproducible. There is no GridSkeleton.
+    """
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width, self.height = width, height
+        self.skeleton = None
+        self.colour = LazyChunkedArray(
+            (height, width), np.uint8, chunk_factory=self.return_empty_colour_chunk
+        )
+        self.walls = LazyChunkedArray(
+            (height, width), np.uint8, chunk_factory=self.return_wall_chunk
+        )
+        self.occupancy = LazyChunkedArray(
+            (height, width), np.int32, fill_value=EMPTY_TILE
+        )
+        self.agents: List[Any] = []
+        self.agent_indices: Dict[Any, int] = {}
+        self.white_tile_count: Union[int, None] = 0
+
+    @property
+    def num_of_white_tiles(self) -> int:
+        if self.white_tile_count is None:
+            self.white_tile_count = self.count_white_tiles()
+
+        return self.white_tile_count
+
+    @num_of_white_tiles.setter
+    def num_of_white_tiles(self, num_of_white_tiles: int) -> None:
+        self.white_tile_count = num_of_white_tiles
+
+    def return_empty_colour_chunk(
+        self, chunk_row: int, chunk_column: int
+    ) -> np.ndarray:
+        rows, columns = return_chunk_slices(self.shape, chunk_row, chunk_column)
+        return np.zeros((rows.stop - rows.start, columns.stop - columns.start))
+
+    def return_wall_chunk(self, chunk_row: int, chunk_column: int) -> np.ndarray:
+        rows, columns = return_chunk_slices(self.shape, chunk_row, chunk_column)
+
+        return return_wall_bitmask(
+            row=np.arange(rows.start, rows.stop)[:, np.newaxis],
+            column=np.arange(columns.start, columns.stop),
+            width=self.width,
+            height=self.height,
+        )
+
+    def set_colour_chunk_factory(
+        self,
+        colour_chunk_factory: Callable[[int, int], np.ndarray],
+        num_of_white_tiles: Union[int, None] = None,
+    ) -> None:
+        """
+        Replaces the tile colours with colour_chunk_factory(chunk_row,
+        chunk_column). If num_of_white_tiles is not known it is counted the
+        first time it is read.
+        """
+
+        self.colour.chunk_factory = colour_chunk_factory
+        self.colour.chunks.clear()
+        self.white_tile_count = num_of_white_tiles
+
+    def count_white_tiles(self) -> int:
+        num_of_chunk_rows, num_of_chunk_columns = return_num_of_chunks(self.shape)
+
+        # unallocated chunks are built and dropped rather than kept
+        return sum(
+            int(
+                np.count_nonzero(
+                    self.colour.chunks.get((chunk_row, chunk_column))
+                    if (chunk_row, chunk_column) in self.colour.chunks
+                    else self.colour.chunk_factory(chunk_row, chunk_column)
+                )
+            )
+            for chunk_row in range(num_of_chunk_rows)
+            for chunk_column in range(num_of_chunk_columns)
+        )
+
+    def return_walls(self, coordinate: Tuple[int, int]) -> Tuple[int, ...]:
+        return WALL_BITMASK_TO_WALLS[
+            return_wall_bitmask(
+                row=coordinate[0],
+                column=coordinate[1],
+                width=self.width,
+                height=self.height,
+            )
+        ]
@@ -0,0 +1,176 @@
+import os
+import numpy as np
+from typing import Callable, Dict, List, Union
+from .tile_grid import TileGrid, return_grid_skeleton
+
+CORPUS_COLOURS_FILE_NAME = "colours.npy"
+CORPUS_INDEX_FILE_NAME = "index.npz"
+
+
+def generate_environment_corpus(
+    corpus_directory: str,
+    environment_type_map: Dict[str, Callable[..., TileGrid]],
+    ratios_of_white_to_black_tiles: List[float],
+    num_of_grids: int,
+    width: int,
+    height: int,
+    seed: Union[int, None] = None,
+) -> None:
+    """
+    Writes num_of_grids tile colour grids for every environment type and
+    ratio into one uint8 .npy of shape
+    (environment types, ratios, grids, height, width), plus an index .npz
+    holding the environment type names, ratios and white tile counts.
+    """
+
+    os.makedirs(corpus_directory, exist_ok=True)
+
+    environment_type_names = list(environment_type_map)
+
+    colours = np.lib.format.open_memmap(
+        f"{corpus_directory}/{CORPUS_COLOURS_FILE_NAME}",
+        mode="w+",
+        dtype=np.uint8,
+        shape=(
+            len(environment_type_names),
+            len(ratios_of_white_to_black_tiles),
+            num_of_grids,
+            height,
+            width,
+        ),
+    )
+
+    grid_seed_sequences = iter(
+        np.random.SeedSequence(seed).spawn(
+            colours.shape[0] * colours.shape[1] * num_of_grids
+        )
+    )
+
+    white_tile_counts = np.zeros(colours.shape[:3], dtype=np.int64)
+
+    for type_index, environment_type_name in enumerate(environment_type_names):
+        for ratio_index, ratio in enumerate(ratios_of_white_to_black_tiles):
+            for grid_index in range(num_of_grids):
+                tile_grid = environment_type_map[environment_type_name](
+                    width=width,
+                    height=height,
+                    ratio_of_white_to_black_tiles=ratio,
+                    random_number_generator=np.random.default_rng(
+                        next(grid_seed_sequences)
+                    ),
+                )
+
+                grid_key = (type_index, ratio_index, grid_index)
+                colours[grid_key] = tile_grid.colour
+                white_tile_counts[grid_key] = tile_grid.num_of_white_tiles
+
+    colours.flush()
+
+    np.savez(
+        f"{corpus_directory}/{CORPUS_INDEX_FILE_NAME}",
+        environment_type_names=np.array(environment_type_names),
+        ratios_of_white_to_black_tiles=np.array(ratios_of_white_to_black_tiles),
+        white_tile_counts=white_tile_counts,
+    )
+
+
+class EnvironmentCorpus:
+    """
+    Read-only view of a corpus written by generate_environment_corpus. The
+    colours are memory-mapped, so grids are served without copying and
+    several processes reading the same corpus share the page cache.
+    """
+
+    def __init__(self, corpus_directory: str) -> None:
+        self.colours = np.load(
+            f"{corpus_directory}/{CORPUS_COLOURS_FILE_NAME}", mmap_mode="r"
+        )
+
+        with np.load(f"{corpus_directory}/{CORPUS_INDEX_FILE_NAME}") as index:
+            self.environment_type_names = index["environment_type_names"].tolist()
+            self.ratios_of_white_to_black_tiles = index[
+                "ratios_of_white_to_black_tiles"
+            ]
+            self.white_tile_counts = index["white_tile_counts"]
+
+        self.num_of_grids, self.height, self.width = self.colours.shape[2:]
+
+    def return_ratio_index(self, ratio_of_white_to_black_tiles: float) -> int:
+        matching_ratios = np.flatnonzero(
+            np.isclose(
+                self.ratios_of_white_to_black_tiles, ratio_of_white_to_black_tiles
+            )
+        )
+
+        if not matching_ratios.size:
+            raise KeyError(
+                f"ratio {ratio_of_white_to_black_tiles} is not in the corpus "
+                f"{self.ratios_of_white_to_black_tiles.tolist()}"
+            )
+
+        return int(matching_ratios[0])
+
+    def return_tile_grid(
+        self,
+        environment_type_name: str,
+        ratio_of_white_to_black_tiles: float,
+        grid_index: int,
+    ) -> TileGrid:
+        grid_key = (
+            self.environment_type_names.index(environment_type_name),
+            self.return_ratio_index(ratio_of_white_to_black_tiles),
+            grid_index % self.num_of_grids,
+        )
+
+        return TileGrid(
+            colour=self.colours[grid_key],
+            skeleton=return_grid_skeleton(width=self.width, height=self.height),
+            num_of_white_tiles=int(self.white_tile_counts[grid_key]),
+        )
+
+    def return_environment_stream(
+        self, environment_type_name: str
+    ) -> "CorpusEnvironmentStream":
+        return CorpusEnvironmentStream(
+            environment_corpus=self, environment_type_name=environment_type_name
+        )
+
+
+class CorpusEnvironmentStream:
+    """
+    Drop-in replacement for a create_*_tile_grid function that returns the
+    corpus grids in order, so episode n of every configuration sees grid n.
+    """
+
+    def __init__(
+        self, environment_corpus: EnvironmentCorpus, environment_type_name: str
+    ) -> None:
+        self.environment_corpus = environment_corpus
+        self.environment_type_name = environment_type_name
+        self.grid_index = 0
+
+    def __call__(
+        self,
+        width: int,
+        height: int,
+        ratio_of_white_to_black_tiles: float = 0.5,
+        random_number_generator: Union[np.random.Generator, None] = None,
+    ) -> TileGrid:
+        if (height, width) != (
+            self.environment_corpus.height,
+            self.environment_corpus.width,
+        ):
+            raise ValueError(
+                f"corpus grids are {self.environment_corpus.height}x"
+                f"{self.environment_corpus.width}, not {height}x{width}"
+            )
+
+        tile_grid = self.environment_corpus.return_tile_grid(
+            environment_type_name=self.environment_type_name,
+            ratio_of_white_to_black_tiles=ratio_of_white_to_black_tiles,
+            grid_index=self.grid_index,
+        )
+
+        self.grid_index += 1
+
+        return tile_grid
@@ -0,0 +1,73 @@
+import queue
+import threading
+import numpy as np
+from typing import Any, Callable, Union
+from .utils import return_episode_random_number_generator
+
+
+class EnvironmentPrefetcher:
+    """
+    Builds the next queue_depth episode environments on a worker thread so
+    that reset() only has to take the next one off the queue. Episode n is
+    always built with a generator spawned n-th from the root seed (an int
+    or a SeedSequence), so the sequence of environments does not depend on
+    thread timing. Once the factory raises, every later call raises the
+    same error.
+    """
+
+    def __init__(
+        self,
+        environment_factory: Callable[[np.random.Generator], Any],
+        queue_depth: int = 2,
+        seed: Union[int, np.random.SeedSequence, None] = None,
+    ) -> None:
+        self.environment_factory = environment_factory
+        self.seed_sequence = (
+            seed
+            if isinstance(seed, np.random.SeedSequence)
+            else np.random.SeedSequence(seed)
+        )
+        self.prefetched_environments = queue.Queue(maxsize=queue_depth)
+        self.stop_event = threading.Event()
+        self.factory_error: Union[Exception, None] = None
+
+        self.worker = threading.Thread(target=self.build_environments, daemon=True)
+        self.worker.start()
+
+    def build_environments(self) -> None:
+        while not self.stop_event.is_set():
+            random_number_generator = return_episode_random_number_generator(
+                self.seed_sequence
+            )
+
+            try:
+                environment = self.environment_factory(random_number_generator)
+            except Exception as error:
+                environment = error
+
+            while not self.stop_event.is_set():
+                try:
+                    self.prefetched_environments.put(environment, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+
+            if isinstance(environment, Exception):
+                return
+
+    def return_next_environment(self) -> Any:
+        # the worker stops after a factory error, so nothing more is queued
+        if self.factory_error is not None:
+            raise self.factory_error
+
+        environment = self.prefetched_environments.get()
+
+        if isinstance(environment, Exception):
+            self.factory_error = environment
+            raise environment
+
+        return environment
+
+    def close(self) -> None:
+        self.stop_event.set()
+        self.worker.join()
@@ -0,0 +1,90 @@
+import numpy as np
+from typing import Any, Callable, Tuple
+from .utils import validate_cell
+from .swarm_agent_enums import Direction, Turn
+from .tile_grid import EMPTY_TILE, Tile, TileGrid
+
+# (row, column) step for each Direction value
+DIRECTION_DELTAS = tuple(
+    {
+        Direction.UP.value: (-1, 0),
+        Direction.RIGHT.value: (0, 1),
+        Direction.DOWN.value: (1, 0),
+        Direction.LEFT.value: (0, -1),
+    }[direction]
+    for direction in range(4)
+)
+DIRECTION_ROW_DELTAS, DIRECTION_COLUMN_DELTAS = np.array(
+    DIRECTION_DELTAS, dtype=np.int64
+).T
+
+# handler for each navigation action: forward, turn left, turn right
+NAVIGATION_ACTION_HANDLERS: Tuple[Callable[[Any, Any], None], ...] = (
+    lambda agent, tile_grid: agent.forward_step(tile_grid=tile_grid),
+    lambda agent, _: agent.turn(turn_type=Turn.LEFT.value),
+    lambda agent, _: agent.turn(turn_type=Turn.RIGHT.value),
+)
+
+
+def return_next_cell_coordinate(
+    cell: Tuple[int, int], direction: int
+) -> Tuple[int, int]:
+    row_delta, column_delta = DIRECTION_DELTAS[direction]
+    return cell[0] + row_delta, cell[1] + column_delta
+
+
+# navigation shared by SwarmAgent and MaliciousAgent, bound as methods of both
+
+
+def occupy_empty_cell(agent: Any, tile: Tile) -> bool:
+    tile_grid, cell = tile.tile_grid, tile.id
+
+    if tile_grid.occupancy[cell] == EMPTY_TILE:
+        tile_grid.occupancy[cell] = tile_grid.register_agent(agent)
+        agent.current_cell = cell
+        return True
+
+    return False
+
+
+def forward_step(agent: Any, tile_grid: TileGrid) -> None:
+    new_cell = return_next_cell_coordinate(
+        agent.current_cell, agent.current_direction_facing
+    )
+    old_cell = agent.current_cell
+
+    if validate_cell(
+        new_cell=new_cell, grid_shape=tile_grid.shape
+    ) and agent.occupy_cell(tile=tile_grid[new_cell]):
+        tile_grid.occupancy[old_cell] = EMPTY_TILE
+
+
+def turn(agent: Any, turn_type: int) -> None:
+    agent.current_direction_facing = (agent.current_direction_facing + turn_type) % 4
+
+
+def choose_navigation_action(agent: Any, tile_grid: TileGrid) -> int:
+    next_tile_coordinates = return_next_cell_coordinate(
+        agent.current_cell, agent.current_direction_facing
+    )
+
+    if validate_cell(new_cell=next_tile_coordinates, grid_shape=tile_grid.shape):
+        if tile_grid.occupancy[next_tile_coordinates] != EMPTY_TILE:
+            return int(agent.random_number_generator.integers(1, 3))
+
+        return 0
+
+    # agent is facing into a corner or wall
+    tile_walls = tile_grid.return_walls(agent.current_cell)
+
+    if len(tile_walls) == 1:
+        return int(agent.random_number_generator.integers(1, 3))
+
+    return 1 if tile_walls[0] == agent.current_direction_facing else 2
+
+
+def navigate(agent: Any, tile_grid: TileGrid) -> None:
+    agent.perform_navigation_action(
+        action=agent.choose_navigation_action(tile_grid=tile_grid),
+        tile_grid=tile_grid,
+    )
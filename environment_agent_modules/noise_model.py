@@ -0,0 +1,50 @@
+import numpy as np
+from typing import List, Union
+
+NOISE_BLOCK_SIZE = 1024
+
+
+class NoiseModel:
+    """
+    Flips binary readings (sensed tile colours or recieved opinions) with
+    probability noise. Flips are drawn NOISE_BLOCK_SIZE at a time from a
+    generator spawned off the agent's, and handed out one per reading, so
+    noisy readings do not cost a generator call each and do not shift the
+    agent's own random stream. With noise 0.0 nothing is spawned or drawn.
+    """
+
+    __slots__ = ("noise", "random_number_generator", "flips")
+
+    def __init__(
+        self, noise: float, random_number_generator: np.random.Generator
+    ) -> None:
+        self.noise = noise
+        self.random_number_generator = (
+            random_number_generator.spawn(1)[0] if noise else None
+        )
+        self.flips: List[bool] = []
+
+    def return_flip(self) -> bool:
+        if not self.noise:
+            return False
+
+        if not self.flips:
+            self.flips = (
+                self.random_number_generator.random(NOISE_BLOCK_SIZE) < self.noise
+            ).tolist()
+
+        return self.flips.pop()
+
+
+def return_flip_mask(
+    noise: np.ndarray, random_number_generator: np.random.Generator
+) -> Union[np.ndarray, bool]:
+    """
+    Which of a batch of readings with the given noise flip. Nothing is
+    drawn when every reading is noiseless.
+    """
+
+    if not noise.any():
+        return False
+
+    return random_number_generator.random(len(noise)) < noise
@@ -0,0 +1,170 @@
+import numpy as np
+from typing import Any, Callable, Dict
+
+# weight a swarm agent gives a recieved opinion, for each opinion weighting method
+OPINION_WEIGHT_HANDLERS: Dict[str, Callable[[Any, int], float]] = {
+    "list_of_weights": lambda agent, opinion: agent.opinion_weights[opinion],
+    "equation_based": lambda agent, opinion: (
+        agent.return_opinion_weight_based_on_equation(opinion)
+    ),
+    "inverted_equation_based": lambda agent, opinion: (
+        agent.return_opinion_weight_based_on_equation(1 - opinion)
+    ),
+}
+OPINION_WEIGHTING_METHODS = tuple(OPINION_WEIGHT_HANDLERS)
+
+
+def return_opinion_weight_handler(
+    opinion_weighting_method: str,
+) -> Callable[[Any, int], float]:
+    if opinion_weighting_method not in OPINION_WEIGHT_HANDLERS:
+        raise ValueError(
+            f"opinion_weighting_method must be one of {OPINION_WEIGHTING_METHODS}, "
+            f"got {opinion_weighting_method}"
+        )
+
+    return OPINION_WEIGHT_HANDLERS[opinion_weighting_method]
+
+
+class OpinionFusion:
+    """
+    Fuses recieved opinions into the collective opinions of a batch of
+    agents. opinion_weights and max_new_opinion_weighting are read at
+    fusion time, so they can be updated in place.
+    """
+
+    def __init__(
+        self,
+        opinion_weighting_method: str,
+        opinion_weights: np.ndarray,
+        max_new_opinion_weighting: np.ndarray,
+    ) -> None:
+        return_opinion_weight_handler(opinion_weighting_method)
+
+        self.opinion_weighting_method = opinion_weighting_method
+        self.opinion_weights = opinion_weights
+        self.max_new_opinion_weighting = max_new_opinion_weighting
+        self.has_fixed_weights = opinion_weighting_method == "list_of_weights"
+        self.return_opinion_weights = {
+            "list_of_weights": self.return_listed_opinion_weights,
+            "equation_based": self.return_equation_based_opinion_weights,
+            "inverted_equation_based": (
+                self.return_inverted_equation_based_opinion_weights
+            ),
+        }[opinion_weighting_method]
+
+    def return_listed_opinion_weights(
+        self, agent_indices: Any, opinions: Any, calculated_collective_opinion: Any
+    ) -> Any:
+        return self.opinion_weights[agent_indices, opinions]
+
+    def return_equation_based_opinion_weights(
+        self, agent_indices: Any, opinions: Any, calculated_collective_opinion: Any
+    ) -> Any:
+        return self.max_new_opinion_weighting[agent_indices] * (
+            1 - np.abs(opinions - calculated_collective_opinion)
+        )
+
+    def return_inverted_equation_based_opinion_weights(
+        self, agent_indices: Any, opinions: Any, calculated_collective_opinion: Any
+    ) -> Any:
+        return self.return_equation_based_opinion_weights(
+            agent_indices, 1 - opinions, calculated_collective_opinion
+        )
+
+    def fuse(
+        self,
+        calculated_collective_opinions: np.ndarray,
+        agent_indices: np.ndarray,
+        opinions: np.ndarray,
+    ) -> None:
+        """
+        Fuses opinions[i] into calculated_collective_opinions[agent_indices[i]]
+        in place. agent_indices must not repeat.
+        """
+
+        calculated_collective_opinion = calculated_collective_opinions[agent_indices]
+        opinion_weights = self.return_opinion_weights(
+            agent_indices, opinions, calculated_collective_opinion
+        )
+
+        calculated_collective_opinions[agent_indices] = (
+            (1 - opinion_weights) * calculated_collective_opinion
+        ) + (opinion_weights * opinions)
+
+    def fuse_message_sequences(
+        self,
+        calculated_collective_opinions: np.ndarray,
+        agent_indices: np.ndarray,
+        opinions: np.ndarray,
+    ) -> None:
+        """
+        Fuses every message of a tick in place. Message i carries opinions[i]
+        to agent_indices[i]; each agent's messages are contiguous and in the
+        order they are fused.
+        """
+
+        if not len(agent_indices):
+            return
+
+        sequence_starts = np.flatnonzero(
+            np.concatenate(([True], agent_indices[1:] != agent_indices[:-1]))
+        )
+        sequence_lengths = np.diff(np.append(sequence_starts, len(agent_indices)))
+
+        # listed weights are known up front, so each agent's sequence is
+        # fused in closed form; equation based weights depend on the
+        # collective opinion and are fused one message order at a time
+        if self.has_fixed_weights:
+            opinion_weights = self.opinion_weights[agent_indices, opinions]
+
+            # a weight of 1 has no logarithm of what it keeps
+            if np.all(opinion_weights < 1):
+                self.fuse_fixed_weight_sequences(
+                    calculated_collective_opinions,
+                    agent_indices[sequence_starts],
+                    sequence_starts,
+                    sequence_lengths,
+                    opinion_weights,
+                    opinions,
+                )
+                return
+
+        message_orders = np.arange(len(agent_indices)) - np.repeat(
+            sequence_starts, sequence_lengths
+        )
+        messages_by_order = np.argsort(message_orders, kind="stable")
+        order_starts = np.cumsum(np.bincount(message_orders))
+
+        for order_start, order_end in zip(
+            np.concatenate(([0], order_starts[:-1])), order_starts
+        ):
+            messages = messages_by_order[order_start:order_end]
+            self.fuse(
+                calculated_collective_opinions,
+                agent_indices[messages],
+                opinions[messages],
+            )
+
+    def fuse_fixed_weight_sequences(
+        self,
+        calculated_collective_opinions: np.ndarray,
+        listener_indices: np.ndarray,
+        sequence_starts: np.ndarray,
+        sequence_lengths: np.ndarray,
+        opinion_weights: np.ndarray,
+        opinions: np.ndarray,
+    ) -> None:
+        # c_k = c_0 * prod(1 - w_i) + sum(w_i * o_i * prod_{j > i}(1 - w_j)),
+        # with the products taken as sums of the log of the share of the
+        # collective opinion each message keeps
+        log_kept = np.cumsum(np.log1p(-opinion_weights))
+        log_kept_by_sequence = log_kept[sequence_starts + sequence_lengths - 1]
+        log_kept_after = np.repeat(log_kept_by_sequence, sequence_lengths) - log_kept
+        log_kept_by_sequence -= np.concatenate(([0.0], log_kept))[sequence_starts]
+
+        calculated_collective_opinions[listener_indices] = np.exp(
+            log_kept_by_sequence
+        ) * calculated_collective_opinions[listener_indices] + np.add.reduceat(
+            opinion_weights * opinions * np.exp(log_kept_after), sequence_starts
+        )
@@ -0,0 +1,165 @@
+import numpy as np
+from typing import Any, Sequence, Union
+
+
+class ActionCache:
+    """
+    The last greedy action a policy chose for one agent and the exact
+    states (as bytes) it was chosen for.
+    """
+
+    __slots__ = ("model", "states_key", "action")
+
+    def __init__(self) -> None:
+        self.model = None
+        self.states_key = None
+        self.action = 0
+
+
+class ActionCacheCounter:
+    """
+    Process-wide count of greedy actions looked up in ActionCaches and how
+    many of them were reused, for profiling.
+    """
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.lookups = 0
+
+    def return_hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def reset(self) -> None:
+        self.hits = 0
+        self.lookups = 0
+
+
+ACTION_CACHE_COUNTER = ActionCacheCounter()
+
+
+def return_greedy_actions(
+    model: Any,
+    states: np.ndarray,
+    action_caches: Union[Sequence[ActionCache], None] = None,
+) -> np.ndarray:
+    """
+    Greedy actions for a batch of states. With action_caches, a row whose
+    states and model are the same as when its cache was filled reuses the
+    cached action, and only the other rows go through model.predict. The
+    policies are queried deterministically, so this never changes an
+    action.
+    """
+
+    if action_caches is None:
+        return np.asarray(model.predict(states, deterministic=True)[0], np.int64)
+
+    actions = np.zeros(len(states), dtype=np.int64)
+    changed_positions = []
+
+    for position, (action_cache, states_row) in enumerate(zip(action_caches, states)):
+        states_key = states_row.tobytes()
+
+        if action_cache.model is model and action_cache.states_key == states_key:
+            actions[position] = action_cache.action
+        else:
+            action_cache.model, action_cache.states_key = model, states_key
+            changed_positions.append(position)
+
+    ACTION_CACHE_COUNTER.lookups += len(states)
+    ACTION_CACHE_COUNTER.hits += len(states) - len(changed_positions)
+
+    if changed_positions:
+        actions[changed_positions] = model.predict(
+            states[changed_positions], deterministic=True
+        )[0]
+
+        for position in changed_positions:
+            action_caches[position].action = int(actions[position])
+
+    return actions
+
+
+def return_epsilon_greedy_actions(
+    model: Any,
+    states: np.ndarray,
+    random_number_generators: Sequence[np.random.Generator],
+    action_caches: Union[Sequence[ActionCache], None] = None,
+) -> np.ndarray:
+    """
+    Epsilon-greedy actions for a batch of states with a single
+    model.predict call. Row i explores with random_number_generators[i],
+    drawing exactly what one call of SwarmAgent.return_model_action would,
+    so batching leaves every agent's random stream unchanged.
+    """
+
+    actions = np.zeros(len(states), dtype=np.int64)
+    exploring = np.zeros(len(states), dtype=bool)
+
+    for position, random_number_generator in enumerate(random_number_generators):
+        if random_number_generator.random() < model.exploration_rate:
+            exploring[position] = True
+            actions[position] = random_number_generator.integers(model.action_space.n)
+
+    # with small exploration rates usually no row explores, and the states
+    # and caches go to the model as they are rather than as masked copies
+    if not exploring.any():
+        return return_greedy_actions(model, states, action_caches)
+
+    if not exploring.all():
+        actions[~exploring] = return_greedy_actions(
+            model,
+            states[~exploring],
+            (
+                None
+                if action_caches is None
+                else [
+                    action_caches[position] for position in np.flatnonzero(~exploring)
+                ]
+            ),
+        )
+
+    return actions
+
+
+def choose_sense_broadcast_actions(swarm_agents: Sequence[Any]) -> np.ndarray:
+    """
+    Sense/broadcast actions for several swarm agents sharing a
+    sense_broadcast_model, in one forward pass.
+    """
+
+    if not swarm_agents:
+        return np.zeros(0, dtype=np.int64)
+
+    return return_epsilon_greedy_actions(
+        swarm_agents[0].sense_broadcast_model,
+        np.stack(
+            [
+                swarm_agent.return_sense_broadcast_states()
+                for swarm_agent in swarm_agents
+            ]
+        ),
+        [swarm_agent.random_number_generator for swarm_agent in swarm_agents],
+        [swarm_agent.sense_broadcast_action_cache for swarm_agent in swarm_agents],
+    )
+
+
+def choose_commit_decision_actions(swarm_agents: Sequence[Any]) -> np.ndarray:
+    """
+    Commit decisions for several swarm agents sharing a
+    commit_to_opinion_model, in one forward pass.
+    """
+
+    if not swarm_agents:
+        return np.zeros(0, dtype=np.int64)
+
+    return return_epsilon_greedy_actions(
+        swarm_agents[0].commit_to_opinion_model,
+        np.stack(
+            [
+                swarm_agent.return_commit_decision_states()
+                for swarm_agent in swarm_agents
+            ]
+        ),
+        [swarm_agent.random_number_generator for swarm_agent in swarm_agents],
+        [swarm_agent.commit_decision_action_cache for swarm_agent in swarm_agents],
+    )
@@ -1,24 +1,29 @@
-import random
 import numpy as np
 from dataclasses import dataclass, field, InitVar
-from typing import Any, Dict, Tuple, Set, Union
-from .utils import validate_cell
-from helper_files import TRAINED_MODELS_DIRECTORY
+from typing import Any, Callable, Dict, Sequence, Tuple, Union
+from . import navigation
+from .navigation import NAVIGATION_ACTION_HANDLERS
+from .policy_inference import ActionCache, return_epsilon_greedy_actions
+from .noise_model import NoiseModel
+from .opinion_fusion import return_opinion_weight_handler
+from .tile_grid import Tile, TileGrid
+from .visited_cells import VisitedCells, return_visited_cells
+from helper_files import load_shared_model
 from .swarm_agent_enums import (
     Direction,
-    Turn,
 )
 
 
-@dataclass(repr=False, eq=False)
+@dataclass(repr=False, eq=False, slots=True)
 class SwarmAgent:
-    starting_cell: InitVar[Dict[str, Any]]
+    starting_cell: InitVar[Tile]
     needs_models_loaded: InitVar[bool] = False
     model_names: InitVar[Dict[str, Union[str, None]]] = {
         "sense_model": "sense_broadcast_model",
         "commit_to_opinion_model": None,
         "dynamic_opinion_model": None,
     }
+    model_type: InitVar[str] = "DQN"
 
     current_direction_facing: int = Direction.RIGHT.value
     max_new_opinion_weighting: float = 0.1
@@ -26,6 +31,9 @@ class SwarmAgent:
     communication_noise: float = 0.0
     total_number_of_environment_cells: int = 625
     opinion_weighting_method: str = "list_of_weights"
+    random_number_generator: np.random.Generator = field(
+        default_factory=np.random.default_rng
+    )
 
     communication_range: int = 1
     sensing: int = 1
@@ -35,40 +43,61 @@ class SwarmAgent:
     calculated_collective_opinion: float = 0.5
 
     current_cell: Tuple[int, int] = field(init=False)
-    cells_visited: Set[Tuple[int, int]] = field(init=False)
+    cells_visited: VisitedCells = field(init=False)
+    sense_broadcast_action_cache: ActionCache = field(
+        init=False, default_factory=ActionCache
+    )
+    commit_decision_action_cache: ActionCache = field(
+        init=False, default_factory=ActionCache
+    )
+    opinion_weights: Sequence[float] = field(init=False)
+    opinion_weight_handler: Callable[[Any, int], float] = field(init=False)
+    sensing_noise_model: NoiseModel = field(init=False)
+    communication_noise_model: NoiseModel = field(init=False)
+    sense_broadcast_model: Any = field(init=False, default=None)
+    commit_to_opinion_model: Any = field(init=False, default=None)
+    dynamic_opinion_model: Any = field(init=False, default=None)
 
     def __post_init__(
         self,
-        starting_cell: Dict[str, Any],
+        starting_cell: Tile,
         needs_models_loaded: bool,
         model_names: Dict[str, Union[str, None]],
+        model_type: str,
     ) -> None:
-        self.cells_visited = set()
+        self.opinion_weight_handler = return_opinion_weight_handler(
+            self.opinion_weighting_method
+        )
+        self.cells_visited = return_visited_cells(starting_cell.tile_grid)
+        self.sensing_noise_model = NoiseModel(
+            self.sensing_noise, self.random_number_generator
+        )
+        self.communication_noise_model = NoiseModel(
+            self.communication_noise, self.random_number_generator
+        )
 
-        self.opinion_weights = [
+        self.opinion_weights = (
             self.max_new_opinion_weighting,
             self.max_new_opinion_weighting,
-        ]
+        )
 
         if needs_models_loaded:
-            from stable_baselines3 import DQN
-
             sense_model = model_names.get("sense_model")
             if sense_model is not None:
-                self.sense_broadcast_model = DQN.load(
-                    f"{TRAINED_MODELS_DIRECTORY}/{model_names.get('sense_model')}"
+                self.sense_broadcast_model = load_shared_model(
+                    sense_model, model_type=model_type
                 )
 
             commit_to_opinion_model = model_names.get("commit_to_opinion_model")
             if commit_to_opinion_model is not None:
-                self.commit_to_opinion_model = DQN.load(
-                    f"{TRAINED_MODELS_DIRECTORY}/{model_names.get('commit_to_opinion_model')}"
+                self.commit_to_opinion_model = load_shared_model(
+                    commit_to_opinion_model, model_type=model_type
                 )
 
             # dynamic_opinion_model = model_names.get("dynamic_opinion_model")
             # if dynamic_opinion_model is not None:
-            #     self.dynamic_opinion_model = PPO.load(
-            #         f"{TRAINED_MODELS_DIRECTORY}/{model_names.get('dynamic_opinion_model')}"
+            #     self.dynamic_opinion_model = load_shared_model(
+            #         dynamic_opinion_model, model_type="PPO"
             #     )
 
         if not (self.occupy_cell(starting_cell)):
@@ -77,18 +106,14 @@ class SwarmAgent:
     def add_cell_to_visited_list(self, cell_id: Tuple[int, int]) -> None:
         self.cells_visited.add(cell_id)
 
-    def occupy_cell(self, tile: Dict[str, Any]) -> bool:
-        if not (tile["agent"]):
-            tile["agent"] = self
-            self.current_cell = tile["id"]
+    def occupy_cell(self, tile: Tile) -> bool:
+        if navigation.occupy_empty_cell(self, tile):
+            tile_grid, cell = tile.tile_grid, tile.id
             if self.sensing:
                 self.num_of_cells_observed += 1
-                tile_color = tile["colour"]
-                tile_color = random.choices(
-                    [tile_color, (tile_color + 1) % 2],
-                    [1 - self.sensing_noise, self.sensing_noise],
-                    k=1,
-                )[0]
+                tile_color = (
+                    int(tile_grid.colour[cell]) ^ self.sensing_noise_model.return_flip()
+                )
                 if tile_color:
                     self.num_of_white_cells_observed += 1
             return True
@@ -96,70 +121,26 @@ class SwarmAgent:
         return False
 
     def return_num_of_cells_visited(self) -> int:
-        if self.current_cell in self.cells_visited:
-            return len(self.cells_visited)
-        return len(self.cells_visited) + 1
+        return self.cells_visited.num_of_cells + (
+            self.current_cell not in self.cells_visited
+        )
 
-    def leave_cell(self, tile: Dict) -> None:
+    def leave_cell(self, tile: Tile) -> None:
         tile["agent"] = None
         self.add_cell_to_visited_list(tile["id"])
 
-    def __return_next_cell_coordinate(self) -> Tuple[int, int]:
-        return {
-            Direction.RIGHT.value: (self.current_cell[0], self.current_cell[1] + 1),
-            Direction.DOWN.value: (self.current_cell[0] + 1, self.current_cell[1]),
-            Direction.LEFT.value: (self.current_cell[0], self.current_cell[1] - 1),
-            Direction.UP.value: (self.current_cell[0] - 1, self.current_cell[1]),
-        }[self.current_direction_facing]
-
-    def forward_step(self, tile_grid: np.ndarray) -> None:
-        new_cell = self.__return_next_cell_coordinate()
-        old_cell = self.current_cell
-
-        if validate_cell(
-            new_cell=new_cell, grid_shape=tile_grid.shape
-        ) and self.occupy_cell(tile=tile_grid[new_cell]):
-            tile_grid[old_cell]["agent"] = None
+    forward_step = navigation.forward_step
+    turn = navigation.turn
+    choose_navigation_action = navigation.choose_navigation_action
+    navigate = navigation.navigate
 
-    def turn(self, turn_type: int) -> None:
-        self.current_direction_facing = (self.current_direction_facing + turn_type) % 4
-
-    def perform_navigation_action(self, action: int, tile_grid: np.ndarray) -> None:
+    def perform_navigation_action(self, action: int, tile_grid: TileGrid) -> None:
         self.add_cell_to_visited_list(self.current_cell)
 
         if isinstance(action, (np.ndarray)):
             action = action[0]
 
-        return {
-            0: lambda self, tile_grid: (self.forward_step(tile_grid=tile_grid)),
-            1: lambda self, _: self.turn(turn_type=Turn.LEFT.value),
-            2: lambda self, _: self.turn(turn_type=Turn.RIGHT.value),
-        }[action](self, tile_grid)
-
-    def choose_navigation_action(self, tile_grid: np.ndarray) -> int:
-        next_tile_coordinates = self.__return_next_cell_coordinate()
-
-        if validate_cell(new_cell=next_tile_coordinates, grid_shape=tile_grid.shape):
-            next_tile_along = tile_grid[next_tile_coordinates]
-
-            if next_tile_along["agent"]:
-                return random.choice([1, 2])
-
-            return 0
-
-        # agent is facing into a corner or wall
-        tile_walls = tile_grid[self.current_cell]["walls"]
-
-        if len(tile_walls) == 1:
-            return random.choice([1, 2])
-
-        return 1 if tile_walls[0] == self.current_direction_facing else 2
-
-    def navigate(self, tile_grid: np.ndarray) -> None:
-        self.perform_navigation_action(
-            action=self.choose_navigation_action(tile_grid=tile_grid),
-            tile_grid=tile_grid,
-        )
+        return NAVIGATION_ACTION_HANDLERS[action](self, tile_grid)
 
     def calculate_opinion(self) -> int:
         return round(self.num_of_white_cells_observed / self.num_of_cells_observed)
@@ -177,45 +158,26 @@ class SwarmAgent:
         )
 
     def update_collective_opinion(self, opinion: int) -> None:
-        opinion = random.choices(
-            [opinion, (opinion + 1) % 2],
-            [1 - self.communication_noise, self.communication_noise],
-            k=1,
-        )[0]
-
-        if self.opinion_weighting_method == "list_of_weights":
-            opinion_weight = self.opinion_weights[opinion]
-        elif self.opinion_weighting_method == "equation_based":
-            opinion_weight = self.return_opinion_weight_based_on_equation(opinion)
-        elif self.opinion_weighting_method == "inverted_equation_based":
-            opinion_weight = self.return_opinion_weight_based_on_equation(
-                (opinion + 1) % 2
-            )
+        opinion ^= self.communication_noise_model.return_flip()
+        opinion_weight = self.opinion_weight_handler(self, opinion)
 
         self.calculated_collective_opinion = (
             (1 - opinion_weight) * self.calculated_collective_opinion
         ) + (opinion_weight * opinion)
 
-    def recieve_local_opinions(self, tile_grid: np.ndarray):
-        current_y, current_x = self.current_cell
-
-        communication_y_min = max(0, current_y - self.communication_range)
-        communication_x_min = max(0, current_x - self.communication_range)
-        communication_y_max = min(
-            tile_grid.shape[0], current_y + self.communication_range
-        )
-        communication_x_max = min(
-            tile_grid.shape[1], current_y + self.communication_range
-        )
-
-        local_area = tile_grid[
-            communication_y_min : communication_y_max + 1,
-            communication_x_min : communication_x_max + 1,
-        ]
-
-        for tile in local_area.flat:
-            if tile["agent"] and tile["agent"] != self:
-                recieved_opinion = tile["agent"].return_opinion()
+    def recieve_local_opinions(self, tile_grid: TileGrid):
+        current_row, current_column = self.current_cell
+        height, width = tile_grid.shape
+
+        for agent_index in tile_grid.return_agent_indices_in_area(
+            row_min=max(0, current_row - self.communication_range),
+            row_max=min(height - 1, current_row + self.communication_range),
+            column_min=max(0, current_column - self.communication_range),
+            column_max=min(width - 1, current_column + self.communication_range),
+        ):
+            agent = tile_grid.agents[agent_index]
+            if agent is not self:
+                recieved_opinion = agent.return_opinion()
                 if recieved_opinion is not None:
                     self.update_collective_opinion(recieved_opinion)
 
@@ -231,13 +193,46 @@ class SwarmAgent:
             dtype=np.float32,
         )
 
+    def return_model_action(
+        self,
+        model: Any,
+        states: np.ndarray,
+        action_cache: Union[ActionCache, None] = None,
+    ) -> int:
+        """
+        Same epsilon-greedy choice as DQN.predict, but the exploration is
+        drawn from the agent's generator rather than the global np.random.
+        The greedy action is reused from action_cache when the states have
+        not changed.
+        """
+
+        return return_epsilon_greedy_actions(
+            model,
+            states[np.newaxis],
+            [self.random_number_generator],
+            None if action_cache is None else [action_cache],
+        )[0].item()
+
     def choose_sense_broadcast_action(self) -> int:
-        return self.sense_broadcast_model.predict(self.return_sense_broadcast_states())[
-            0
-        ].item()
+        return self.return_model_action(
+            self.sense_broadcast_model,
+            self.return_sense_broadcast_states(),
+            self.sense_broadcast_action_cache,
+        )
 
-    def decide_to_sense_or_broadcast(self) -> None:
-        self.sensing = self.choose_sense_broadcast_action()
+    def decide_to_sense_or_broadcast(
+        self, sense_broadcast_action: Union[int, None] = None
+    ) -> None:
+        """
+        sense_broadcast_action is the agent's action when it was already
+        chosen in a batch by choose_sense_broadcast_actions.
+        """
+
+        self.sensing = (
+            self.choose_sense_broadcast_action()
+            if sense_broadcast_action is None
+            else int(sense_broadcast_action)
+        )
 
     def return_ratio_of_total_environment_cells_observed(self) -> float:
         return min(
@@ -266,15 +261,23 @@ class SwarmAgent:
         )
 
     def choose_commit_decision_action(self) -> int:
-        return self.commit_to_opinion_model.predict(
-            self.return_commit_decision_states()
-        )[0].item()
+        return self.return_model_action(
+            self.commit_to_opinion_model,
+            self.return_commit_decision_states(),
+            self.commit_decision_action_cache,
+        )
 
-    def decide_if_to_commit(self) -> None:
+    def decide_if_to_commit(
+        self, commit_decision_action: Union[int, None] = None
+    ) -> None:
         if not self.committed_to_opinion:
-            self.committed_to_opinion = self.choose_commit_decision_action()
+            self.committed_to_opinion = (
+                self.choose_commit_decision_action()
+                if commit_decision_action is None
+                else int(commit_decision_action)
+            )
 
-    def navigate_and_recieve_opinions(self, tile_grid: np.ndarray) -> None:
+    def navigate_and_recieve_opinions(self, tile_grid: TileGrid) -> None:
         self.navigate(tile_grid=tile_grid)
         self.recieve_local_opinions(tile_grid=tile_grid)
 
@@ -292,10 +295,10 @@ class SwarmAgent:
         )
 
     def perform_decision_navigate_opinion_update_cycle(
-        self, tile_grid: np.ndarray
+        self, tile_grid: TileGrid, sense_broadcast_action: Union[int, None] = None
     ) -> None:
         if not (self.committed_to_opinion):
-            self.decide_to_sense_or_broadcast()
+            self.decide_to_sense_or_broadcast(sense_broadcast_action)
             self.navigate_and_recieve_opinions(tile_grid=tile_grid)
         else:
             self.sensing = 0  # agent is broadcasting opinion
@@ -0,0 +1,847 @@
+import math
+import numpy as np
+from typing import Any, List, Sequence, Union
+from .swarm_agent import SwarmAgent
+from .malicious_agent import MaliciousAgent
+from .policy_inference import return_epsilon_greedy_actions, return_greedy_actions
+from .noise_model import return_flip_mask
+from .opinion_fusion import OPINION_WEIGHTING_METHODS, OpinionFusion
+from .adversary_strategies import ADVERSARY_STRATEGIES, ADVERSARY_STRATEGY_HANDLERS
+from .swarm_agent_enums import Turn
+from .navigation import (
+    DIRECTION_ROW_DELTAS,
+    DIRECTION_COLUMN_DELTAS,
+    return_next_cell_coordinate,
+)
+from .tile_grid import EMPTY_TILE, POPCOUNT_TABLE, WALL_BITMASK_TO_WALLS, TileGrid
+
+# ordered reproduces stepping the agent objects one after the other,
+# synchronous moves every agent against the occupancy at the start of the
+# tick and then lets every listener hear its neighbours at once, and
+# box_filter moves the same way but fuses counts of the opinions heard
+SWARM_STATE_MODES = ("ordered", "synchronous", "box_filter")
+
+NUM_OF_WALLS = POPCOUNT_TABLE[:16].astype(np.int64)
+FIRST_WALL = np.array(
+    [walls[0] if walls else EMPTY_TILE for walls in WALL_BITMASK_TO_WALLS],
+    dtype=np.int64,
+)
+NO_OPINION = -1
+
+
+class SwarmState:
+    """
+    Struct-of-arrays copy of a swarm, malicious agents first, that steps
+    every agent of a tick in one call. The agent objects are only updated
+    by write_back_to_agents().
+    """
+
+    def __init__(
+        self,
+        tile_grid: TileGrid,
+        swarm_agents: Sequence[SwarmAgent],
+        malicious_agents: Sequence[MaliciousAgent] = (),
+        mode: str = "ordered",
+        random_number_generator: Union[np.random.Generator, None] = None,
+        adversary_strategy: str = "fixed_wrong_opinion",
+        adversary_flip_step: int = 100,
+    ) -> None:
+        if mode not in SWARM_STATE_MODES:
+            raise ValueError(f"mode must be one of {SWARM_STATE_MODES}, got {mode}")
+
+        if adversary_strategy not in ADVERSARY_STRATEGIES:
+            raise ValueError(
+                f"adversary_strategy must be one of {ADVERSARY_STRATEGIES}, "
+                f"got {adversary_strategy}"
+            )
+
+        if not isinstance(tile_grid.occupancy, np.ndarray):
+            raise ValueError("SwarmState needs a tile grid with dense occupancy")
+
+        opinion_weighting_methods = {
+            swarm_agent.opinion_weighting_method for swarm_agent in swarm_agents
+        }
+
+        if len(opinion_weighting_methods) > 1:
+            raise ValueError("swarm agents must share an opinion_weighting_method")
+
+        self.tile_grid = tile_grid
+        self.mode = mode
+        self.random_number_generator = (
+            np.random.default_rng()
+            if random_number_generator is None
+            else random_number_generator
+        )
+        self.agents: List[Any] = [*malicious_agents, *swarm_agents]
+        self.num_of_agents = len(self.agents)
+        self.num_of_malicious_agents = len(malicious_agents)
+        self.opinion_weighting_method = (
+            opinion_weighting_methods.pop()
+            if opinion_weighting_methods
+            else OPINION_WEIGHTING_METHODS[0]
+        )
+
+        self.is_malicious = np.arange(self.num_of_agents) < len(malicious_agents)
+
+        self.rows = np.array([agent.current_cell[0] for agent in self.agents], np.int64)
+        self.columns = np.array(
+            [agent.current_cell[1] for agent in self.agents], np.int64
+        )
+        self.headings = np.array(
+            [agent.current_direction_facing for agent in self.agents], np.int64
+        )
+        self.grid_indices = np.array(
+            [tile_grid.register_agent(agent) for agent in self.agents], np.int64
+        )
+        self.state_indices = np.full(len(tile_grid.agents), EMPTY_TILE, np.int64)
+        self.state_indices[self.grid_indices] = np.arange(self.num_of_agents)
+        self.agent_random_number_generators = [
+            agent.random_number_generator for agent in self.agents
+        ]
+        self.sensing_noise_models = [
+            getattr(agent, "sensing_noise_model", None) for agent in self.agents
+        ]
+        self.communication_noise_models = [
+            getattr(agent, "communication_noise_model", None) for agent in self.agents
+        ]
+        self.sense_broadcast_action_caches = [
+            getattr(agent, "sense_broadcast_action_cache", None)
+            for agent in self.agents
+        ]
+        self.commit_decision_action_caches = [
+            getattr(agent, "commit_decision_action_cache", None)
+            for agent in self.agents
+        ]
+
+        self.malicious_opinions = np.array(
+            [getattr(agent, "malicious_opinion", NO_OPINION) for agent in self.agents],
+            np.int64,
+        )
+        self.adversary_strategy_handler = ADVERSARY_STRATEGY_HANDLERS[
+            adversary_strategy
+        ]
+        self.adversary_flip_step = adversary_flip_step
+        self.num_of_steps = 0
+
+        # opinions the malicious agents broadcast this tick, shared with the
+        # agent objects
+        self.adversary_opinions = np.zeros(self.num_of_malicious_agents, np.int64)
+        self.update_adversary_opinions()
+        for agent_index, malicious_agent in enumerate(malicious_agents):
+            malicious_agent.adversary_opinions = self.adversary_opinions
+            malicious_agent.adversary_index = agent_index
+        self.sensing = self.return_swarm_agent_array("sensing", False, bool)
+        self.committed_to_opinion = self.return_swarm_agent_array(
+            "committed_to_opinion", False, bool
+        )
+        self.num_of_cells_observed = self.return_swarm_agent_array(
+            "num_of_cells_observed", 0, np.int64
+        )
+        self.num_of_white_cells_observed = self.return_swarm_agent_array(
+            "num_of_white_cells_observed", 0, np.int64
+        )
+        self.calculated_collective_opinion = self.return_swarm_agent_array(
+            "calculated_collective_opinion", 0.5, np.float64
+        )
+        self.total_number_of_environment_cells = self.return_swarm_agent_array(
+            "total_number_of_environment_cells", 1, np.int64
+        )
+        self.sensing_noise = self.return_swarm_agent_array(
+            "sensing_noise", 0.0, np.float64
+        )
+        self.communication_noise = self.return_swarm_agent_array(
+            "communication_noise", 0.0, np.float64
+        )
+        self.communication_range = self.return_swarm_agent_array(
+            "communication_range", 0, np.int64
+        )
+        self.max_new_opinion_weighting = self.return_swarm_agent_array(
+            "max_new_opinion_weighting", 0.0, np.float64
+        )
+        self.opinion_weights = np.array(
+            [getattr(agent, "opinion_weights", (0.0, 0.0)) for agent in self.agents],
+            np.float64,
+        ).reshape(self.num_of_agents, 2)
+        self.opinion_fusion = OpinionFusion(
+            self.opinion_weighting_method,
+            self.opinion_weights,
+            self.max_new_opinion_weighting,
+        )
+
+        # one packed VisitedCells bitmap per swarm agent, in agent order
+        self.visited_cells = np.zeros(
+            (len(swarm_agents), tile_grid.shape[0], (tile_grid.shape[1] + 7) >> 3),
+            np.uint8,
+        )
+        for position, swarm_agent in enumerate(swarm_agents):
+            self.visited_cells[position] = (
+                swarm_agent.cells_visited.return_packed_bits()
+            )
+        self.num_of_cells_visited = np.array(
+            [len(swarm_agent.cells_visited) for swarm_agent in swarm_agents], np.int64
+        )
+
+        # one sense/broadcast observation row per agent (ratio of cells
+        # observed, opinion, collective opinion and their difference), kept
+        # up to date as sensing and fusion change it. Only the batched paths
+        # of SwarmState read these rows; SwarmAgent still builds a fresh
+        # array per call, which the trainers hand on as gym observations
+        self.calculated_opinions = np.zeros(self.num_of_agents, np.int64)
+        self.observations = np.zeros((self.num_of_agents, 4), np.float32)
+        self.observation_buffer = np.zeros_like(self.observations)
+        self.observations_changed = np.zeros(self.num_of_agents, bool)
+        self.update_observations(np.arange(self.num_of_agents))
+
+    def return_swarm_agent_array(
+        self, attribute: str, malicious_value: Any, dtype: Any
+    ) -> np.ndarray:
+        return np.array(
+            [
+                malicious_value if is_malicious else getattr(agent, attribute)
+                for agent, is_malicious in zip(self.agents, self.is_malicious)
+            ],
+            dtype,
+        )
+
+    def return_ratios_of_total_environment_cells_observed(self) -> np.ndarray:
+        return np.minimum(
+            self.num_of_cells_observed / self.total_number_of_environment_cells, 1.0
+        )
+
+    def return_calculated_opinions(self) -> np.ndarray:
+        return self.calculated_opinions
+
+    def update_observations(self, agent_indices: np.ndarray) -> None:
+        """
+        Recomputes the calculated opinions and observation rows of
+        agent_indices from their counts and collective opinions.
+        """
+
+        num_of_cells_observed = self.num_of_cells_observed[agent_indices]
+        calculated_collective_opinion = self.calculated_collective_opinion[
+            agent_indices
+        ]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            opinions = np.rint(
+                self.num_of_white_cells_observed[agent_indices] / num_of_cells_observed
+            ).astype(np.int64)
+
+        self.calculated_opinions[agent_indices] = opinions
+        self.observations[agent_indices, 0] = np.minimum(
+            num_of_cells_observed
+            / self.total_number_of_environment_cells[agent_indices],
+            1.0,
+        )
+        self.observations[agent_indices, 1] = opinions
+        self.observations[agent_indices, 2] = calculated_collective_opinion
+        self.observations[agent_indices, 3] = np.abs(
+            calculated_collective_opinion - opinions
+        )
+
+    def return_sense_broadcast_states(self, agent_indices: np.ndarray) -> np.ndarray:
+        """
+        Observation rows of agent_indices, gathered into a preallocated
+        buffer that the next call overwrites.
+        """
+
+        return np.take(
+            self.observations,
+            agent_indices,
+            axis=0,
+            out=self.observation_buffer[: len(agent_indices)],
+            mode="clip",
+        )
+
+    def choose_sense_broadcast_actions(
+        self, model: Any, agent_mask: np.ndarray
+    ) -> np.ndarray:
+        return self.return_model_actions(
+            model, agent_mask, self.sense_broadcast_action_caches
+        )
+
+    def choose_commit_decision_actions(
+        self, model: Any, agent_mask: np.ndarray
+    ) -> np.ndarray:
+        # commit decisions are taken on the same four observations
+        return self.return_model_actions(
+            model, agent_mask, self.commit_decision_action_caches
+        )
+
+    def return_model_actions(
+        self, model: Any, agent_mask: np.ndarray, action_caches: List[Any]
+    ) -> np.ndarray:
+        """
+        Epsilon-greedy actions of model for the masked agents in one
+        model.predict, exploring with each agent's generator in ordered mode.
+        """
+
+        agent_indices = np.flatnonzero(agent_mask)
+
+        if self.mode == "ordered":
+            return return_epsilon_greedy_actions(
+                model,
+                self.return_sense_broadcast_states(agent_indices),
+                [
+                    self.agent_random_number_generators[agent_index]
+                    for agent_index in agent_indices
+                ],
+                [action_caches[agent_index] for agent_index in agent_indices],
+            )
+
+        actions = np.zeros(len(agent_indices), dtype=np.int64)
+        explore = (
+            self.random_number_generator.random(len(agent_indices))
+            < model.exploration_rate
+        )
+        actions[explore] = self.random_number_generator.integers(
+            model.action_space.n, size=int(np.count_nonzero(explore))
+        )
+
+        if not explore.all():
+            actions[~explore] = return_greedy_actions(
+                model,
+                self.return_sense_broadcast_states(agent_indices[~explore]),
+                [action_caches[agent_index] for agent_index in agent_indices[~explore]],
+            )
+
+        return actions
+
+    def return_opinion(self, agent_index: int) -> Union[int, None]:
+        if self.is_malicious[agent_index]:
+            return int(self.adversary_opinions[agent_index])
+
+        if self.sensing[agent_index]:
+            return None
+
+        if not self.committed_to_opinion[agent_index]:
+            return round(
+                int(self.num_of_white_cells_observed[agent_index])
+                / int(self.num_of_cells_observed[agent_index])
+            )
+
+        return round(float(self.calculated_collective_opinion[agent_index]))
+
+    def return_broadcast_opinions(self) -> np.ndarray:
+        """
+        Opinion every agent is broadcasting, NO_OPINION for sensing agents.
+        """
+
+        broadcast_opinions = np.where(
+            self.committed_to_opinion,
+            np.rint(self.calculated_collective_opinion).astype(np.int64),
+            self.return_calculated_opinions(),
+        )
+        broadcast_opinions[self.sensing] = NO_OPINION
+        broadcast_opinions[: self.num_of_malicious_agents] = self.adversary_opinions
+
+        return broadcast_opinions
+
+    def return_communication_bounds(self, agent_indices: Any) -> tuple:
+        """
+        Inclusive rows and columns an agent listens over, clipped to the
+        grid.
+        """
+
+        height, width = self.tile_grid.shape
+        rows = self.rows[agent_indices]
+        communication_range = self.communication_range[agent_indices]
+
+        return (
+            np.maximum(0, rows - communication_range),
+            np.minimum(height - 1, rows + communication_range),
+            np.maximum(0, self.columns[agent_indices] - communication_range),
+            np.minimum(width - 1, self.columns[agent_indices] + communication_range),
+        )
+
+    def step(
+        self,
+        sensing: np.ndarray,
+        committed_to_opinion: np.ndarray,
+        recieving: np.ndarray,
+    ) -> None:
+        """
+        Advances every agent by one tick, after which the recieving agents
+        hear their neighbours.
+        """
+
+        self.visit_current_cells()
+        self.update_adversary_opinions()
+
+        if self.mode == "ordered":
+            self.step_in_order(sensing, committed_to_opinion, recieving)
+        else:
+            self.sensing[:] = sensing
+            self.committed_to_opinion[:] = committed_to_opinion
+            self.navigate_synchronously()
+
+            if self.mode == "synchronous":
+                self.recieve_local_opinions_synchronously(recieving)
+            else:
+                self.recieve_opinion_counts(recieving)
+
+            self.update_observations(np.flatnonzero(recieving))
+
+        self.num_of_steps += 1
+
+    def step_without_listening(self) -> None:
+        """
+        Advances every agent by one tick with no agent recieving.
+        """
+
+        self.visit_current_cells()
+        self.update_adversary_opinions()
+
+        if self.mode == "ordered":
+            for agent_index in range(self.num_of_agents):
+                self.navigate(agent_index)
+
+            self.update_changed_observations()
+        else:
+            self.navigate_synchronously()
+
+        self.num_of_steps += 1
+
+    def update_adversary_opinions(self) -> None:
+        if self.num_of_malicious_agents:
+            self.adversary_opinions[:] = self.adversary_strategy_handler(self)
+
+    def visit_current_cells(self) -> None:
+        """
+        Marks every swarm agent's cell as visited before it navigates, as
+        SwarmAgent.perform_navigation_action does, keeping the running
+        counts of cells visited.
+        """
+
+        rows = self.rows[self.num_of_malicious_agents :]
+        columns = self.columns[self.num_of_malicious_agents :]
+        swarm_agent_positions = np.arange(len(rows))
+        bits = (0x80 >> (columns & 7)).astype(np.uint8)
+
+        visited_bytes = self.visited_cells[swarm_agent_positions, rows, columns >> 3]
+        self.num_of_cells_visited += (visited_bytes & bits) == 0
+        self.visited_cells[swarm_agent_positions, rows, columns >> 3] = (
+            visited_bytes | bits
+        )
+
+    def return_nums_of_cells_visited(self) -> np.ndarray:
+        """
+        SwarmAgent.return_num_of_cells_visited for every swarm agent, which
+        counts the current cell as visited.
+        """
+
+        rows = self.rows[self.num_of_malicious_agents :]
+        columns = self.columns[self.num_of_malicious_agents :]
+        current_cell_visited = (
+            self.visited_cells[np.arange(len(rows)), rows, columns >> 3]
+            & (0x80 >> (columns & 7))
+        ) != 0
+
+        return self.num_of_cells_visited + ~current_cell_visited
+
+    def step_in_order(
+        self,
+        sensing: np.ndarray,
+        committed_to_opinion: np.ndarray,
+        recieving: np.ndarray,
+    ) -> None:
+        for agent_index in range(self.num_of_agents):
+            self.sensing[agent_index] = sensing[agent_index]
+            self.committed_to_opinion[agent_index] = committed_to_opinion[agent_index]
+            self.navigate(agent_index)
+
+            if recieving[agent_index]:
+                self.recieve_local_opinions(agent_index)
+
+        self.update_changed_observations()
+
+    def update_changed_observations(self) -> None:
+        changed_agent_indices = np.flatnonzero(self.observations_changed)
+        self.update_observations(changed_agent_indices)
+        self.observations_changed[changed_agent_indices] = False
+
+    def navigate(self, agent_index: int) -> None:
+        occupancy = self.tile_grid.occupancy
+        height, width = self.tile_grid.shape
+        random_number_generator = self.agent_random_number_generators[agent_index]
+
+        row, column = int(self.rows[agent_index]), int(self.columns[agent_index])
+        heading = int(self.headings[agent_index])
+        next_row, next_column = return_next_cell_coordinate((row, column), heading)
+
+        if 0 <= next_row < height and 0 <= next_column < width:
+            if occupancy[next_row, next_column] == EMPTY_TILE:
+                occupancy[next_row, next_column] = self.grid_indices[agent_index]
+                occupancy[row, column] = EMPTY_TILE
+                self.rows[agent_index], self.columns[agent_index] = (
+                    next_row,
+                    next_column,
+                )
+                self.sense_cell(agent_index)
+                return
+
+            action = int(random_number_generator.integers(1, 3))
+        else:
+            # agent is facing into a corner or wall
+            wall_bitmask = self.tile_grid.walls[row, column]
+
+            if NUM_OF_WALLS[wall_bitmask] == 1:
+                action = int(random_number_generator.integers(1, 3))
+            else:
+                action = 1 if FIRST_WALL[wall_bitmask] == heading else 2
+
+        self.headings[agent_index] = (
+            heading + (Turn.LEFT.value if action == 1 else Turn.RIGHT.value)
+        ) % 4
+
+    def sense_cell(self, agent_index: int) -> None:
+        if self.is_malicious[agent_index] or not self.sensing[agent_index]:
+            return
+
+        tile_colour = (
+            int(
+                self.tile_grid.colour[self.rows[agent_index], self.columns[agent_index]]
+            )
+            ^ self.sensing_noise_models[agent_index].return_flip()
+        )
+
+        self.num_of_cells_observed[agent_index] += 1
+        self.num_of_white_cells_observed[agent_index] += tile_colour
+        self.observations_changed[agent_index] = True
+
+    def recieve_local_opinions(self, agent_index: int) -> None:
+        local_area = self.tile_grid.return_agent_indices_in_area(
+            *(int(bound) for bound in self.return_communication_bounds(agent_index))
+        )
+
+        for grid_index in local_area:
+            neighbour_index = int(self.state_indices[grid_index])
+
+            if neighbour_index != agent_index:
+                recieved_opinion = self.return_opinion(neighbour_index)
+                if recieved_opinion is not None:
+                    self.update_collective_opinion(agent_index, recieved_opinion)
+
+    def update_collective_opinion(self, agent_index: int, opinion: int) -> None:
+        opinion ^= self.communication_noise_models[agent_index].return_flip()
+
+        calculated_collective_opinion = float(
+            self.calculated_collective_opinion[agent_index]
+        )
+        opinion_weight = float(
+            self.opinion_fusion.return_opinion_weights(
+                agent_index, opinion, calculated_collective_opinion
+            )
+        )
+
+        self.calculated_collective_opinion[agent_index] = (
+            (1 - opinion_weight) * calculated_collective_opinion
+        ) + (opinion_weight * opinion)
+        self.observations_changed[agent_index] = True
+
+    def navigate_synchronously(self) -> None:
+        occupancy = self.tile_grid.occupancy
+        height, width = self.tile_grid.shape
+
+        next_rows = self.rows + DIRECTION_ROW_DELTAS[self.headings]
+        next_columns = self.columns + DIRECTION_COLUMN_DELTAS[self.headings]
+        in_grid = (
+            (next_rows >= 0)
+            & (next_rows < height)
+            & (next_columns >= 0)
+            & (next_columns < width)
+        )
+
+        blocked = ~in_grid
+        blocked[in_grid] = (
+            occupancy[next_rows[in_grid], next_columns[in_grid]] != EMPTY_TILE
+        )
+
+        wall_bitmasks = self.tile_grid.walls[self.rows, self.columns].astype(np.int64)
+        random_turn = (in_grid & blocked) | (
+            ~in_grid & (NUM_OF_WALLS[wall_bitmasks] == 1)
+        )
+        corner_turn = ~in_grid & (NUM_OF_WALLS[wall_bitmasks] > 1)
+
+        turn_left = np.zeros(self.num_of_agents, dtype=bool)
+        turn_left[random_turn] = (
+            self.random_number_generator.integers(
+                1, 3, size=int(np.count_nonzero(random_turn))
+            )
+            == 1
+        )
+        turn_left[corner_turn] = (
+            FIRST_WALL[wall_bitmasks[corner_turn]] == self.headings[corner_turn]
+        )
+
+        turning = random_turn | corner_turn
+        self.headings[turning] = (
+            self.headings[turning]
+            + np.where(turn_left[turning], Turn.LEFT.value, Turn.RIGHT.value)
+        ) % 4
+
+        # the lowest index takes a cell several agents are heading for
+        moving_agent_indices = np.flatnonzero(~blocked)
+        _, first_arrivals = np.unique(
+            next_rows[moving_agent_indices] * width
+            + next_columns[moving_agent_indices],
+            return_index=True,
+        )
+        moving_agent_indices = moving_agent_indices[np.sort(first_arrivals)]
+
+        occupancy[
+            self.rows[moving_agent_indices], self.columns[moving_agent_indices]
+        ] = EMPTY_TILE
+        self.rows[moving_agent_indices] = next_rows[moving_agent_indices]
+        self.columns[moving_agent_indices] = next_columns[moving_agent_indices]
+        occupancy[
+            self.rows[moving_agent_indices], self.columns[moving_agent_indices]
+        ] = self.grid_indices[moving_agent_indices]
+
+        sensing_agent_indices = moving_agent_indices[
+            self.sensing[moving_agent_indices]
+            & ~self.is_malicious[moving_agent_indices]
+        ]
+        tile_colours = np.asarray(
+            self.tile_grid.colour[
+                self.rows[sensing_agent_indices], self.columns[sensing_agent_indices]
+            ],
+            dtype=np.int64,
+        )
+        tile_colours ^= return_flip_mask(
+            self.sensing_noise[sensing_agent_indices], self.random_number_generator
+        )
+
+        self.num_of_cells_observed[sensing_agent_indices] += 1
+        self.num_of_white_cells_observed[sensing_agent_indices] += tile_colours
+        self.update_observations(sensing_agent_indices)
+
+    def return_neighbour_pairs(self, agent_indices: np.ndarray) -> tuple:
+        """
+        (listener position in agent_indices, neighbour index) pairs, sorted
+        by listener and then row-major by the neighbour's cell.
+        """
+
+        row_min, row_max, column_min, column_max = self.return_communication_bounds(
+            agent_indices
+        )
+        height, width = self.tile_grid.shape
+        # agents are hashed into square buckets at least as wide as the
+        # largest range, so only the 3x3 buckets around a listener are
+        # searched, and wide enough that there are no more buckets than agents
+        bucket_size = max(
+            1,
+            int(self.communication_range[agent_indices].max()),
+            math.isqrt(height * width // self.num_of_agents),
+        )
+        # a spare bucket on every side keeps the buckets searched around a
+        # listener inside the table
+        num_of_bucket_rows = (height - 1) // bucket_size + 3
+        num_of_bucket_columns = (width - 1) // bucket_size + 3
+
+        buckets = (self.rows // bucket_size + 1) * num_of_bucket_columns + (
+            self.columns // bucket_size + 1
+        )
+        agents_by_bucket = np.argsort(buckets, kind="stable")
+        bucket_starts = np.zeros(
+            num_of_bucket_rows * num_of_bucket_columns + 1, np.int64
+        )
+        np.cumsum(
+            np.bincount(buckets, minlength=num_of_bucket_rows * num_of_bucket_columns),
+            out=bucket_starts[1:],
+        )
+
+        listener_positions, neighbour_indices = [], []
+
+        for bucket_row_offset in (-1, 0, 1):
+            for bucket_column_offset in (-1, 0, 1):
+                searched_buckets = (
+                    buckets[agent_indices]
+                    + bucket_row_offset * num_of_bucket_columns
+                    + bucket_column_offset
+                )
+                starts = bucket_starts[searched_buckets]
+                counts = bucket_starts[searched_buckets + 1] - starts
+                listener_positions.append(np.repeat(np.arange(len(counts)), counts))
+                neighbour_indices.append(
+                    agents_by_bucket[
+                        np.repeat(starts - np.cumsum(counts) + counts, counts)
+                        + np.arange(counts.sum())
+                    ]
+                )
+
+        listener_positions = np.concatenate(listener_positions)
+        neighbour_indices = np.concatenate(neighbour_indices)
+
+        neighbour_rows = self.rows[neighbour_indices]
+        neighbour_columns = self.columns[neighbour_indices]
+        in_range = (
+            (neighbour_indices != agent_indices[listener_positions])
+            & (neighbour_rows >= row_min[listener_positions])
+            & (neighbour_rows <= row_max[listener_positions])
+            & (neighbour_columns >= column_min[listener_positions])
+            & (neighbour_columns <= column_max[listener_positions])
+        )
+
+        listener_positions = listener_positions[in_range]
+        neighbour_indices = neighbour_indices[in_range]
+        pair_order = np.argsort(
+            listener_positions * (height * width)
+            + neighbour_rows[in_range] * width
+            + neighbour_columns[in_range]
+        )
+
+        return listener_positions[pair_order], neighbour_indices[pair_order]
+
+    def recieve_local_opinions_synchronously(self, recieving: np.ndarray) -> None:
+        """
+        Every recieving agent hears the opinions broadcast after this
+        tick's moves, fused in the order recieve_local_opinions would fuse
+        them.
+        """
+
+        agent_indices = np.flatnonzero(recieving)
+
+        if not len(agent_indices):
+            return
+
+        broadcast_opinions = self.return_broadcast_opinions()
+        listener_positions, neighbour_indices = self.return_neighbour_pairs(
+            agent_indices
+        )
+
+        hearing = broadcast_opinions[neighbour_indices] != NO_OPINION
+        listener_indices = agent_indices[listener_positions[hearing]]
+
+        self.opinion_fusion.fuse_message_sequences(
+            self.calculated_collective_opinion,
+            listener_indices,
+            broadcast_opinions[neighbour_indices[hearing]]
+            ^ return_flip_mask(
+                self.communication_noise[listener_indices],
+                self.random_number_generator,
+            ),
+        )
+
+    def return_opinion_counts(self, agent_indices: np.ndarray) -> np.ndarray:
+        """
+        Black (row 0) and white (row 1) opinions broadcast within range of
+        each agent, not counting its own.
+        """
+
+        height, width = self.tile_grid.shape
+        broadcast_opinions = self.return_broadcast_opinions()
+        broadcasting = broadcast_opinions != NO_OPINION
+
+        # one summed-area table per opinion makes every window sum four
+        # lookups whatever the communication range
+        summed_area_tables = np.zeros((2, height + 1, width + 1), np.int64)
+        summed_area_tables[
+            broadcast_opinions[broadcasting],
+            self.rows[broadcasting] + 1,
+            self.columns[broadcasting] + 1,
+        ] = 1
+        np.cumsum(summed_area_tables, axis=1, out=summed_area_tables)
+        np.cumsum(summed_area_tables, axis=2, out=summed_area_tables)
+
+        row_min, row_max, column_min, column_max = self.return_communication_bounds(
+            agent_indices
+        )
+        opinion_counts = (
+            summed_area_tables[:, row_max + 1, column_max + 1]
+            - summed_area_tables[:, row_min, column_max + 1]
+            - summed_area_tables[:, row_max + 1, column_min]
+            + summed_area_tables[:, row_min, column_min]
+        )
+
+        self_broadcasting = broadcasting[agent_indices]
+        opinion_counts[
+            broadcast_opinions[agent_indices[self_broadcasting]],
+            np.flatnonzero(self_broadcasting),
+        ] -= 1
+
+        return opinion_counts
+
+    def recieve_opinion_counts(self, recieving: np.ndarray) -> None:
+        """
+        Every recieving agent hears the opinions broadcast after this
+        tick's moves as counts.
+        """
+
+        agent_indices = np.flatnonzero(recieving)
+
+        if not len(agent_indices):
+            return
+
+        opinion_counts = self.return_opinion_counts(agent_indices)
+        communication_noise = self.communication_noise[agent_indices]
+
+        # communication noise moves a binomial share of each count over to
+        # the other opinion
+        if communication_noise.any():
+            flipped_counts = self.random_number_generator.binomial(
+                opinion_counts, communication_noise
+            )
+            opinion_counts += flipped_counts[::-1] - flipped_counts
+
+        self.fuse_opinion_counts(agent_indices, opinion_counts)
+
+    def fuse_opinion_counts(
+        self, agent_indices: np.ndarray, opinion_counts: np.ndarray
+    ) -> None:
+        """
+        Fuses opinion_counts[0] black and opinion_counts[1] white opinions
+        into each agent's collective opinion.
+        """
+
+        # the counts carry no order, so each agent alternates between the
+        # two opinions from a random first one until one runs out
+
+        num_of_messages = opinion_counts.sum(axis=0)
+        first_opinions = self.random_number_generator.integers(
+            2, size=len(agent_indices)
+        )
+        remaining_opinions = (opinion_counts[1] > opinion_counts[0]).astype(np.int64)
+
+        message_orders = np.arange(num_of_messages.sum()) - np.repeat(
+            np.cumsum(num_of_messages) - num_of_messages, num_of_messages
+        )
+        opinions = np.where(
+            message_orders < np.repeat(2 * opinion_counts.min(axis=0), num_of_messages),
+            np.repeat(first_opinions, num_of_messages) ^ (message_orders & 1),
+            np.repeat(remaining_opinions, num_of_messages),
+        )
+
+        self.opinion_fusion.fuse_message_sequences(
+            self.calculated_collective_opinion,
+            np.repeat(agent_indices, num_of_messages),
+            opinions,
+        )
+
+    def write_back_to_agents(self) -> None:
+        """
+        Copies the arrays back onto the agent objects.
+        """
+
+        for agent_index, agent in enumerate(self.agents):
+            agent.current_cell = (
+                int(self.rows[agent_index]),
+                int(self.columns[agent_index]),
+            )
+            agent.current_direction_facing = int(self.headings[agent_index])
+
+            if self.is_malicious[agent_index]:
+                continue
+
+            agent.sensing = int(self.sensing[agent_index])
+            agent.committed_to_opinion = int(self.committed_to_opinion[agent_index])
+            agent.num_of_cells_observed = int(self.num_of_cells_observed[agent_index])
+            agent.num_of_white_cells_observed = int(
+                self.num_of_white_cells_observed[agent_index]
+            )
+            agent.calculated_collective_opinion = float(
+                self.calculated_collective_opinion[agent_index]
+            )
+            agent.cells_visited.set_packed_bits(
+                self.visited_cells[agent_index - self.num_of_malicious_agents]
+            )
@@ -0,0 +1,222 @@
+import numpy as np
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple, Union
+from .tile_properties import WallType
+
+EMPTY_TILE = -1
+GRID_SKELETON_CACHE_SIZE = 8
+POPCOUNT_TABLE = np.array([bin(byte).count("1") for byte in range(256)], np.uint8)
+
+
+def return_walls_from_wall_bitmask(wall_bitmask: int) -> Tuple[int, ...]:
+    """
+    Decodes a wall bitmask into the wall list a tile dict used to hold.
+    Corners keep their original ordering (e.g. top left is LEFT then TOP)
+    as agents turn based on the first wall.
+    """
+
+    walls = [wall for wall in range(4) if wall_bitmask & (1 << wall)]
+
+    if walls == [0, 3]:
+        walls.reverse()
+
+    return tuple(walls)
+
+
+WALL_BITMASK_TO_WALLS = tuple(
+    return_walls_from_wall_bitmask(wall_bitmask) for wall_bitmask in range(16)
+)
+
+
+def return_wall_bitmask_grid(width: int, height: int) -> np.ndarray:
+    walls = np.zeros((height, width), dtype=np.uint8)
+
+    walls[0, :] |= 1 << WallType.TOP_WALL.value
+    walls[:, width - 1] |= 1 << WallType.RIGHT_WALL.value
+    walls[height - 1, :] |= 1 << WallType.BOTTOM_WALL.value
+    walls[:, 0] |= 1 << WallType.LEFT_WALL.value
+
+    return walls
+
+
+class GridSkeleton:
+    """
+    The parts of a tile grid that only depend on its size, shared through
+    return_grid_skeleton by every grid of that size.
+    """
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width, self.height = width, height
+        self.walls = return_read_only_array(
+            return_wall_bitmask_grid(width=width, height=height)
+        )
+
+
+def return_read_only_array(array: np.ndarray) -> np.ndarray:
+    array.setflags(write=False)
+    return array
+
+
+@lru_cache(maxsize=GRID_SKELETON_CACHE_SIZE)
+def return_grid_skeleton(width: int, height: int) -> GridSkeleton:
+    return GridSkeleton(width=width, height=height)
+
+
+class PackedColourArray:
+    """
+    Tile colours packed eight to a byte along each row with np.packbits.
+    Indexing with (row, column), as ints or integer arrays, reads the bit
+    back; assigning a row slice packs a block of unpacked colour rows.
+    """
+
+    def __init__(self, width: int, height: int) -> None:
+        self.packed_colours = np.zeros((height, (width + 7) // 8), dtype=np.uint8)
+        self.shape = (height, width)
+        self.size = height * width
+
+    def __getitem__(self, coordinate: Tuple[Any, Any]) -> Any:
+        row, column = coordinate
+        return (self.packed_colours[row, column >> 3] >> (7 - (column & 7))) & 1
+
+    def __setitem__(self, key: Union[slice, Tuple[int, int]], value: Any) -> None:
+        if isinstance(key, slice):
+            self.packed_colours[key] = np.packbits(
+                np.asarray(value, dtype=bool), axis=1
+            )
+            return
+
+        row, column = key
+        bit = np.uint8(1 << (7 - (column & 7)))
+
+        if value:
+            self.packed_colours[row, column >> 3] |= bit
+        else:
+            self.packed_colours[row, column >> 3] &= ~bit
+
+    def count_white_tiles(self) -> int:
+        return int(POPCOUNT_TABLE[self.packed_colours].sum(dtype=np.int64))
+
+    def unpack(self) -> np.ndarray:
+        return np.unpackbits(self.packed_colours, axis=1, count=self.shape[1])
+
+
+class Tile:
+    """
+    Compatibility view of a single tile, readable and writable with the
+    keys of the old per-tile dict ("colour", "walls", "id", "agent").
+    """
+
+    __slots__ = ("tile_grid", "id")
+
+    def __init__(self, tile_grid: "TileGrid", coordinate: Tuple[int, int]) -> None:
+        self.tile_grid = tile_grid
+        self.id = coordinate
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "colour":
+            return int(self.tile_grid.colour[self.id])
+        if key == "walls":
+            return self.tile_grid.return_walls(self.id)
+        if key == "id":
+            return self.id
+        if key == "agent":
+            return self.tile_grid.return_agent(self.id)
+
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key == "agent":
+            self.tile_grid.set_agent(self.id, value)
+        elif key == "colour":
+            self.tile_grid.set_colour(self.id, value)
+        else:
+            raise KeyError(key)
+
+
+class TileGrid:
+    """
+    Struct-of-arrays tile grid. Colour is a uint8 array (or a
+    PackedColourArray for very large arenas), walls a uint8 bitmask
+    array (bit n set for WallType n) shared through the cached GridSkeleton
+    and occupancy an int32 array of agent indices into self.agents,
+    EMPTY_TILE where no agent is present. num_of_white_tiles is kept by
+    the generators and set_colour, so the ratio never needs a grid scan.
+    """
+
+    def __init__(
+        self,
+        colour: Union[np.ndarray, PackedColourArray],
+        skeleton: GridSkeleton,
+        num_of_white_tiles: Union[int, None] = None,
+    ) -> None:
+        self.colour = colour
+        self.skeleton = skeleton
+        self.num_of_white_tiles = (
+            self.count_white_tiles()
+            if num_of_white_tiles is None
+            else num_of_white_tiles
+        )
+        self.walls = skeleton.walls
+        self.occupancy = np.full(colour.shape, EMPTY_TILE, dtype=np.int32)
+        self.agents: List[Any] = []
+        self.agent_indices: Dict[Any, int] = {}
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.colour.shape
+
+    @property
+    def size(self) -> int:
+        return self.colour.size
+
+    def __getitem__(self, coordinate: Tuple[int, int]) -> Tile:
+        return Tile(self, tuple(coordinate))
+
+    def count_white_tiles(self) -> int:
+        if isinstance(self.colour, PackedColourArray):
+            return self.colour.count_white_tiles()
+
+        return int(np.count_nonzero(self.colour))
+
+    def set_colour(self, coordinate: Tuple[int, int], colour: int) -> None:
+        self.num_of_white_tiles += int(colour) - int(self.colour[coordinate])
+        self.colour[coordinate] = colour
+
+    def register_agent(self, agent: Any) -> int:
+        agent_index = self.agent_indices.get(agent)
+
+        if agent_index is None:
+            agent_index = len(self.agents)
+            self.agents.append(agent)
+            self.agent_indices[agent] = agent_index
+
+        return agent_index
+
+    def return_agent(self, coordinate: Tuple[int, int]) -> Union[Any, None]:
+        agent_index = self.occupancy[coordinate]
+
+        if agent_index == EMPTY_TILE:
+            return None
+
+        return self.agents[agent_index]
+
+    def set_agent(self, coordinate: Tuple[int, int], agent: Union[Any, None]) -> None:
+        self.occupancy[coordinate] = (
+            EMPTY_TILE if agent is None else self.register_agent(agent)
+        )
+
+    def return_agent_indices_in_area(
+        self, row_min: int, row_max: int, column_min: int, column_max: int
+    ) -> np.ndarray:
+        """
+        Indices into self.agents of the agents within the inclusive bounds,
+        in row-major order of their cells. occupancy doubles as the index:
+        one slice and mask find every agent in the window without visiting
+        tiles one at a time.
+        """
+
+        local_area = self.occupancy[row_min : row_max + 1, column_min : column_max + 1]
+        return local_area[local_area != EMPTY_TILE]
+
+    def return_walls(self, coordinate: Tuple[int, int]) -> Tuple[int, ...]:
+        return WALL_BITMASK_TO_WALLS[self.walls[coordinate]]
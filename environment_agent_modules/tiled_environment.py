@@ -1,87 +1,174 @@
 from math import modf
 import numpy as np
 
-from typing import Dict, List, Tuple
-from .tile_properties import TileColour, WallType
-from .regex_dictionary import RegexDict
-
-
-def return_coordinate_to_walls_dict(width: int, height: int) -> RegexDict:
-    return RegexDict(
-        {
-            # top left corner
-            "^0,0": [WallType.LEFT_WALL.value, WallType.TOP_WALL.value],
-            # top right corner
-            f"^0,{width - 1}": [WallType.TOP_WALL.value, WallType.RIGHT_WALL.value],
-            # bottom right corner
-            f"{height - 1},{width - 1}": [
-                WallType.RIGHT_WALL.value,
-                WallType.BOTTOM_WALL.value,
-            ],
-            # bottom left corner
-            f"{height - 1},0": [
-                WallType.BOTTOM_WALL.value,
-                WallType.LEFT_WALL.value,
-            ],
-            # top_edge
-            "^0,.": [WallType.TOP_WALL.value],
-            # left_wall
-            ".,0$": [WallType.LEFT_WALL.value],
-            # right_wall
-            f".,{width - 1}": [WallType.RIGHT_WALL.value],
-            # bottom_edge
-            f"{height - 1},.": [WallType.BOTTOM_WALL.value],
-            # all other tiles
-            "\d,\d": [],
-        }
+from functools import partial
+from typing import Tuple, Union
+from .tile_properties import TileColour
+from .tile_grid import PackedColourArray, TileGrid, return_grid_skeleton
+from .chunked_tile_grid import (
+    ChunkedTileGrid,
+    return_chunk_sizes,
+    return_chunk_slices,
+)
+
+COLOUR_GENERATION_BLOCK_SIZE = 2**20
+CHUNK_SEED_BOUND = 2**63 - 1
+
+
+def return_empty_tile_grid(
+    width: int, height: int, packed_colours: bool = False, chunked: bool = False
+) -> TileGrid:
+    if chunked:
+        if packed_colours:
+            raise ValueError("chunked tile grids can not also have packed colours")
+
+        return ChunkedTileGrid(width=width, height=height)
+
+    return TileGrid(
+        colour=(
+            PackedColourArray(width=width, height=height)
+            if packed_colours
+            else np.zeros((height, width), dtype=np.uint8)
+        ),
+        skeleton=return_grid_skeleton(width=width, height=height),
+        num_of_white_tiles=0,
     )
 
 
-def tile_creator(
-    colour: TileColour,
-    walls: List[int],
-    coordinate: Tuple[int, int],
-):
-    return {
-        "colour": colour,
-        "walls": walls,
-        "id": (coordinate),
-        "agent": None,
-    }
+def return_colour_generation_row_blocks(width: int, height: int):
+    """
+    Splits the rows into blocks of about COLOUR_GENERATION_BLOCK_SIZE tiles,
+    so packed grids never hold a full byte-per-tile copy of the colours.
+    """
+
+    rows_per_block = max(1, COLOUR_GENERATION_BLOCK_SIZE // width)
+
+    for first_row in range(0, height, rows_per_block):
+        yield slice(first_row, min(first_row + rows_per_block, height))
+
+
+def return_nonclustered_colour_chunk(
+    chunk_row: int,
+    chunk_column: int,
+    shape: Tuple[int, int],
+    nums_of_white_tiles: np.ndarray,
+    entropy: int,
+) -> np.ndarray:
+    """
+    Scatters the chunk's share of white tiles, drawn up front by
+    non_clustered_environment, uniformly over the chunk.
+    """
+
+    rows, columns = return_chunk_slices(shape, chunk_row, chunk_column)
+    chunk_shape = (rows.stop - rows.start, columns.stop - columns.start)
+
+    random_number_generator = np.random.default_rng(
+        np.random.SeedSequence(entropy, spawn_key=(chunk_row, chunk_column))
+    )
+
+    white_tiles = np.zeros(chunk_shape[0] * chunk_shape[1], dtype=bool)
+    white_tiles[
+        random_number_generator.permutation(white_tiles.size)[
+            : nums_of_white_tiles[chunk_row, chunk_column]
+        ]
+    ] = True
+
+    return white_tiles.reshape(chunk_shape)
 
 
 def non_clustered_environment(
     width: int,
     height: int,
     ratio_of_white_to_black_tiles: float,
-    tile_grid: np.ndarray,
-    tile_walls_to_coordinates_map: Dict[str, List[int]],
+    tile_grid: TileGrid,
+    random_number_generator: Union[np.random.Generator, None] = None,
 ):
-    random_numbers_between_0_1 = np.random.rand(height, width)
-    for row in range(height):
-        for column in range(width):
-            if (
-                random_numbers_between_0_1[(row, column)]
-                < ratio_of_white_to_black_tiles
-            ):
-                colour = TileColour.WHITE.value
-            else:
-                colour = TileColour.BLACK.value
-            tile_grid[(row, column)] = tile_creator(
-                colour=colour,
-                walls=tile_walls_to_coordinates_map.get(f"{row},{column}"),
-                coordinate=(row, column),
+    if isinstance(tile_grid, ChunkedTileGrid):
+        # every chunk is seeded from (entropy, chunk position) alone. The
+        # number of white tiles in each chunk (binomial, as with independent
+        # tiles) is drawn for the whole grid here, so the total is known
+        # without building any chunk
+        entropy = int(
+            np.random.randint(CHUNK_SEED_BOUND, dtype=np.int64)
+            if random_number_generator is None
+            else random_number_generator.integers(CHUNK_SEED_BOUND)
+        )
+        nums_of_white_tiles = (
+            np.random.default_rng(entropy)
+            .binomial(
+                return_chunk_sizes(tile_grid.shape), ratio_of_white_to_black_tiles
             )
+            .astype(np.int32)
+        )
+
+        tile_grid.set_colour_chunk_factory(
+            partial(
+                return_nonclustered_colour_chunk,
+                shape=tile_grid.shape,
+                nums_of_white_tiles=nums_of_white_tiles,
+                entropy=entropy,
+            ),
+            num_of_white_tiles=int(nums_of_white_tiles.sum()),
+        )
+
+        return tile_grid
+
+    for rows in return_colour_generation_row_blocks(width=width, height=height):
+        block_shape = (rows.stop - rows.start, width)
+
+        random_numbers_between_0_1 = (
+            np.random.rand(*block_shape)
+            if random_number_generator is None
+            else random_number_generator.random(block_shape)
+        )
+
+        white_tiles = random_numbers_between_0_1 < ratio_of_white_to_black_tiles
+
+        tile_grid.colour[rows] = np.where(
+            white_tiles, TileColour.WHITE.value, TileColour.BLACK.value
+        ).astype(np.uint8)
+        tile_grid.num_of_white_tiles += int(np.count_nonzero(white_tiles))
 
     return tile_grid
 
 
+def return_clustered_colours(
+    row_numbers: np.ndarray,
+    column_numbers: np.ndarray,
+    num_of_full_columns: float,
+    row_number_of_last_intial_tile: int,
+    intial_tile_colour: int,
+    non_intial_tile_colour: int,
+) -> np.ndarray:
+    intial_tiles = (column_numbers < num_of_full_columns) | (
+        (column_numbers == num_of_full_columns)
+        & (row_numbers[:, np.newaxis] < row_number_of_last_intial_tile)
+    )
+
+    return np.where(intial_tiles, intial_tile_colour, non_intial_tile_colour).astype(
+        np.uint8
+    )
+
+
+def return_clustered_colour_chunk(
+    shape: Tuple[int, int],
+    clustered_colours: partial,
+    chunk_row: int,
+    chunk_column: int,
+) -> np.ndarray:
+    rows, columns = return_chunk_slices(shape, chunk_row, chunk_column)
+
+    return clustered_colours(
+        row_numbers=np.arange(rows.start, rows.stop),
+        column_numbers=np.arange(columns.start, columns.stop),
+    )
+
+
 def clustered_environment(
     width: int,
     height: int,
     ratio_of_inital_to_non_inital_tile: float,
-    tile_grid: np.ndarray,
-    tile_walls_to_coordinates_map: Dict[str, List[int]],
+    tile_grid: TileGrid,
     intial_tile_colour: int,
     non_intial_tile_colour: int,
 ):
@@ -91,23 +178,35 @@ def clustered_environment(
 
     row_number_of_last_intial_tile = int(round(portion_of_remaining_column * height))
 
-    for row in range(height):
-        for column in range(width):
-            if column < num_of_full_columns:
-                colour = intial_tile_colour
-            elif (column == num_of_full_columns) and (
-                row < row_number_of_last_intial_tile
-            ):
-                colour = intial_tile_colour
-            else:
-                colour = non_intial_tile_colour
-
-            tile_grid[(row, column)] = tile_creator(
-                colour=colour,
-                walls=tile_walls_to_coordinates_map.get(f"{row},{column}"),
-                coordinate=(row, column),
+    clustered_colours = partial(
+        return_clustered_colours,
+        num_of_full_columns=num_of_full_columns,
+        row_number_of_last_intial_tile=row_number_of_last_intial_tile,
+        intial_tile_colour=intial_tile_colour,
+        non_intial_tile_colour=non_intial_tile_colour,
+    )
+
+    if isinstance(tile_grid, ChunkedTileGrid):
+        tile_grid.set_colour_chunk_factory(
+            partial(return_clustered_colour_chunk, tile_grid.shape, clustered_colours)
+        )
+    else:
+        for rows in return_colour_generation_row_blocks(width=width, height=height):
+            tile_grid.colour[rows] = clustered_colours(
+                row_numbers=np.arange(rows.start, rows.stop),
+                column_numbers=np.arange(width),
             )
 
+    num_of_intial_tiles = int(num_of_full_columns) * height + (
+        row_number_of_last_intial_tile if num_of_full_columns < width else 0
+    )
+
+    tile_grid.num_of_white_tiles = (
+        num_of_intial_tiles
+        if intial_tile_colour == TileColour.WHITE.value
+        else tile_grid.size - num_of_intial_tiles
+    )
+
     return tile_grid
 
 
@@ -131,7 +230,10 @@ def create_clustered_inital_observation_useful_tile_grid(
     width: int,
     height: int,
     ratio_of_white_to_black_tiles: float = 0.5,
-) -> np.ndarray:
+    random_number_generator: Union[np.random.Generator, None] = None,
+    packed_colours: bool = False,
+    chunked: bool = False,
+) -> TileGrid:
     majority_tile_colour, minority_tile_colour = return_majority_minority_tile_colour(
         ratio_of_white_to_black_tiles
     )
@@ -142,9 +244,11 @@ def create_clustered_inital_observation_useful_tile_grid(
         ratio_of_inital_to_non_inital_tile=return_ratio_of_majority_to_minority_tiles(
             majority_tile_colour, ratio_of_white_to_black_tiles
         ),
-        tile_grid=np.empty((height, width), dtype=object),
-        tile_walls_to_coordinates_map=return_coordinate_to_walls_dict(
-            width=width, height=height
+        tile_grid=return_empty_tile_grid(
+            width=width,
+            height=height,
+            packed_colours=packed_colours,
+            chunked=chunked,
         ),
         intial_tile_colour=majority_tile_colour.value,
         non_intial_tile_colour=minority_tile_colour.value,
@@ -155,7 +259,10 @@ def create_clustered_inital_observation_not_useful_tile_grid(
     width: int,
     height: int,
     ratio_of_white_to_black_tiles: float = 0.5,
-) -> np.ndarray:
+    random_number_generator: Union[np.random.Generator, None] = None,
+    packed_colours: bool = False,
+    chunked: bool = False,
+) -> TileGrid:
     majority_tile_colour, minority_tile_colour = return_majority_minority_tile_colour(
         ratio_of_white_to_black_tiles
     )
@@ -168,9 +275,11 @@ def create_clustered_inital_observation_not_useful_tile_grid(
                 majority_tile_colour, ratio_of_white_to_black_tiles
             )
         ),
-        tile_grid=np.empty((height, width), dtype=object),
-        tile_walls_to_coordinates_map=return_coordinate_to_walls_dict(
-            width=width, height=height
+        tile_grid=return_empty_tile_grid(
+            width=width,
+            height=height,
+            packed_colours=packed_colours,
+            chunked=chunked,
         ),
         intial_tile_colour=minority_tile_colour.value,
         non_intial_tile_colour=majority_tile_colour.value,
@@ -181,13 +290,19 @@ def create_nonclustered_tile_grid(
     width: int,
     height: int,
     ratio_of_white_to_black_tiles: float = 0.5,
-) -> np.ndarray:
+    random_number_generator: Union[np.random.Generator, None] = None,
+    packed_colours: bool = False,
+    chunked: bool = False,
+) -> TileGrid:
     return non_clustered_environment(
         width=width,
         height=height,
         ratio_of_white_to_black_tiles=ratio_of_white_to_black_tiles,
-        tile_grid=np.empty((height, width), dtype=object),
-        tile_walls_to_coordinates_map=return_coordinate_to_walls_dict(
-            width=width, height=height
+        tile_grid=return_empty_tile_grid(
+            width=width,
+            height=height,
+            packed_colours=packed_colours,
+            chunked=chunked,
         ),
+        random_number_generator=random_number_generator,
     )
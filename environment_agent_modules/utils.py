@@ -1,5 +1,6 @@
+import numpy as np
 from typing import Dict, Tuple
-from numpy import ndarray
+from .tile_grid import TileGrid
 from .tile_properties import TileColour
 from .swarm_agent_enums import ObjectType
 
@@ -20,28 +21,30 @@ def navigate_tile_grid_and_call_function_over_range(
     return count
 
 
-def count_of_tile_colour(tile_grid: ndarray, colour: TileColour):
-    return navigate_tile_grid_and_call_function_over_range(
-        row_range=(0, tile_grid.shape[0]),
-        column_range=(0, tile_grid.shape[1]),
-        func_config={},
-        func=lambda coordinate: (TileColour(tile_grid[coordinate]["colour"]) == colour),
-    )
+def count_of_tile_colour(tile_grid: TileGrid, colour: TileColour) -> int:
+    if colour == TileColour.WHITE:
+        return tile_grid.num_of_white_tiles
+    return tile_grid.size - tile_grid.num_of_white_tiles
 
 
-def return_ratio_of_white_to_black_tiles(tile_grid: ndarray) -> float:
-    return count_of_tile_colour(tile_grid=tile_grid, colour=TileColour.WHITE) / (
-        tile_grid.size
-    )
+def return_ratio_of_white_to_black_tiles(tile_grid: TileGrid) -> float:
+    return tile_grid.num_of_white_tiles / tile_grid.size
+
+
+def return_episode_random_number_generator(
+    seed_sequence: np.random.SeedSequence,
+) -> np.random.Generator:
+    """
+    Generator for the next episode. Episode n of a root seed_sequence is
+    seeded from SeedSequence(seed, spawn_key=(n,)), so shards of a run can
+    rebuild any episode from the root seed alone.
+    """
+
+    return np.random.default_rng(seed_sequence.spawn(1)[0])
 
 
 def validate_cell(new_cell: Tuple[int, int], grid_shape: Tuple[int, int]) -> bool:
-    return all(
-        [
-            (row_or_col >= 0 and row_or_col < dimension)
-            for row_or_col, dimension in zip(new_cell, grid_shape)
-        ]
-    )
+    return 0 <= new_cell[0] < grid_shape[0] and 0 <= new_cell[1] < grid_shape[1]
 
 
 def get_object_type_based_on_num_wall(num_of_walls: int) -> int:
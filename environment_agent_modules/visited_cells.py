@@ -0,0 +1,170 @@
+import numpy as np
+from typing import Dict, Iterator, Tuple, Union
+from .tile_grid import POPCOUNT_TABLE, TileGrid
+from .chunked_tile_grid import CHUNK_SIZE, ChunkedTileGrid, return_num_of_chunks
+
+CHUNK_ROW_STRIDE = CHUNK_SIZE >> 3
+
+
+class VisitedCells:
+    """
+    The cells an agent has visited, stored as one bit per grid cell packed
+    eight to a byte along each row (the bit order of PackedColourArray),
+    with a running count of the set bits. Membership tests and len() are
+    O(1) and memory is fixed at height * ceil(width / 8) bytes, allocated
+    on the first visit. Chunked visited cells, for ChunkedTileGrids, keep
+    the bits of each CHUNK_SIZE x CHUNK_SIZE chunk of the grid apart and
+    only allocate the chunks that are visited.
+    """
+
+    __slots__ = ("grid_shape", "row_stride", "bits", "num_of_cells", "chunked")
+
+    def __init__(self, grid_shape: Tuple[int, int], chunked: bool = False) -> None:
+        self.grid_shape = tuple(grid_shape)
+        self.row_stride = (self.grid_shape[1] + 7) >> 3
+        self.chunked = chunked
+        self.bits: Union[bytearray, Dict[Tuple[int, int], bytearray], None] = (
+            {} if chunked else None
+        )
+        self.num_of_cells = 0
+
+    def add(self, cell: Tuple[int, int]) -> None:
+        row, column = cell
+
+        if self.chunked:
+            chunk = (row // CHUNK_SIZE, column // CHUNK_SIZE)
+            bits = self.bits.get(chunk)
+
+            if bits is None:
+                bits = self.bits[chunk] = bytearray(CHUNK_SIZE * CHUNK_ROW_STRIDE)
+
+            byte_index = (row % CHUNK_SIZE) * CHUNK_ROW_STRIDE + (
+                (column % CHUNK_SIZE) >> 3
+            )
+        else:
+            bits = self.bits
+
+            if bits is None:
+                bits = self.bits = bytearray(self.grid_shape[0] * self.row_stride)
+
+            byte_index = row * self.row_stride + (column >> 3)
+
+        byte = bits[byte_index]
+        bit = 0x80 >> (column & 7)
+
+        if not byte & bit:
+            bits[byte_index] = byte | bit
+            self.num_of_cells += 1
+
+    def __contains__(self, cell: Tuple[int, int]) -> bool:
+        row, column = cell
+
+        if self.chunked:
+            bits = self.bits.get((row // CHUNK_SIZE, column // CHUNK_SIZE))
+
+            return bits is not None and bool(
+                bits[
+                    (row % CHUNK_SIZE) * CHUNK_ROW_STRIDE + ((column % CHUNK_SIZE) >> 3)
+                ]
+                & (0x80 >> (column & 7))
+            )
+
+        return self.bits is not None and bool(
+            self.bits[row * self.row_stride + (column >> 3)] & (0x80 >> (column & 7))
+        )
+
+    def __len__(self) -> int:
+        return self.num_of_cells
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        if not self.chunked:
+            for row, column in zip(*np.nonzero(self.return_bitmap())):
+                yield int(row), int(column)
+
+            return
+
+        for (chunk_row, chunk_column), bits in sorted(self.bits.items()):
+            for row, column in zip(
+                *np.nonzero(
+                    np.unpackbits(
+                        np.frombuffer(bits, np.uint8).reshape(
+                            CHUNK_SIZE, CHUNK_ROW_STRIDE
+                        ),
+                        axis=1,
+                    )
+                )
+            ):
+                yield int(chunk_row * CHUNK_SIZE + row), int(
+                    chunk_column * CHUNK_SIZE + column
+                )
+
+    def return_packed_bits(self) -> np.ndarray:
+        """
+        The bits as a (height, ceil(width / 8)) uint8 array, which for
+        chunked visited cells is built for the whole grid.
+        """
+
+        if self.chunked:
+            num_of_chunk_rows, num_of_chunk_columns = return_num_of_chunks(
+                self.grid_shape
+            )
+            packed_bits = np.zeros(
+                (
+                    num_of_chunk_rows * CHUNK_SIZE,
+                    num_of_chunk_columns * CHUNK_ROW_STRIDE,
+                ),
+                np.uint8,
+            )
+
+            for (chunk_row, chunk_column), bits in self.bits.items():
+                packed_bits[
+                    chunk_row * CHUNK_SIZE : (chunk_row + 1) * CHUNK_SIZE,
+                    chunk_column
+                    * CHUNK_ROW_STRIDE : (chunk_column + 1)
+                    * CHUNK_ROW_STRIDE,
+                ] = np.frombuffer(bits, np.uint8).reshape(CHUNK_SIZE, CHUNK_ROW_STRIDE)
+
+            return packed_bits[: self.grid_shape[0], : self.row_stride]
+
+        if self.bits is None:
+            return np.zeros((self.grid_shape[0], self.row_stride), np.uint8)
+
+        return np.frombuffer(self.bits, np.uint8).reshape(
+            self.grid_shape[0], self.row_stride
+        )
+
+    def return_bitmap(self) -> np.ndarray:
+        return np.unpackbits(
+            self.return_packed_bits(), axis=1, count=self.grid_shape[1]
+        ).astype(bool)
+
+    def set_packed_bits(self, packed_bits: np.ndarray) -> None:
+        packed_bits = np.asarray(packed_bits, np.uint8)
+        self.num_of_cells = int(POPCOUNT_TABLE[packed_bits].sum(dtype=np.int64))
+
+        if not self.chunked:
+            self.bits = bytearray(packed_bits.tobytes())
+            return
+
+        self.bits = {}
+        num_of_chunk_rows, num_of_chunk_columns = return_num_of_chunks(self.grid_shape)
+
+        for chunk_row in range(num_of_chunk_rows):
+            for chunk_column in range(num_of_chunk_columns):
+                region = packed_bits[
+                    chunk_row * CHUNK_SIZE : (chunk_row + 1) * CHUNK_SIZE,
+                    chunk_column
+                    * CHUNK_ROW_STRIDE : (chunk_column + 1)
+                    * CHUNK_ROW_STRIDE,
+                ]
+
+                if region.any():
+                    chunk_bits = np.zeros((CHUNK_SIZE, CHUNK_ROW_STRIDE), np.uint8)
+                    chunk_bits[: region.shape[0], : region.shape[1]] = region
+                    self.bits[(chunk_row, chunk_column)] = bytearray(
+                        chunk_bits.tobytes()
+                    )
+
+
+def return_visited_cells(tile_grid: TileGrid) -> VisitedCells:
+    return VisitedCells(tile_grid.shape, chunked=isinstance(tile_grid, ChunkedTileGrid))
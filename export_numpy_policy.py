@@ -0,0 +1,29 @@
+import argparse
+from helper_files import TRAINED_MODELS_DIRECTORY, export_dqn_to_numpy_policy
+
+parser = argparse.ArgumentParser(
+    description="Export a trained DQN's Q-network to a torch-free .npz policy"
+)
+
+parser.add_argument(
+    "--model_name",
+    type=str,
+    default="sense_broadcast_model",
+    help="Name of the saved DQN to export (default=sense_broadcast_model)",
+)
+parser.add_argument(
+    "--models_directory",
+    type=str,
+    default=TRAINED_MODELS_DIRECTORY,
+    help="Directory the DQN is read from and the .npz written to",
+)
+
+args = parser.parse_args()
+
+
+if __name__ == "__main__":
+    print(
+        export_dqn_to_numpy_policy(
+            model_name=args.model_name, models_directory=args.models_directory
+        )
+    )
@@ -0,0 +1,61 @@
+import argparse
+from environment_agent_modules import generate_environment_corpus
+from skill_testing_modules.testing_environments.testing_utils import (
+    environment_type_map,
+)
+
+parser = argparse.ArgumentParser(
+    description="Pre-generate a memory-mapped corpus of tiled environments"
+)
+
+parser.add_argument(
+    "--corpus_directory",
+    type=str,
+    required=True,
+    help=("Directory the corpus colours and index are written to"),
+)
+parser.add_argument(
+    "--height",
+    type=int,
+    default=38,
+    help="The height of the tiled environments (default=38)",
+)
+parser.add_argument(
+    "--width",
+    type=int,
+    default=38,
+    help="The width of the tiled environments (default=38)",
+)
+parser.add_argument(
+    "--ratios_of_white_to_black_tiles",
+    type=float,
+    nargs="+",
+    default=[0.52, 0.62, 0.72],
+    help="The ratios of white to black tiles (default=0.52 0.62 0.72)",
+)
+parser.add_argument(
+    "--num_of_grids",
+    type=int,
+    default=10,
+    help="Number of grids per environment type and ratio (default=10)",
+)
+parser.add_argument(
+    "--seed",
+    type=int,
+    default=None,
+    help=("Root seed for the corpus (default=None)"),
+)
+
+args = parser.parse_args()
+
+
+if __name__ == "__main__":
+    generate_environment_corpus(
+        corpus_directory=args.corpus_directory,
+        environment_type_map=environment_type_map,
+        ratios_of_white_to_black_tiles=args.ratios_of_white_to_black_tiles,
+        num_of_grids=args.num_of_grids,
+        width=args.width,
+        height=args.height,
+        seed=args.seed,
+    )
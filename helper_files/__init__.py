@@ -1,2 +1,5 @@
 from .constants import *
+from .numpy_policy import *
+from .lookup_table_policy import *
 from .utils import *
+from .model_registry import *
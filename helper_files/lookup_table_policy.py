@@ -0,0 +1,201 @@
+import numpy as np
+from typing import Any, Sequence, Tuple, Union
+from .numpy_policy import DiscreteActionSpace
+
+LOOKUP_TABLE_POLICY_FILE_EXTENSION = ".table.npz"
+DEFAULT_GRID_RESOLUTION = (101, 2, 101)
+COMPILE_BATCH_SIZE = 2**16
+
+
+class LookupTablePolicy:
+    """
+    A policy compiled into a table of actions over a regular grid of the
+    independent observations (the ratio of cells observed, the opinion and
+    the collective opinion), grid_resolution points per dimension from
+    observation_low to observation_high. The last observation, the absolute
+    difference of the collective opinion and the opinion, follows from the
+    grid point so it needs no axis of its own. predict snaps each
+    observation to its nearest grid point and answers with one array index.
+    Like NumpyPolicy it can be loaded in place of a DQN.
+    """
+
+    file_extension = LOOKUP_TABLE_POLICY_FILE_EXTENSION
+
+    def __init__(
+        self,
+        actions: np.ndarray,
+        observation_low: np.ndarray,
+        observation_high: np.ndarray,
+        exploration_rate: float,
+        num_of_actions: int,
+    ) -> None:
+        self.actions = actions
+        self.grid_resolution = np.array(actions.shape)
+        self.observation_low = np.asarray(observation_low, np.float32)
+        self.observation_high = np.asarray(observation_high, np.float32)
+        self.exploration_rate = exploration_rate
+        self.action_space = DiscreteActionSpace(n=num_of_actions)
+
+        self.flat_actions = actions.reshape(-1).astype(np.int64)
+        self.grid_scale = (self.grid_resolution - 1) / (
+            self.observation_high - self.observation_low
+        )
+        self.grid_strides = np.array(actions.strides) // actions.itemsize
+
+    @classmethod
+    def load(cls, path: str) -> "LookupTablePolicy":
+        with np.load(path) as policy:
+            return cls(
+                actions=policy["actions"],
+                observation_low=policy["observation_low"],
+                observation_high=policy["observation_high"],
+                exploration_rate=float(policy["exploration_rate"]),
+                num_of_actions=int(policy["num_of_actions"]),
+            )
+
+    def save(self, path: str) -> None:
+        np.savez_compressed(
+            path,
+            actions=self.actions,
+            observation_low=self.observation_low,
+            observation_high=self.observation_high,
+            exploration_rate=self.exploration_rate,
+            num_of_actions=self.action_space.n,
+        )
+
+    def return_flat_grid_indices(self, observations: np.ndarray) -> np.ndarray:
+        independent_observations = np.asarray(observations, np.float32)[
+            ..., : len(self.grid_resolution)
+        ]
+        grid_indices = np.rint(
+            (independent_observations - self.observation_low) * self.grid_scale
+        ).astype(np.int64)
+        np.clip(grid_indices, 0, self.grid_resolution - 1, out=grid_indices)
+
+        return grid_indices @ self.grid_strides
+
+    def predict(
+        self,
+        observation: np.ndarray,
+        state: Any = None,
+        episode_start: Any = None,
+        deterministic: bool = True,
+    ) -> Tuple[np.ndarray, None]:
+        return self.flat_actions[self.return_flat_grid_indices(observation)], None
+
+
+def return_grid_observations(
+    grid_resolution: Sequence[int],
+    observation_low: np.ndarray,
+    observation_high: np.ndarray,
+    flat_grid_indices: np.ndarray,
+) -> np.ndarray:
+    grid_indices = np.stack(
+        np.unravel_index(flat_grid_indices, grid_resolution), axis=-1
+    )
+
+    return return_sense_broadcast_observations(
+        observation_low
+        + grid_indices
+        / np.maximum(np.array(grid_resolution) - 1, 1)
+        * (observation_high - observation_low)
+    )
+
+
+def return_sense_broadcast_observations(
+    independent_observations: np.ndarray,
+) -> np.ndarray:
+    """
+    Appends the absolute difference of the collective opinion and the
+    opinion to rows of (ratio of cells observed, opinion, collective
+    opinion), as SwarmAgent.return_sense_broadcast_states builds them.
+    """
+
+    opinions = independent_observations[..., 1]
+    calculated_collective_opinions = independent_observations[..., 2]
+
+    return np.concatenate(
+        (
+            independent_observations,
+            np.abs(calculated_collective_opinions - opinions)[..., None],
+        ),
+        axis=-1,
+    ).astype(np.float32)
+
+
+def compile_lookup_table_policy(
+    policy: Any,
+    grid_resolution: Sequence[int] = DEFAULT_GRID_RESOLUTION,
+    observation_low: Union[float, Sequence[float]] = 0.0,
+    observation_high: Union[float, Sequence[float]] = 1.0,
+) -> LookupTablePolicy:
+    """
+    Samples the greedy action of policy (a DQN, NumpyPolicy or anything
+    with the same predict) at every point of the grid, with the derived
+    observation filled in, and stores the actions as a uint8 table.
+    """
+
+    grid_resolution = tuple(int(resolution) for resolution in grid_resolution)
+    observation_low, observation_high = (
+        np.broadcast_to(np.asarray(bound, np.float32), len(grid_resolution))
+        for bound in (observation_low, observation_high)
+    )
+    actions = np.empty(grid_resolution, dtype=np.uint8)
+    flat_actions = actions.reshape(-1)
+
+    for start in range(0, actions.size, COMPILE_BATCH_SIZE):
+        flat_grid_indices = np.arange(
+            start, min(start + COMPILE_BATCH_SIZE, actions.size)
+        )
+        flat_actions[flat_grid_indices] = policy.predict(
+            return_grid_observations(
+                grid_resolution, observation_low, observation_high, flat_grid_indices
+            ),
+            deterministic=True,
+        )[0]
+
+    return LookupTablePolicy(
+        actions=actions,
+        observation_low=observation_low,
+        observation_high=observation_high,
+        exploration_rate=policy.exploration_rate,
+        num_of_actions=policy.action_space.n,
+    )
+
+
+def return_sense_broadcast_observation_samples(
+    num_of_samples: int, random_number_generator: np.random.Generator
+) -> np.ndarray:
+    """
+    Random sense/broadcast (and commit decision) observations: the ratio of
+    cells observed, a binary opinion, the collective opinion and their
+    absolute difference, as SwarmAgent.return_sense_broadcast_states builds
+    them.
+    """
+
+    ratios_of_cells_observed = random_number_generator.random(num_of_samples)
+    opinions = random_number_generator.integers(2, size=num_of_samples)
+    calculated_collective_opinions = random_number_generator.random(num_of_samples)
+
+    return return_sense_broadcast_observations(
+        np.stack(
+            (ratios_of_cells_observed, opinions, calculated_collective_opinions),
+            axis=-1,
+        )
+    )
+
+
+def return_disagreement_rate(
+    lookup_table_policy: LookupTablePolicy, policy: Any, observations: np.ndarray
+) -> float:
+    """
+    Fraction of observations on which the table and the exact policy pick
+    different greedy actions.
+    """
+
+    return float(
+        np.mean(
+            lookup_table_policy.predict(observations)[0]
+            != policy.predict(observations, deterministic=True)[0]
+        )
+    )
@@ -0,0 +1,80 @@
+import os
+import threading
+from typing import Any, Dict, Tuple
+from .constants import TRAINED_MODELS_DIRECTORY
+from .utils import return_model
+
+
+def return_model_file_path(
+    model_name: str, models_directory: str, file_extension: str = ".zip"
+) -> str:
+    """
+    Path of the saved model, with the file extension added (.zip for
+    stable baselines models) if model_name leaves it out.
+    """
+
+    model_file_path = f"{models_directory}/{model_name}"
+
+    if not os.path.exists(model_file_path) and os.path.exists(
+        f"{model_file_path}{file_extension}"
+    ):
+        return f"{model_file_path}{file_extension}"
+
+    return model_file_path
+
+
+class ModelRegistry:
+    """
+    Loads each saved model once per process and hands out the shared
+    instance. Models are keyed by model type, name and directory, and are
+    reloaded when the file's mtime changes. Agents only call predict on
+    them, so one instance can serve a whole swarm and the prefetcher's
+    worker thread.
+    """
+
+    def __init__(self) -> None:
+        self.models: Dict[Tuple[str, str, str], Tuple[float, Any]] = {}
+        self.lock = threading.Lock()
+
+    def return_model(
+        self,
+        model_name: str,
+        models_directory: str = TRAINED_MODELS_DIRECTORY,
+        model_type: str = "DQN",
+    ) -> Any:
+        model_class = return_model(model_type)
+        model_file_path = return_model_file_path(
+            model_name,
+            models_directory,
+            file_extension=getattr(model_class, "file_extension", ".zip"),
+        )
+        modified_time = os.path.getmtime(model_file_path)
+        key = (model_type, model_name, models_directory)
+
+        with self.lock:
+            loaded_modified_time, model = self.models.get(key, (None, None))
+
+            if loaded_modified_time != modified_time:
+                model = model_class.load(model_file_path)
+                self.models[key] = (modified_time, model)
+
+            return model
+
+    def clear(self) -> None:
+        with self.lock:
+            self.models.clear()
+
+
+MODEL_REGISTRY = ModelRegistry()
+
+
+def load_shared_model(
+    model_name: str,
+    models_directory: str = TRAINED_MODELS_DIRECTORY,
+    model_type: str = "DQN",
+) -> Any:
+    return MODEL_REGISTRY.return_model(
+        model_name=model_name,
+        models_directory=models_directory,
+        model_type=model_type,
+    )
@@ -0,0 +1,116 @@
+import numpy as np
+from typing import Any, List, Tuple, Union
+from .constants import TRAINED_MODELS_DIRECTORY
+
+NUMPY_POLICY_FILE_EXTENSION = ".npz"
+
+
+class DiscreteActionSpace:
+    def __init__(self, n: int) -> None:
+        self.n = n
+
+
+class NumpyPolicy:
+    """
+    Torch-free copy of a trained DQN's Q-network: the Linear layers as
+    float32 (in, out) weight matrices, evaluated as a matmul and ReLU chain.
+    It has the exploration_rate, action_space.n and predict that the agents
+    use from a DQN, so it can be loaded in its place. predict is always
+    greedy; exploration is drawn by return_epsilon_greedy_actions.
+    """
+
+    file_extension = NUMPY_POLICY_FILE_EXTENSION
+
+    def __init__(
+        self,
+        weights: List[np.ndarray],
+        biases: List[np.ndarray],
+        exploration_rate: float,
+    ) -> None:
+        self.weights = [np.ascontiguousarray(weight, np.float32) for weight in weights]
+        self.biases = [np.asarray(bias, np.float32) for bias in biases]
+        self.exploration_rate = exploration_rate
+        self.action_space = DiscreteActionSpace(n=self.biases[-1].shape[0])
+
+    @classmethod
+    def load(cls, path: str) -> "NumpyPolicy":
+        with np.load(path) as policy:
+            num_of_layers = int(policy["num_of_layers"])
+
+            return cls(
+                weights=[policy[f"weights_{layer}"] for layer in range(num_of_layers)],
+                biases=[policy[f"biases_{layer}"] for layer in range(num_of_layers)],
+                exploration_rate=float(policy["exploration_rate"]),
+            )
+
+    def save(self, path: str) -> None:
+        np.savez(
+            path,
+            num_of_layers=len(self.weights),
+            exploration_rate=self.exploration_rate,
+            **{f"weights_{layer}": weight for layer, weight in enumerate(self.weights)},
+            **{f"biases_{layer}": bias for layer, bias in enumerate(self.biases)},
+        )
+
+    def return_q_values(self, observations: np.ndarray) -> np.ndarray:
+        q_values = np.asarray(observations, dtype=np.float32)
+
+        for layer, (weight, bias) in enumerate(zip(self.weights, self.biases)):
+            q_values = q_values @ weight + bias
+
+            if layer < len(self.weights) - 1:
+                np.maximum(q_values, 0, out=q_values)
+
+        return q_values
+
+    def predict(
+        self,
+        observation: np.ndarray,
+        state: Any = None,
+        episode_start: Any = None,
+        deterministic: bool = True,
+    ) -> Tuple[np.ndarray, None]:
+        """
+        Greedy actions for a batch of observations, or a single action for
+        a single observation, as DQN.predict returns them.
+        """
+
+        return self.return_q_values(observation).argmax(axis=-1), None
+
+
+def export_dqn_to_numpy_policy(
+    model_name: str,
+    models_directory: str = TRAINED_MODELS_DIRECTORY,
+    numpy_policy_name: Union[str, None] = None,
+) -> str:
+    """
+    Writes the Q-network of a saved DQN with an MLP policy to
+    {numpy_policy_name}.npz (model_name by default) in models_directory and
+    returns the path. stable_baselines3 is only imported here.
+    """
+
+    from torch import nn
+    from stable_baselines3 import DQN
+
+    model = DQN.load(f"{models_directory}/{model_name}")
+
+    if model.policy.activation_fn is not nn.ReLU:
+        raise ValueError(
+            f"only ReLU Q-networks can be exported, got {model.policy.activation_fn}"
+        )
+
+    linear_layers = [
+        layer for layer in model.q_net.q_net if isinstance(layer, nn.Linear)
+    ]
+    numpy_policy_path = (
+        f"{models_directory}/{numpy_policy_name or model_name.removesuffix('.zip')}"
+        f"{NUMPY_POLICY_FILE_EXTENSION}"
+    )
+
+    NumpyPolicy(
+        weights=[layer.weight.detach().cpu().numpy().T for layer in linear_layers],
+        biases=[layer.bias.detach().cpu().numpy() for layer in linear_layers],
+        exploration_rate=model.exploration_rate,
+    ).save(numpy_policy_path)
+
+    return numpy_policy_path
@@ -1,6 +1,7 @@
-from typing import Dict, List, Tuple, Union
+from typing import Any, Dict, List, Tuple
 import numpy as np
-from stable_baselines3 import PPO, DQN
+from .numpy_policy import NumpyPolicy
+from .lookup_table_policy import LookupTablePolicy
 
 
 def return_statistical_analysis_data(data: np.ndarray) -> Dict:
@@ -50,7 +51,16 @@ def return_list_of_coordinates_column_by_columns(
     ]
 
 
-def return_model(model_name: str) -> Union[PPO, DQN]:
+def return_model(model_name: str) -> Any:
+    if model_name == "NumpyPolicy":
+        return NumpyPolicy
+    if model_name == "LookupTablePolicy":
+        return LookupTablePolicy
+
+    # imported here so evaluation runs on a NumPy or lookup table policy never
+    # load torch
+    from stable_baselines3 import PPO, DQN
+
     return {
         "PPO": PPO,
         "DQN": DQN,
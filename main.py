@@ -185,6 +185,89 @@ parser.add_argument(
         "Controls the threshold which sets the level when the difference between collective opinion and agent opinion is below the agent commits (default=0.05)"
     ),
 )
+parser.add_argument(
+    "--environment_prefetch_depth",
+    type=int,
+    default=0,
+    help=(
+        "Number of episode environments built ahead on a worker thread, "
+        "0 builds them on reset (default=0)"
+    ),
+)
+parser.add_argument(
+    "--seed",
+    type=int,
+    default=None,
+    help=(
+        "Root seed that every episode's environment and agent generators are "
+        "spawned from (default=None)"
+    ),
+)
+parser.add_argument(
+    "--environment_corpus_directory",
+    type=str,
+    default=None,
+    help=(
+        "Directory of a corpus made by generate_environment_corpus.py to "
+        "stream evaluation environments from (default=None)"
+    ),
+)
+parser.add_argument(
+    "--policy_model_type",
+    type=str,
+    default="DQN",
+    choices=["DQN", "NumpyPolicy", "LookupTablePolicy"],
+    help=(
+        "Model class the final evaluation loads the sense/broadcast policy "
+        "as, NumpyPolicy needs a .npz made by export_numpy_policy.py and "
+        "LookupTablePolicy a .table.npz made by compile_lookup_table_policy.py "
+        "(default=DQN)"
+    ),
+)
+parser.add_argument(
+    "--swarm_state_mode",
+    type=str,
+    default=None,
+    choices=["ordered", "synchronous", "box_filter"],
+    help=(
+        "Steps the final evaluation swarm as a batched SwarmState: ordered "
+        "reproduces stepping agent objects, synchronous moves every agent "
+        "at once and box_filter also fuses the counts of opinions each agent "
+        "hears (default=None, steps agent objects)"
+    ),
+)
+
+parser.add_argument(
+    "--adversary_strategy",
+    type=str,
+    default="fixed_wrong_opinion",
+    choices=["fixed_wrong_opinion", "random_opinion", "mimic_then_flip"],
+    help=(
+        "What malicious agents broadcast: always the wrong opinion, a random "
+        "opinion each tick, or the correct opinion until adversary_flip_step "
+        "and the wrong one after (default=fixed_wrong_opinion)"
+    ),
+)
+parser.add_argument(
+    "--adversary_flip_step",
+    type=int,
+    default=100,
+    help=(
+        "Tick mimic_then_flip malicious agents switch to the wrong opinion "
+        "on (default=100)"
+    ),
+)
+parser.add_argument(
+    "--adversary_state_mode",
+    type=str,
+    default="synchronous",
+    choices=["synchronous", "ordered"],
+    help=(
+        "How the malicious agents are stepped when the swarm agents are "
+        "objects: synchronous moves them all at once, ordered reproduces "
+        "stepping their objects exactly (default=synchronous)"
+    ),
+)
 
 args = parser.parse_args()
 
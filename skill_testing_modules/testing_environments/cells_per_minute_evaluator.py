@@ -6,7 +6,12 @@ import wandb
 ROOT_DIRECTORY = os.path.dirname(os.getcwd())
 sys.path.append(ROOT_DIRECTORY)
 
-from environment_agent_modules import create_nonclustered_tile_grid, SwarmAgent
+from typing import Union
+from environment_agent_modules import (
+    create_nonclustered_tile_grid,
+    return_episode_random_number_generator,
+    SwarmAgent,
+)
 
 from helper_files.utils import (
     return_list_of_coordinates_column_by_columns,
@@ -21,10 +26,12 @@ class CellsPerMinuteEvaluator:
         num_of_swarm_agents: int,
         eval_model_name: str,
         max_num_of_steps: int,
+        seed: Union[int, None] = None,
         **kwargs
     ):
         self.width, self.height = width, height
         self.num_of_swarm_agents = num_of_swarm_agents
+        self.seed_sequence = np.random.SeedSequence(seed)
         self.eval_model_name = eval_model_name
         self.max_num_of_steps = max_num_of_steps
 
@@ -70,8 +77,14 @@ class CellsPerMinuteEvaluator:
             )
 
     def reset(self):
+        self.random_number_generator = return_episode_random_number_generator(
+            self.seed_sequence
+        )
+
         self.tile_grid = create_nonclustered_tile_grid(
-            width=self.width, height=self.height
+            width=self.width,
+            height=self.height,
+            random_number_generator=self.random_number_generator,
         )
 
         self.num_of_steps = 0
@@ -92,8 +105,11 @@ class CellsPerMinuteEvaluator:
                 model_names={
                     "nav_model": self.eval_model_name,
                 },
+                random_number_generator=agent_random_number_generator,
+            )
+            for agent_random_number_generator in self.random_number_generator.spawn(
+                self.num_of_swarm_agents
             )
-            for _ in range(self.num_of_swarm_agents)
         ]
 
         self.num_of_cells_visited_by_agent = np.zeros(shape=(self.num_of_swarm_agents,))
@@ -1,12 +1,17 @@
 import os
 import sys
-import random
+import numpy as np
 import wandb
 
 ROOT_DIRECTORY = os.path.dirname(os.getcwd())
 sys.path.append(ROOT_DIRECTORY)
 
-from environment_agent_modules import create_nonclustered_tile_grid, SwarmAgent
+from typing import Union
+from environment_agent_modules import (
+    create_nonclustered_tile_grid,
+    return_episode_random_number_generator,
+    SwarmAgent,
+)
 
 
 class CellsPerMinuteEvaluatorFreeRegion:
@@ -17,10 +22,12 @@ class CellsPerMinuteEvaluatorFreeRegion:
         num_of_swarm_agents: int,
         eval_model_name: str,
         max_num_of_steps: int,
+        seed: Union[int, None] = None,
         **kwargs
     ):
         self.width, self.height = width, height
         self.num_of_swarm_agents = num_of_swarm_agents
+        self.seed_sequence = np.random.SeedSequence(seed)
         self.eval_model_name = eval_model_name
         self.max_num_of_steps = max_num_of_steps
 
@@ -29,7 +36,8 @@ class CellsPerMinuteEvaluatorFreeRegion:
             self.swarm_agent.model_navigate(tile_grid=self.tile_grid)
         else:
             self.swarm_agent.perform_navigation_action(
-                action=random.randint(0, 2), tile_grid=self.tile_grid
+                action=int(self.random_number_generator.integers(3)),
+                tile_grid=self.tile_grid,
             )
 
         self.step_number += 1
@@ -61,8 +69,14 @@ class CellsPerMinuteEvaluatorFreeRegion:
             )
 
     def reset(self):
+        self.random_number_generator = return_episode_random_number_generator(
+            self.seed_sequence
+        )
+
         self.tile_grid = create_nonclustered_tile_grid(
-            width=self.width, height=self.height
+            width=self.width,
+            height=self.height,
+            random_number_generator=self.random_number_generator,
         )
 
         self.swarm_agent_previous_num_of_cells_visited = 0
@@ -72,6 +86,7 @@ class CellsPerMinuteEvaluatorFreeRegion:
             current_direction_facing=1,
             needs_models_loaded=True,
             model_names={"nav_model": self.eval_model_name},
+            random_number_generator=self.random_number_generator.spawn(1)[0],
         )
 
         self.step_number = 0
@@ -2,12 +2,16 @@ import os
 import sys
 import numpy as np
 import wandb
-import random
 
 ROOT_DIRECTORY = os.path.dirname(os.getcwd())
 sys.path.append(ROOT_DIRECTORY)
 
-from environment_agent_modules import create_nonclustered_tile_grid, SwarmAgent
+from typing import Union
+from environment_agent_modules import (
+    create_nonclustered_tile_grid,
+    return_episode_random_number_generator,
+    SwarmAgent,
+)
 
 
 class CellsPerMinuteEvaluatorHandCoded:
@@ -17,10 +21,12 @@ class CellsPerMinuteEvaluatorHandCoded:
         height: int,
         num_of_swarm_agents: int,
         max_num_of_steps: int,
+        seed: Union[int, None] = None,
         **kwargs
     ):
         self.width, self.height = width, height
         self.num_of_swarm_agents = num_of_swarm_agents
+        self.seed_sequence = np.random.SeedSequence(seed)
         self.max_num_steps = max_num_of_steps
 
     def step(self):
@@ -64,8 +70,14 @@ class CellsPerMinuteEvaluatorHandCoded:
     def reset(self):
         self.num_of_steps = 0
 
+        self.random_number_generator = return_episode_random_number_generator(
+            self.seed_sequence
+        )
+
         self.tile_grid = create_nonclustered_tile_grid(
-            width=self.width, height=self.height
+            width=self.width,
+            height=self.height,
+            random_number_generator=self.random_number_generator,
         )
 
         all_possible_tiles = []
@@ -79,8 +91,11 @@ class CellsPerMinuteEvaluatorHandCoded:
                 starting_cell=(self.tile_grid[all_possible_tiles.pop(0)]),
                 current_direction_facing=1,
                 needs_models_loaded=False,
+                random_number_generator=agent_random_number_generator,
+            )
+            for agent_random_number_generator in self.random_number_generator.spawn(
+                self.num_of_swarm_agents
             )
-            for _ in range(self.num_of_swarm_agents)
         ]
 
         self.num_of_cells_visited_by_agent = np.zeros(shape=(self.num_of_swarm_agents,))
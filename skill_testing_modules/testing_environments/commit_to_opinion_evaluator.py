@@ -1,5 +1,4 @@
 import os
-import random
 import sys
 import wandb
 import numpy as np
@@ -8,12 +7,15 @@ ROOT_DIRECTORY = os.path.dirname(os.getcwd())
 sys.path.append(ROOT_DIRECTORY)
 SECONDS_IN_MINUTE = 60
 
+from typing import Union
 from environment_agent_modules import (
     SwarmAgent,
+    choose_commit_decision_actions,
+    return_episode_random_number_generator,
     return_ratio_of_white_to_black_tiles,
 )
 
-from .testing_utils import environment_type_map
+from .testing_utils import return_environment_type
 from helper_files.utils import (
     return_list_of_coordinates_column_by_columns,
 )
@@ -30,29 +32,38 @@ class CommitToOpinionEvaluator:
         ratio_of_white_to_black_tiles: float,
         eval_model_name: str,
         commitment_threshold: float,
+        seed: Union[int, None] = None,
+        environment_corpus_directory: Union[str, None] = None,
         **kwargs,
     ):
         self.width, self.height = width, height
         self.num_of_swarm_agents = num_of_swarm_agents
         self.max_num_of_steps = max_num_of_steps
-        self.environment_type = environment_type_map[environment_type_name]
+        self.environment_type = return_environment_type(
+            environment_type_name, environment_corpus_directory
+        )
         self.ratio_of_white_to_black_tiles = ratio_of_white_to_black_tiles
+        self.seed_sequence = np.random.SeedSequence(seed)
         self.eval_model_name = None
         self.commitment_threshold = commitment_threshold
 
     def set_time_to_first_commit(self, pos: int, time: int):
         self.time_to_first_commit[pos] = time
 
-    def make_commitment_decision(self, agent: SwarmAgent):
+    def make_commitment_decision(
+        self, agent: SwarmAgent, commit_decision_action: Union[int, None] = None
+    ):
         if self.eval_model_name is not None:
-            agent.decide_if_to_commit()
+            agent.decide_if_to_commit(commit_decision_action)
         else:
             # if (
             #     agent.calculated_collective_opinion < self.commitment_threshold
             #     or (1 - agent.calculated_collective_opinion) < self.commitment_threshold
             # ):
             #     agent.committed_to_opinion = True
-            agent.committed_to_opinion = random.choices([0, 1], weights=[95, 5]).pop(0)
+            agent.committed_to_opinion = int(
+                self.random_number_generator.random() < 0.05
+            )
 
     def step(self):
         # for pos, agent in enumerate(self.swarm_agents):
@@ -71,9 +82,25 @@ class CommitToOpinionEvaluator:
         #     else:
         #         agent.navigate(self.tile_grid)
 
+        # the model's commit decisions only depend on each agent's own state,
+        # so they are all taken in one model.predict before anyone moves
+        committing_agents = [
+            agent for agent in self.swarm_agents if not agent.committed_to_opinion
+        ]
+        commit_decision_actions = (
+            dict(
+                zip(
+                    committing_agents,
+                    choose_commit_decision_actions(committing_agents),
+                )
+            )
+            if self.eval_model_name is not None
+            else {}
+        )
+
         for pos, agent in enumerate(self.swarm_agents):
             if not agent.committed_to_opinion:
-                self.make_commitment_decision(agent)
+                self.make_commitment_decision(agent, commit_decision_actions.get(agent))
                 if agent.committed_to_opinion:
                     self.agents_committed += 1
                     self.set_time_to_first_commit(pos, self.num_steps)
@@ -114,10 +141,15 @@ class CommitToOpinionEvaluator:
         return False
 
     def reset(self):
+        self.random_number_generator = return_episode_random_number_generator(
+            self.seed_sequence
+        )
+
         self.tile_grid = self.environment_type(
             width=self.width,
             height=self.height,
             ratio_of_white_to_black_tiles=self.ratio_of_white_to_black_tiles,
+            random_number_generator=self.random_number_generator,
         )
 
         self.correct_opinion = round(
@@ -144,8 +176,11 @@ class CommitToOpinionEvaluator:
                 },
                 current_direction_facing=1,
                 total_number_of_environment_cells=self.width * self.height,
+                random_number_generator=agent_random_number_generator,
+            )
+            for agent_random_number_generator in self.random_number_generator.spawn(
+                self.num_of_swarm_agents
             )
-            for _ in range(self.num_of_swarm_agents)
         ]
 
         self.agents_committed = 0
@@ -1,17 +1,20 @@
 import os
 import sys
+import numpy as np
 import wandb
-import random
 
 ROOT_DIRECTORY = os.path.dirname(os.getcwd())
 sys.path.append(ROOT_DIRECTORY)
 
+from typing import Union
 from environment_agent_modules import (
     SwarmAgent,
+    choose_sense_broadcast_actions,
+    return_episode_random_number_generator,
     return_ratio_of_white_to_black_tiles,
 )
 
-from .testing_utils import environment_type_map
+from .testing_utils import return_environment_type
 
 from helper_files.utils import (
     return_list_of_coordinates_column_by_columns,
@@ -28,18 +31,25 @@ class CorrectSenseBroadcastEvaluator:
         environment_type_name: str,
         ratio_of_white_to_black_tiles: float,
         eval_model_name: str,
+        seed: Union[int, None] = None,
+        environment_corpus_directory: Union[str, None] = None,
         **kwargs,
     ):
         self.width, self.height = width, height
         self.num_of_swarm_agents = num_of_swarm_agents
         self.max_num_of_steps = max_num_of_steps
-        self.environment_type = environment_type_map[environment_type_name]
+        self.environment_type = return_environment_type(
+            environment_type_name, environment_corpus_directory
+        )
         self.ratio_of_white_to_black_tiles = ratio_of_white_to_black_tiles
+        self.seed_sequence = np.random.SeedSequence(seed)
         self.eval_model_name = eval_model_name
 
-    def wrapper_agent_decision_to_sense_or_broadcast(self, agent: SwarmAgent) -> None:
+    def wrapper_agent_decision_to_sense_or_broadcast(
+        self, agent: SwarmAgent, sense_broadcast_action: Union[int, None] = None
+    ) -> None:
         if self.eval_model_name is not None:
-            agent.decide_to_sense_or_broadcast()
+            agent.decide_to_sense_or_broadcast(sense_broadcast_action)
         else:
             # chance_of_broadcasting = 0.5 * (
             #     agent.return_ratio_of_total_environment_cells_observed()
@@ -58,7 +68,7 @@ class CorrectSenseBroadcastEvaluator:
             #     ],
             #     k=1,
             # )[0]
-            agent.sensing = random.randint(0, 1)
+            agent.sensing = int(self.random_number_generator.integers(2))
 
     def step(self):
         (
@@ -68,9 +78,19 @@ class CorrectSenseBroadcastEvaluator:
             broadcast_false_negatives,
         ) = (0, 0, 0, 0)
 
-        for agent in self.swarm_agents:
+        sense_broadcast_actions = (
+            choose_sense_broadcast_actions(self.swarm_agents)
+            if self.eval_model_name is not None
+            else [None] * len(self.swarm_agents)
+        )
+
+        for agent, sense_broadcast_action in zip(
+            self.swarm_agents, sense_broadcast_actions
+        ):
             agent_opinion = agent.calculate_opinion()
-            self.wrapper_agent_decision_to_sense_or_broadcast(agent)
+            self.wrapper_agent_decision_to_sense_or_broadcast(
+                agent, sense_broadcast_action
+            )
             agent.navigate_and_recieve_opinions(self.tile_grid)
 
             if not (agent.sensing):  # broadcasting
@@ -119,10 +139,15 @@ class CorrectSenseBroadcastEvaluator:
         )
 
     def reset(self):
+        self.random_number_generator = return_episode_random_number_generator(
+            self.seed_sequence
+        )
+
         self.tile_grid = self.environment_type(
             width=self.width,
             height=self.height,
             ratio_of_white_to_black_tiles=self.ratio_of_white_to_black_tiles,
+            random_number_generator=self.random_number_generator,
         )
 
         self.correct_opinion = round(
@@ -146,6 +171,9 @@ class CorrectSenseBroadcastEvaluator:
                 },
                 current_direction_facing=1,
                 total_number_of_environment_cells=self.width * self.height,
+                random_number_generator=agent_random_number_generator,
+            )
+            for agent_random_number_generator in self.random_number_generator.spawn(
+                self.num_of_swarm_agents
             )
-            for _ in range(self.num_of_swarm_agents)
         ]
@@ -6,16 +6,20 @@ import numpy as np
 ROOT_DIRECTORY = os.path.dirname(os.getcwd())
 sys.path.append(ROOT_DIRECTORY)
 
+from typing import Union
 from environment_agent_modules import (
     SwarmAgent,
     MaliciousAgent,
+    SwarmState,
+    choose_sense_broadcast_actions,
+    return_episode_random_number_generator,
     return_ratio_of_white_to_black_tiles,
 )
 
 from helper_files.utils import (
     return_list_of_coordinates_column_by_columns,
 )
-from .testing_utils import environment_type_map
+from .testing_utils import return_environment_type
 
 
 class DynamicOpinionWeightEvaluator:
@@ -32,18 +36,29 @@ class DynamicOpinionWeightEvaluator:
         num_of_malicious_agents: int,
         sensing_noise: float,
         communication_noise: float,
+        seed: Union[int, None] = None,
+        environment_corpus_directory: Union[str, None] = None,
+        adversary_strategy: str = "fixed_wrong_opinion",
+        adversary_flip_step: int = 100,
+        adversary_state_mode: str = "synchronous",
         **kwargs,
     ):
         self.width, self.height = width, height
         self.num_of_swarm_agents = num_of_swarm_agents
-        self.environment_type = environment_type_map[environment_type_name]
+        self.environment_type = return_environment_type(
+            environment_type_name, environment_corpus_directory
+        )
         self.ratio_of_white_to_black_tiles = ratio_of_white_to_black_tiles
+        self.seed_sequence = np.random.SeedSequence(seed)
         self.eval_model_name = None
         self.max_new_opinion_weighting = max_new_opinion_weighting
         self.opinion_weighting_method = opinion_weighting_method
         self.num_of_malicious_agents = num_of_malicious_agents
         self.sensing_noise = sensing_noise
         self.communication_noise = communication_noise
+        self.adversary_strategy = adversary_strategy
+        self.adversary_flip_step = adversary_flip_step
+        self.adversary_state_mode = adversary_state_mode
 
     def update_opinion_weight(self, agent: SwarmAgent):
         if self.eval_model_name:
@@ -55,12 +70,15 @@ class DynamicOpinionWeightEvaluator:
             ]
 
     def step(self):
-        for agent in self.malicious_agents:
-            agent.navigate(self.tile_grid)
+        self.malicious_state.step_without_listening()
+
+        sense_broadcast_actions = choose_sense_broadcast_actions(self.swarm_agents)
 
-        for agent in self.swarm_agents:
+        for agent, sense_broadcast_action in zip(
+            self.swarm_agents, sense_broadcast_actions
+        ):
             # self.update_opinion_weight(agent)
-            agent.decide_to_sense_or_broadcast()
+            agent.decide_to_sense_or_broadcast(sense_broadcast_action)
             agent.navigate_and_recieve_opinions(self.tile_grid)
 
         correct_opinion_weight = np.array(
@@ -98,10 +116,15 @@ class DynamicOpinionWeightEvaluator:
         )
 
     def reset(self):
+        self.random_number_generator = return_episode_random_number_generator(
+            self.seed_sequence
+        )
+
         self.tile_grid = self.environment_type(
             width=self.width,
             height=self.height,
             ratio_of_white_to_black_tiles=self.ratio_of_white_to_black_tiles,
+            random_number_generator=self.random_number_generator,
         )
 
         self.correct_opinion = round(
@@ -127,8 +150,11 @@ class DynamicOpinionWeightEvaluator:
                 current_direction_facing=1,
                 max_new_opinion_weighting=self.max_new_opinion_weighting,
                 total_number_of_environment_cells=self.width * self.height,
+                random_number_generator=agent_random_number_generator,
+            )
+            for agent_random_number_generator in self.random_number_generator.spawn(
+                self.num_of_swarm_agents
             )
-            for _ in range(self.num_of_swarm_agents)
         ]
 
         self.malicious_agents = [
@@ -138,6 +164,18 @@ class DynamicOpinionWeightEvaluator:
                 ),
                 malicious_opinion=((self.correct_opinion + 1) % 2),
                 current_direction_facing=1,
+                random_number_generator=agent_random_number_generator,
+            )
+            for agent_random_number_generator in self.random_number_generator.spawn(
+                self.num_of_malicious_agents
             )
-            for _ in range(self.num_of_malicious_agents)
         ]
+        self.malicious_state = SwarmState(
+            tile_grid=self.tile_grid,
+            swarm_agents=(),
+            mode=self.adversary_state_mode,
+            malicious_agents=self.malicious_agents,
+            random_number_generator=self.random_number_generator.spawn(1)[0],
+            adversary_strategy=self.adversary_strategy,
+            adversary_flip_step=self.adversary_flip_step,
+        )
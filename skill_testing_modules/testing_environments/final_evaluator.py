@@ -1,5 +1,4 @@
 import os
-import random
 import sys
 import wandb
 import numpy as np
@@ -8,13 +7,20 @@ ROOT_DIRECTORY = os.path.dirname(os.getcwd())
 sys.path.append(ROOT_DIRECTORY)
 SECONDS_IN_MINUTE = 60
 
+from typing import List, Tuple, Union
 from environment_agent_modules import (
     SwarmAgent,
     MaliciousAgent,
+    SwarmState,
+    TileGrid,
+    EnvironmentPrefetcher,
+    choose_commit_decision_actions,
+    choose_sense_broadcast_actions,
+    return_episode_random_number_generator,
     return_ratio_of_white_to_black_tiles,
 )
 
-from .testing_utils import environment_type_map
+from .testing_utils import return_environment_type
 from helper_files.utils import (
     return_list_of_coordinates_column_by_columns,
 )
@@ -34,55 +40,181 @@ class FinalEvaluator:
         sensing_noise: float,
         communication_noise: float,
         max_new_opinion_weighting: float,
+        eval_model_name: Union[str, None] = None,
+        environment_prefetch_depth: int = 0,
+        seed: Union[int, None] = None,
+        environment_corpus_directory: Union[str, None] = None,
+        swarm_state_mode: Union[str, None] = None,
+        policy_model_type: str = "DQN",
+        adversary_strategy: str = "fixed_wrong_opinion",
+        adversary_flip_step: int = 100,
+        adversary_state_mode: str = "synchronous",
         **kwargs,
     ):
         self.width, self.height = width, height
+        self.swarm_state = None
+        self.malicious_state = None
         self.num_of_swarm_agents = num_of_swarm_agents
         self.max_num_of_steps = max_num_of_steps
-        self.environment_type = environment_type_map[environment_type_name]
+        self.environment_type = return_environment_type(
+            environment_type_name, environment_corpus_directory
+        )
         self.ratio_of_white_to_black_tiles = ratio_of_white_to_black_tiles
         self.opinion_weighting_method = opinion_weighting_method
         self.num_of_malicious_agents = num_of_malicious_agents
         self.sensing_noise = sensing_noise
         self.communication_noise = communication_noise
         self.max_new_opinion_weighting = max_new_opinion_weighting
+        self.eval_model_name = eval_model_name
+        self.seed_sequence = np.random.SeedSequence(seed)
+        self.swarm_state_mode = swarm_state_mode
+        self.policy_model_type = policy_model_type
+        self.adversary_strategy = adversary_strategy
+        self.adversary_flip_step = adversary_flip_step
+        self.adversary_state_mode = adversary_state_mode
+
+        self.environment_prefetcher = (
+            EnvironmentPrefetcher(
+                environment_factory=self.build_episode_environment,
+                queue_depth=environment_prefetch_depth,
+                seed=seed,
+            )
+            if environment_prefetch_depth
+            else None
+        )
 
     def set_time_to_first_commit(self, pos: int, time: int):
         self.time_to_first_commit[pos] = time
 
-    def make_commitment_decision(self, agent: SwarmAgent):
-        if (
+    def return_commitment_decision(self, agent: SwarmAgent) -> bool:
+        return (
             agent.calculated_collective_opinion < 0.05
             or (1 - agent.calculated_collective_opinion) < 0.05
-        ):
-            agent.committed_to_opinion = True
+        )
 
-    def step(self):
-        for agent in self.malicious_agents:
-            agent.navigate(self.tile_grid)
+    def return_commitment_decisions(self, agents: List[SwarmAgent]) -> List[bool]:
+        """
+        With an eval_model_name the commit_to_opinion_model decides for all
+        agents in one model.predict, otherwise the collective opinion
+        threshold does.
+        """
+
+        if self.eval_model_name is None:
+            return [self.return_commitment_decision(agent) for agent in agents]
+
+        return [bool(action) for action in choose_commit_decision_actions(agents)]
+
+    def step_agents(self):
+        """
+        An agent's commitment and sense/broadcast decisions only depend on
+        its own state, so they are all taken before anyone moves (each kind
+        in a single model.predict) and applied on each agent's turn.
+        """
+
+        eligible = [
+            agent.return_ratio_of_total_environment_cells_observed() > (1 / self.height)
+            for agent in self.swarm_agents
+        ]
+        committing_agents = [
+            agent
+            for agent, is_eligible in zip(self.swarm_agents, eligible)
+            if is_eligible and not agent.committed_to_opinion
+        ]
+        commitment_decisions = dict(
+            zip(
+                committing_agents,
+                self.return_commitment_decisions(committing_agents),
+            )
+        )
+        commits = [
+            commitment_decisions.get(agent, False) for agent in self.swarm_agents
+        ]
+        deciding_agents = [
+            agent
+            for agent, is_eligible, commit in zip(self.swarm_agents, eligible, commits)
+            if is_eligible and not (agent.committed_to_opinion or commit)
+        ]
+        sense_broadcast_actions = dict(
+            zip(deciding_agents, choose_sense_broadcast_actions(deciding_agents))
+        )
+
+        if self.malicious_state is not None:
+            self.malicious_state.step_without_listening()
 
         for pos, agent in enumerate(self.swarm_agents):
-            if agent.return_ratio_of_total_environment_cells_observed() > (
-                1 / self.height
-            ):
-                if not agent.committed_to_opinion:
-                    self.make_commitment_decision(agent)
-                    if agent.committed_to_opinion:
-                        self.agents_committed += 1
-                        self.set_time_to_first_commit(pos, self.num_steps)
+            if eligible[pos]:
+                if commits[pos]:
+                    agent.committed_to_opinion = True
+                    self.agents_committed += 1
+                    self.set_time_to_first_commit(pos, self.num_steps)
 
                 agent.perform_decision_navigate_opinion_update_cycle(
-                    tile_grid=self.tile_grid
+                    tile_grid=self.tile_grid,
+                    sense_broadcast_action=sense_broadcast_actions.get(agent),
                 )
             else:
                 agent.navigate(self.tile_grid)
 
+    def step_swarm_state(self):
+        """
+        Same tick as step_agents, with the commitment and sense/broadcast
+        decisions taken for the whole swarm at once.
+        """
+
+        swarm_state = self.swarm_state
+        calculated_collective_opinion = swarm_state.calculated_collective_opinion
+
+        eligible = ~swarm_state.is_malicious & (
+            swarm_state.return_ratios_of_total_environment_cells_observed()
+            > (1 / self.height)
+        )
+        committing = eligible & ~swarm_state.committed_to_opinion
+
+        if self.eval_model_name is None:
+            newly_committed = committing & (
+                (calculated_collective_opinion < 0.05)
+                | ((1 - calculated_collective_opinion) < 0.05)
+            )
+        else:
+            newly_committed = np.zeros_like(committing)
+            newly_committed[committing] = swarm_state.choose_commit_decision_actions(
+                self.swarm_agents[0].commit_to_opinion_model, committing
+            )
+        committed_to_opinion = swarm_state.committed_to_opinion | newly_committed
+
+        self.agents_committed += int(np.count_nonzero(newly_committed))
+        self.time_to_first_commit[
+            np.flatnonzero(newly_committed) - swarm_state.num_of_malicious_agents
+        ] = self.num_steps
+
+        deciding = eligible & ~committed_to_opinion
+        sensing = swarm_state.sensing.copy()
+        sensing[eligible & committed_to_opinion] = False
+        sensing[deciding] = swarm_state.choose_sense_broadcast_actions(
+            self.swarm_agents[0].sense_broadcast_model, deciding
+        )
+
+        swarm_state.step(
+            sensing=sensing,
+            committed_to_opinion=committed_to_opinion,
+            recieving=deciding,
+        )
+
+    def step(self):
+        if self.swarm_state is None:
+            self.step_agents()
+        else:
+            self.step_swarm_state()
+
         self.num_steps += 1
 
         if (
             self.agents_committed == self.num_of_swarm_agents
             or self.num_steps == self.max_num_of_steps
         ):
+            if self.swarm_state is not None:
+                self.swarm_state.write_back_to_agents()
+
             correct_commitments_count = 0
 
             for agent in self.swarm_agents:
@@ -108,16 +240,24 @@ class FinalEvaluator:
 
         return False
 
-    def reset(self):
-        self.tile_grid = self.environment_type(
+    def build_episode_environment(
+        self, random_number_generator: np.random.Generator
+    ) -> Tuple[
+        TileGrid,
+        int,
+        List[SwarmAgent],
+        List[MaliciousAgent],
+        Union[SwarmState, None],
+        Union[SwarmState, None],
+    ]:
+        tile_grid = self.environment_type(
             width=self.width,
             height=self.height,
             ratio_of_white_to_black_tiles=self.ratio_of_white_to_black_tiles,
+            random_number_generator=random_number_generator,
         )
 
-        self.correct_opinion = round(
-            return_ratio_of_white_to_black_tiles(self.tile_grid)
-        )
+        correct_opinion = round(return_ratio_of_white_to_black_tiles(tile_grid))
 
         list_of_coordinates_to_distribute_agents_over = (
             return_list_of_coordinates_column_by_columns(
@@ -125,37 +265,102 @@ class FinalEvaluator:
             )
         )
 
-        self.num_steps = 0
-
-        self.swarm_agents = [
+        swarm_agents = [
             SwarmAgent(
                 starting_cell=(
-                    self.tile_grid[list_of_coordinates_to_distribute_agents_over.pop(0)]
+                    tile_grid[list_of_coordinates_to_distribute_agents_over.pop(0)]
                 ),
                 needs_models_loaded=True,
                 model_names={
                     "sense_model": "sense_broadcast_model",
+                    "commit_to_opinion_model": self.eval_model_name,
                 },
+                model_type=self.policy_model_type,
                 current_direction_facing=1,
                 total_number_of_environment_cells=self.width * self.height,
                 sensing_noise=self.sensing_noise,
                 communication_noise=self.communication_noise,
                 max_new_opinion_weighting=self.max_new_opinion_weighting,
                 opinion_weighting_method=self.opinion_weighting_method,
+                random_number_generator=agent_random_number_generator,
+            )
+            for agent_random_number_generator in random_number_generator.spawn(
+                self.num_of_swarm_agents
             )
-            for _ in range(self.num_of_swarm_agents)
         ]
 
-        self.malicious_agents = [
+        malicious_agents = [
             MaliciousAgent(
                 starting_cell=(
-                    self.tile_grid[list_of_coordinates_to_distribute_agents_over.pop(0)]
+                    tile_grid[list_of_coordinates_to_distribute_agents_over.pop(0)]
                 ),
-                malicious_opinion=((self.correct_opinion + 1) % 2),
+                malicious_opinion=((correct_opinion + 1) % 2),
                 current_direction_facing=1,
+                random_number_generator=agent_random_number_generator,
+            )
+            for agent_random_number_generator in random_number_generator.spawn(
+                self.num_of_malicious_agents
             )
-            for _ in range(self.num_of_malicious_agents)
         ]
 
+        swarm_state = (
+            SwarmState(
+                tile_grid=tile_grid,
+                swarm_agents=swarm_agents,
+                malicious_agents=malicious_agents,
+                mode=self.swarm_state_mode,
+                random_number_generator=random_number_generator.spawn(1)[0],
+                adversary_strategy=self.adversary_strategy,
+                adversary_flip_step=self.adversary_flip_step,
+            )
+            if self.swarm_state_mode is not None
+            else None
+        )
+
+        # without a batched swarm the malicious agents get a state of their own
+        malicious_state = (
+            SwarmState(
+                tile_grid=tile_grid,
+                swarm_agents=(),
+                mode=self.adversary_state_mode,
+                malicious_agents=malicious_agents,
+                random_number_generator=random_number_generator.spawn(1)[0],
+                adversary_strategy=self.adversary_strategy,
+                adversary_flip_step=self.adversary_flip_step,
+            )
+            if self.swarm_state_mode is None and malicious_agents
+            else None
+        )
+
+        return (
+            tile_grid,
+            correct_opinion,
+            swarm_agents,
+            malicious_agents,
+            swarm_state,
+            malicious_state,
+        )
+
+    def reset(self):
+        (
+            self.tile_grid,
+            self.correct_opinion,
+            self.swarm_agents,
+            self.malicious_agents,
+            self.swarm_state,
+            self.malicious_state,
+        ) = (
+            self.environment_prefetcher.return_next_environment()
+            if self.environment_prefetcher is not None
+            else self.build_episode_environment(
+                return_episode_random_number_generator(self.seed_sequence)
+            )
+        )
+
+        self.num_steps = 0
         self.agents_committed = 0
         self.time_to_first_commit = np.zeros(self.num_of_swarm_agents)
+
+    def close(self):
+        if self.environment_prefetcher is not None:
+            self.environment_prefetcher.close()
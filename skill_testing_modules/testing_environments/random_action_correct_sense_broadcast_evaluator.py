@@ -2,17 +2,18 @@ import os
 import sys
 import numpy as np
 from wandb import log
-import random
 
 ROOT_DIRECTORY = os.path.dirname(os.getcwd())
 sys.path.append(ROOT_DIRECTORY)
 
+from typing import Union
 from environment_agent_modules import (
     SwarmAgent,
+    return_episode_random_number_generator,
     return_ratio_of_white_to_black_tiles,
 )
 
-from .testing_utils import environment_type_map
+from .testing_utils import return_environment_type
 
 
 class RandomActionCorrectSenseBroadcastEvaluator:
@@ -25,18 +26,23 @@ class RandomActionCorrectSenseBroadcastEvaluator:
         environment_type_name: str,
         ratio_of_white_to_black_tiles: float,
         eval_model_name: str,
+        seed: Union[int, None] = None,
+        environment_corpus_directory: Union[str, None] = None,
         **kwargs
     ):
         self.width, self.height = width, height
         self.num_of_swarm_agents = num_of_swarm_agents
         self.max_num_of_steps = max_num_of_steps
-        self.environment_type = environment_type_map[environment_type_name]
+        self.environment_type = return_environment_type(
+            environment_type_name, environment_corpus_directory
+        )
         self.ratio_of_white_to_black_tiles = ratio_of_white_to_black_tiles
+        self.seed_sequence = np.random.SeedSequence(seed)
         self.eval_model_name = eval_model_name
 
     def step(self, step_number: int):
         for agent in self.swarm_agents:
-            agent.sensing = random.randint(0, 1)
+            agent.sensing = int(self.random_number_generator.integers(2))
             agent.navigate(tile_grid=self.tile_grid)
             agent.recieve_local_opinions(tile_grid=self.tile_grid)
 
@@ -76,10 +82,15 @@ class RandomActionCorrectSenseBroadcastEvaluator:
         )
 
     def reset(self):
+        self.random_number_generator = return_episode_random_number_generator(
+            self.seed_sequence
+        )
+
         self.tile_grid = self.environment_type(
             width=self.width,
             height=self.height,
             ratio_of_white_to_black_tiles=self.ratio_of_white_to_black_tiles,
+            random_number_generator=self.random_number_generator,
         )
 
         self.correct_opinion = round(
@@ -95,10 +106,16 @@ class RandomActionCorrectSenseBroadcastEvaluator:
         self.swarm_agents = [
             SwarmAgent(
                 starting_cell=(self.tile_grid[all_possible_tiles.pop(0)]),
-                current_direction_facing=random.randint(0, 3),
+                current_direction_facing=direction,
                 needs_models_loaded=True,
+                random_number_generator=agent_random_number_generator,
+            )
+            for direction, agent_random_number_generator in zip(
+                self.random_number_generator.integers(
+                    0, 4, size=self.num_of_swarm_agents
+                ).tolist(),
+                self.random_number_generator.spawn(self.num_of_swarm_agents),
             )
-            for _ in range(self.num_of_swarm_agents)
         ]
 
         self.broadcast_true_positves = np.zeros(shape=(self.max_num_of_steps,))
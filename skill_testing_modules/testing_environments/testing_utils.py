@@ -1,4 +1,7 @@
+from typing import Callable, Union
 from environment_agent_modules import (
+    TileGrid,
+    EnvironmentCorpus,
     create_nonclustered_tile_grid,
     create_clustered_inital_observation_useful_tile_grid,
     create_clustered_inital_observation_not_useful_tile_grid,
@@ -9,3 +12,15 @@ environment_type_map = {
     "clustered_inital_observation_useful_tile_grid": create_clustered_inital_observation_useful_tile_grid,
     "clustered_inital_observation_not_useful_tile_grid": create_clustered_inital_observation_not_useful_tile_grid,
 }
+
+
+def return_environment_type(
+    environment_type_name: str,
+    environment_corpus_directory: Union[str, None] = None,
+) -> Callable[..., TileGrid]:
+    if environment_corpus_directory is None:
+        return environment_type_map[environment_type_name]
+
+    return EnvironmentCorpus(environment_corpus_directory).return_environment_stream(
+        environment_type_name
+    )
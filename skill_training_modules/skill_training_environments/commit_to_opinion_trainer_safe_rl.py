@@ -1,22 +1,24 @@
 import os
 import sys
 import gym
+import numpy as np
 import wandb
-import random
 
 ROOT_DIRECTORY = os.path.dirname(os.getcwd())
 sys.path.append(ROOT_DIRECTORY)
 
 from environment_agent_modules import (
     SwarmAgent,
+    return_episode_random_number_generator,
     return_ratio_of_white_to_black_tiles,
 )
 
 from .training_environment_utils import (
-    environment_type_list,
     sigmoid_for_weighting,
     inverse_sigmoid_for_weighting,
-    EPSILON,
+    return_environment_based_on_weighting_list,
+    return_random_agent,
+    return_random_directions,
 )
 
 
@@ -31,6 +33,7 @@ class CommitToOpinionTrainerSafe(gym.Env):
         height: int,
         num_of_swarm_agents: int,
         random_agent_per_step: bool,
+        seed: Union[int, None] = None,
         **kwargs,
     ):
         from gym import spaces
@@ -48,6 +51,7 @@ class CommitToOpinionTrainerSafe(gym.Env):
         self.environment_type_weighting = [33, 33, 33]
         self.model = None
         self.random_agent_per_step = random_agent_per_step
+        self.seed_sequence = np.random.SeedSequence(seed)
 
     def set_model(self, model: Union[PPO, DQN]):
         self.model = model
@@ -102,7 +106,9 @@ class CommitToOpinionTrainerSafe(gym.Env):
             )
 
         if self.random_agent_per_step:
-            self.agent_to_train = random.choice(self.swarm_agents)
+            self.agent_to_train = return_random_agent(
+                self.swarm_agents, self.random_number_generator
+            )
 
         return (
             self.agent_to_train.return_commit_decision_states(),
@@ -112,24 +118,22 @@ class CommitToOpinionTrainerSafe(gym.Env):
         )
 
     def reset(self):
-        from scipy.stats import truncnorm
-
         self.done = False
         self.num_steps = 0
         self.committed_agents_count = 0
 
-        self.index_of_environment = random.choices(
-            [0, 1, 2],
-            weights=self.environment_type_weighting,
-            k=1,
-        ).pop(0)
-
-        self.tile_grid = environment_type_list[self.index_of_environment](
-            width=self.width,
-            height=self.height,
-            ratio_of_white_to_black_tiles=truncnorm.rvs(
-                (0 - 0.5) / 1, (1 - 0.5) / 1, 0.5, 1
-            ),
+        self.random_number_generator = return_episode_random_number_generator(
+            self.seed_sequence
+        )
+
+        (
+            self.index_of_environment,
+            self.tile_grid,
+        ) = return_environment_based_on_weighting_list(
+            self.environment_type_weighting,
+            self.width,
+            self.height,
+            random_number_generator=self.random_number_generator,
         )
 
         self.correct_opinion = round(
@@ -145,16 +149,24 @@ class CommitToOpinionTrainerSafe(gym.Env):
         self.swarm_agents = [
             SwarmAgent(
                 starting_cell=(self.tile_grid[all_possible_tiles.pop(0)]),
-                current_direction_facing=random.randint(0, 3),
+                current_direction_facing=direction,
                 needs_models_loaded=True,
+                random_number_generator=agent_random_number_generator,
+            )
+            for direction, agent_random_number_generator in zip(
+                return_random_directions(
+                    self.num_of_swarm_agents, self.random_number_generator
+                ),
+                self.random_number_generator.spawn(self.num_of_swarm_agents),
             )
-            for _ in range(self.num_of_swarm_agents)
         ]
 
         self.correct_commitments_count = 0
         self.incorrect_commitments_count = 0
         self.no_commitments_count = 0
 
-        self.agent_to_train = random.choice(self.swarm_agents)
+        self.agent_to_train = return_random_agent(
+            self.swarm_agents, self.random_number_generator
+        )
 
         return self.agent_to_train.return_commit_decision_states()
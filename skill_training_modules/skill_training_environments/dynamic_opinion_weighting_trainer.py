@@ -1,8 +1,8 @@
 import os
 import sys
 import gym
+import numpy as np
 import wandb
-import random
 
 ROOT_DIRECTORY = os.path.dirname(os.getcwd())
 sys.path.append(ROOT_DIRECTORY)
@@ -10,13 +10,18 @@ sys.path.append(ROOT_DIRECTORY)
 from environment_agent_modules import (
     SwarmAgent,
     MaliciousAgent,
+    SwarmState,
+    TileGrid,
     return_ratio_of_white_to_black_tiles,
 )
 
 from .training_environment_utils import (
     sigmoid_for_weighting,
     inverse_sigmoid_for_weighting,
-    return_environment_based_on_weighting_list,
+    CurriculumEnvironmentSource,
+    return_environment_of_type,
+    return_random_agent,
+    return_random_directions,
 )
 
 from helper_files import return_list_of_coordinates_column_by_columns
@@ -24,7 +29,7 @@ from helper_files import return_list_of_coordinates_column_by_columns
 
 class DynamicOpinionWeightingTrainer(gym.Env):
     from stable_baselines3 import PPO, DQN
-    from typing import Union
+    from typing import List, Tuple, Union
     from numpy import ndarray
 
     def __init__(
@@ -38,6 +43,11 @@ class DynamicOpinionWeightingTrainer(gym.Env):
         num_of_malicious_agents: int,
         sensing_noise: float,
         communication_noise: float,
+        environment_prefetch_depth: int = 0,
+        seed: Union[int, None] = None,
+        adversary_strategy: str = "fixed_wrong_opinion",
+        adversary_flip_step: int = 100,
+        adversary_state_mode: str = "synchronous",
         **kwargs,
     ):
 
@@ -51,6 +61,9 @@ class DynamicOpinionWeightingTrainer(gym.Env):
         self.num_of_malicious_agents = num_of_malicious_agents
         self.sensing_noise = sensing_noise
         self.communication_noise = communication_noise
+        self.adversary_strategy = adversary_strategy
+        self.adversary_flip_step = adversary_flip_step
+        self.adversary_state_mode = adversary_state_mode
 
         self.environment_type_weighting = [33, 33, 33]
         self.model = None
@@ -63,6 +76,12 @@ class DynamicOpinionWeightingTrainer(gym.Env):
             low=0.0, high=1.0, shape=(2,), dtype=float32
         )
 
+        self.environment_source = CurriculumEnvironmentSource(
+            environment_factory=self.build_episode_environment,
+            prefetch_depth=environment_prefetch_depth,
+            seed=seed,
+        )
+
     def set_model(self, model: Union[PPO, DQN]):
         self.model = model
 
@@ -87,8 +106,7 @@ class DynamicOpinionWeightingTrainer(gym.Env):
         return [self.max_new_opinion_weighting, self.max_new_opinion_weighting]
 
     def step(self, action):
-        for agent in self.malicious_agents:
-            agent.navigate(self.tile_grid)
+        self.malicious_state.step_without_listening()
 
         for agent in self.swarm_agents:
             if agent != self.agent_to_train:
@@ -140,7 +158,9 @@ class DynamicOpinionWeightingTrainer(gym.Env):
             )
 
         if self.random_agent_per_step:
-            self.agent_to_train = random.choice(self.swarm_agents)
+            self.agent_to_train = return_random_agent(
+                self.swarm_agents, self.random_number_generator
+            )
 
         return (
             self.agent_to_train.return_opinion_weight_states(),
@@ -149,20 +169,25 @@ class DynamicOpinionWeightingTrainer(gym.Env):
             {},
         )
 
-    def reset(self):
-        self.done = False
-        self.num_steps = 0
-
-        (
-            self.index_of_environment,
-            self.tile_grid,
-        ) = return_environment_based_on_weighting_list(
-            self.environment_type_weighting, self.width, self.height
+    def build_episode_environment(
+        self, index_of_environment: int, random_number_generator: np.random.Generator
+    ) -> Tuple[
+        int,
+        TileGrid,
+        int,
+        List[SwarmAgent],
+        List[MaliciousAgent],
+        SwarmState,
+        np.random.Generator,
+    ]:
+        tile_grid = return_environment_of_type(
+            index_of_environment,
+            self.width,
+            self.height,
+            random_number_generator=random_number_generator,
         )
 
-        self.correct_opinion = round(
-            return_ratio_of_white_to_black_tiles(self.tile_grid)
-        )
+        correct_opinion = round(return_ratio_of_white_to_black_tiles(tile_grid))
 
         list_of_coordinates_to_distribute_agents_over = (
             return_list_of_coordinates_column_by_columns(
@@ -170,31 +195,84 @@ class DynamicOpinionWeightingTrainer(gym.Env):
             )
         )
 
-        self.swarm_agents = [
+        swarm_agents = [
             SwarmAgent(
                 starting_cell=(
-                    self.tile_grid[list_of_coordinates_to_distribute_agents_over.pop(0)]
+                    tile_grid[list_of_coordinates_to_distribute_agents_over.pop(0)]
                 ),
                 needs_models_loaded=True,
-                current_direction_facing=random.randint(0, 3),
+                current_direction_facing=direction,
+                random_number_generator=agent_random_number_generator,
                 max_new_opinion_weighting=self.max_new_opinion_weighting,
                 sensing_noise=self.sensing_noise,
                 communication_noise=self.communication_noise,
             )
-            for _ in range(self.num_of_swarm_agents)
+            for direction, agent_random_number_generator in zip(
+                return_random_directions(
+                    self.num_of_swarm_agents, random_number_generator
+                ),
+                random_number_generator.spawn(self.num_of_swarm_agents),
+            )
         ]
 
-        self.malicious_agents = [
+        malicious_agents = [
             MaliciousAgent(
                 starting_cell=(
-                    self.tile_grid[list_of_coordinates_to_distribute_agents_over.pop(0)]
+                    tile_grid[list_of_coordinates_to_distribute_agents_over.pop(0)]
+                ),
+                malicious_opinion=((correct_opinion + 1) % 2),
+                current_direction_facing=direction,
+                random_number_generator=agent_random_number_generator,
+            )
+            for direction, agent_random_number_generator in zip(
+                return_random_directions(
+                    self.num_of_malicious_agents, random_number_generator
                 ),
-                malicious_opinion=((self.correct_opinion + 1) % 2),
-                current_direction_facing=random.randint(0, 3),
+                random_number_generator.spawn(self.num_of_malicious_agents),
             )
-            for _ in range(self.num_of_malicious_agents)
         ]
 
-        self.agent_to_train = random.choice(self.swarm_agents)
+        malicious_state = SwarmState(
+            tile_grid=tile_grid,
+            swarm_agents=(),
+            mode=self.adversary_state_mode,
+            malicious_agents=malicious_agents,
+            random_number_generator=random_number_generator.spawn(1)[0],
+            adversary_strategy=self.adversary_strategy,
+            adversary_flip_step=self.adversary_flip_step,
+        )
+
+        return (
+            index_of_environment,
+            tile_grid,
+            correct_opinion,
+            swarm_agents,
+            malicious_agents,
+            malicious_state,
+            random_number_generator,
+        )
+
+    def reset(self):
+        self.done = False
+        self.num_steps = 0
+
+        (
+            self.index_of_environment,
+            self.tile_grid,
+            self.correct_opinion,
+            self.swarm_agents,
+            self.malicious_agents,
+            self.malicious_state,
+            self.random_number_generator,
+        ) = self.environment_source.return_next_environment(
+            self.environment_type_weighting
+        )
+
+        self.agent_to_train = return_random_agent(
+            self.swarm_agents, self.random_number_generator
+        )
 
         return self.agent_to_train.return_opinion_weight_states()
+
+    def close(self):
+        self.environment_source.close()
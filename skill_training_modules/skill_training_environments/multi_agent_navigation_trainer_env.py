@@ -3,14 +3,14 @@ import sys
 import numpy as np
 import gym
 import wandb
-import random
-
 
 ROOT_DIRECTORY = os.path.dirname(os.getcwd())
 sys.path.append(ROOT_DIRECTORY)
 
+from typing import Union
 from environment_agent_modules import (
     create_nonclustered_tile_grid,
+    return_episode_random_number_generator,
     SwarmAgent,
 )
 
@@ -24,6 +24,7 @@ class MultiAgentNavigationTrainer(gym.Env):
         width: int,
         height: int,
         num_of_swarm_agents: int,
+        seed: Union[int, None] = None,
         **kwargs
     ):
         from gym import spaces
@@ -34,6 +35,7 @@ class MultiAgentNavigationTrainer(gym.Env):
         self.max_num_of_steps = max_num_of_steps
         self.width, self.height = width, height
         self.num_of_swarm_agents = num_of_swarm_agents
+        self.seed_sequence = np.random.SeedSequence(seed)
 
     def set_model(self, model: PPO):
         self.model = model
@@ -104,8 +106,13 @@ class MultiAgentNavigationTrainer(gym.Env):
     def reset(self):
         self.done = False
         self.num_steps = 0
+        self.random_number_generator = return_episode_random_number_generator(
+            self.seed_sequence
+        )
         self.tile_grid = create_nonclustered_tile_grid(
-            width=self.width, height=self.height
+            width=self.width,
+            height=self.height,
+            random_number_generator=self.random_number_generator,
         )
 
         all_possible_tiles = []
@@ -117,10 +124,16 @@ class MultiAgentNavigationTrainer(gym.Env):
         self.swarm_agents = [
             SwarmAgent(
                 starting_cell=(self.tile_grid[all_possible_tiles.pop(0)]),
-                current_direction_facing=random.randint(0, 3),
+                current_direction_facing=direction,
                 needs_models_loaded=False,
+                random_number_generator=agent_random_number_generator,
+            )
+            for direction, agent_random_number_generator in zip(
+                self.random_number_generator.integers(
+                    0, 4, size=self.num_of_swarm_agents
+                ).tolist(),
+                self.random_number_generator.spawn(self.num_of_swarm_agents),
             )
-            for _ in range(self.num_of_swarm_agents)
         ]
 
         self.num_of_cells_visited_by_agent = np.zeros(shape=(self.num_of_swarm_agents,))
@@ -129,8 +142,8 @@ class MultiAgentNavigationTrainer(gym.Env):
             shape=(self.num_of_swarm_agents,)
         )
 
-        self.position_of_swarm_agent_to_train = random.randint(
-            0, self.num_of_swarm_agents - 1
+        self.position_of_swarm_agent_to_train = int(
+            self.random_number_generator.integers(self.num_of_swarm_agents)
         )
 
         return np.array(
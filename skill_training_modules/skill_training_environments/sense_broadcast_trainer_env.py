@@ -1,21 +1,24 @@
 import os
 import sys
 import gym
+import numpy as np
 import wandb
-import random
-
 
 ROOT_DIRECTORY = os.path.dirname(os.getcwd())
 sys.path.append(ROOT_DIRECTORY)
 
 from environment_agent_modules import (
     SwarmAgent,
+    TileGrid,
     return_ratio_of_white_to_black_tiles,
 )
 
 from .training_environment_utils import (
-    return_environment_based_on_weighting_list,
+    CurriculumEnvironmentSource,
+    return_environment_of_type,
     inverse_sigmoid_for_weighting,
+    return_random_agent,
+    return_random_directions,
 )
 
 from helper_files import return_list_of_coordinates_column_by_columns
@@ -23,7 +26,7 @@ from helper_files import return_list_of_coordinates_column_by_columns
 
 class SenseBroadcastTrainer(gym.Env):
     from stable_baselines3 import PPO, DQN
-    from typing import Union
+    from typing import List, Tuple, Union
 
     def __init__(
         self,
@@ -32,6 +35,8 @@ class SenseBroadcastTrainer(gym.Env):
         height: int,
         num_of_swarm_agents: int,
         random_agent_per_step: bool,
+        environment_prefetch_depth: int = 0,
+        seed: Union[int, None] = None,
         **kwargs,
     ):
         super(SenseBroadcastTrainer, self).__init__()
@@ -52,6 +57,12 @@ class SenseBroadcastTrainer(gym.Env):
             low=0.0, high=1.0, shape=(4,), dtype=float32
         )
 
+        self.environment_source = CurriculumEnvironmentSource(
+            environment_factory=self.build_episode_environment,
+            prefetch_depth=environment_prefetch_depth,
+            seed=seed,
+        )
+
     def set_model(self, model: Union[PPO, DQN]):
         self.model = model
 
@@ -82,7 +93,7 @@ class SenseBroadcastTrainer(gym.Env):
     def return_action_for_other_agent(self, agent: SwarmAgent):
         if self.model is not None:
             return self.model.predict(agent.return_sense_broadcast_states())[0].item()
-        return random.choice([0, 1])
+        return int(self.random_number_generator.integers(2))
 
     def step(self, action):
         for agent in self.swarm_agents:
@@ -133,7 +144,9 @@ class SenseBroadcastTrainer(gym.Env):
             )
 
         if self.random_agent_per_step:
-            self.agent_to_train = random.choice(self.swarm_agents)
+            self.agent_to_train = return_random_agent(
+                self.swarm_agents, self.random_number_generator
+            )
 
         return (
             self.agent_to_train.return_sense_broadcast_states(),
@@ -142,20 +155,17 @@ class SenseBroadcastTrainer(gym.Env):
             {},
         )
 
-    def reset(self):
-        self.done = False
-        self.num_steps = 0
-
-        (
-            self.index_of_environment,
-            self.tile_grid,
-        ) = return_environment_based_on_weighting_list(
-            self.environment_type_weighting, self.width, self.height
+    def build_episode_environment(
+        self, index_of_environment: int, random_number_generator: np.random.Generator
+    ) -> Tuple[int, TileGrid, int, List[SwarmAgent], np.random.Generator]:
+        tile_grid = return_environment_of_type(
+            index_of_environment,
+            self.width,
+            self.height,
+            random_number_generator=random_number_generator,
         )
 
-        self.correct_opinion = round(
-            return_ratio_of_white_to_black_tiles(self.tile_grid)
-        )
+        correct_opinion = round(return_ratio_of_white_to_black_tiles(tile_grid))
 
         list_of_coordinates_to_distribute_agents_over = (
             return_list_of_coordinates_column_by_columns(
@@ -163,22 +173,55 @@ class SenseBroadcastTrainer(gym.Env):
             )
         )
 
-        self.swarm_agents = [
+        swarm_agents = [
             SwarmAgent(
                 starting_cell=(
-                    self.tile_grid[list_of_coordinates_to_distribute_agents_over.pop(0)]
+                    tile_grid[list_of_coordinates_to_distribute_agents_over.pop(0)]
                 ),
-                current_direction_facing=random.randint(0, 3),
+                current_direction_facing=direction,
+                random_number_generator=agent_random_number_generator,
                 total_number_of_environment_cells=self.width * self.height,
             )
-            for _ in range(self.num_of_swarm_agents)
+            for direction, agent_random_number_generator in zip(
+                return_random_directions(
+                    self.num_of_swarm_agents, random_number_generator
+                ),
+                random_number_generator.spawn(self.num_of_swarm_agents),
+            )
         ]
 
+        return (
+            index_of_environment,
+            tile_grid,
+            correct_opinion,
+            swarm_agents,
+            random_number_generator,
+        )
+
+    def reset(self):
+        self.done = False
+        self.num_steps = 0
+
+        (
+            self.index_of_environment,
+            self.tile_grid,
+            self.correct_opinion,
+            self.swarm_agents,
+            self.random_number_generator,
+        ) = self.environment_source.return_next_environment(
+            self.environment_type_weighting
+        )
+
         self.broadcast_true_positives = 0
         self.broadcast_false_positives = 0
         self.broadcast_true_negatives = 0
         self.broadcast_false_negatives = 0
 
-        self.agent_to_train = random.choice(self.swarm_agents)
+        self.agent_to_train = return_random_agent(
+            self.swarm_agents, self.random_number_generator
+        )
 
         return self.agent_to_train.return_sense_broadcast_states()
+
+    def close(self):
+        self.environment_source.close()
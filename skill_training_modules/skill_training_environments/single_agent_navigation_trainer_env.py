@@ -3,16 +3,27 @@ import sys
 import numpy as np
 import gym
 import wandb
-import random
 
 ROOT_DIRECTORY = os.path.dirname(os.getcwd())
 sys.path.append(ROOT_DIRECTORY)
 
-from environment_agent_modules import create_nonclustered_tile_grid, SwarmAgent
+from typing import Union
+from environment_agent_modules import (
+    create_nonclustered_tile_grid,
+    return_episode_random_number_generator,
+    SwarmAgent,
+)
 
 
 class SingleAgentNavigationTrainer(gym.Env):
-    def __init__(self, max_num_of_steps: int, width: int, height: int, **kwargs):
+    def __init__(
+        self,
+        max_num_of_steps: int,
+        width: int,
+        height: int,
+        seed: Union[int, None] = None,
+        **kwargs
+    ):
         from gym import spaces
 
         super(SingleAgentNavigationTrainer, self).__init__()
@@ -20,6 +31,7 @@ class SingleAgentNavigationTrainer(gym.Env):
         self.observation_space = spaces.Box(low=0, high=4, shape=(2,), dtype=int)
         self.max_num_of_steps = max_num_of_steps
         self.width, self.height = width, height
+        self.seed_sequence = np.random.SeedSequence(seed)
 
     def set_model(self, model):
         self.model = model
@@ -79,20 +91,26 @@ class SingleAgentNavigationTrainer(gym.Env):
     def reset(self):
         self.done = False
         self.num_steps = 0
+        self.random_number_generator = return_episode_random_number_generator(
+            self.seed_sequence
+        )
         self.tile_grid = create_nonclustered_tile_grid(
-            width=self.width, height=self.height
+            width=self.width,
+            height=self.height,
+            random_number_generator=self.random_number_generator,
         )
 
         self.swarm_agent = SwarmAgent(
             starting_cell=(
                 self.tile_grid[
                     (
-                        random.randint(0, self.height - 1),
-                        random.randint(0, self.width - 1),
+                        int(self.random_number_generator.integers(self.height)),
+                        int(self.random_number_generator.integers(self.width)),
                     )
                 ]
             ),
-            current_direction_facing=random.randint(0, 3),
+            current_direction_facing=int(self.random_number_generator.integers(4)),
+            random_number_generator=self.random_number_generator.spawn(1)[0],
         )
 
         self.num_of_cells_visited_by_agent = 0
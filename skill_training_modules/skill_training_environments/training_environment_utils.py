@@ -1,14 +1,15 @@
-from typing import List, Tuple
+from functools import partial
+from typing import Any, Callable, List, Tuple, Union
 import numpy as np
-import random
 
 from environment_agent_modules import (
+    EnvironmentPrefetcher,
+    return_episode_random_number_generator,
     create_nonclustered_tile_grid,
     create_clustered_inital_observation_useful_tile_grid,
     create_clustered_inital_observation_not_useful_tile_grid,
 )
 
-
 environment_type_list = [
     create_nonclustered_tile_grid,
     create_clustered_inital_observation_useful_tile_grid,
@@ -30,29 +31,134 @@ def sigmoid_for_weighting(broadcast_percentage: float) -> float:
     return 100 / ((1 + np.exp(-0.1 * (broadcast_percentage - 50))) + EPSILON)
 
 
+def return_random_directions(
+    num_of_directions: int, random_number_generator: np.random.Generator
+) -> List[int]:
+    return random_number_generator.integers(0, 4, size=num_of_directions).tolist()
+
+
+def return_random_agent(
+    swarm_agents: List[Any], random_number_generator: np.random.Generator
+) -> Any:
+    return swarm_agents[random_number_generator.integers(len(swarm_agents))]
+
+
+def return_index_of_environment(
+    weighting_list: List[int], random_number_generator: np.random.Generator
+) -> int:
+    return int(
+        random_number_generator.choice(
+            len(environment_type_list),
+            p=np.array(weighting_list) / np.sum(weighting_list),
+        )
+    )
+
+
+def return_environment_of_type(
+    index_of_environment: int,
+    environment_width: int,
+    environment_height: int,
+    random_number_generator: np.random.Generator,
+) -> np.ndarray:
+    from scipy.stats import truncnorm
+
+    return environment_type_list[index_of_environment](
+        width=environment_width,
+        height=environment_height,
+        ratio_of_white_to_black_tiles=truncnorm.rvs(
+            (0 - 0.5) / 1,
+            (1 - 0.5) / 1,
+            0.5,
+            1,
+            random_state=random_number_generator,
+        ),
+        random_number_generator=random_number_generator,
+    )
+
+
 def return_environment_based_on_weighting_list(
     weighting_list: List[int],
     environment_width: int,
     environment_height: int,
+    random_number_generator: np.random.Generator,
 ) -> Tuple[int, np.ndarray]:
     """
     Returns the environment based on the weighting list.
     """
-    from scipy.stats import truncnorm
 
-    index_of_environment = random.choices(
-        [0, 1, 2],
-        weights=weighting_list,
-        k=1,
-    ).pop(0)
+    index_of_environment = return_index_of_environment(
+        weighting_list, random_number_generator
+    )
 
     return (
         index_of_environment,
-        environment_type_list[index_of_environment](
-            width=environment_width,
-            height=environment_height,
-            ratio_of_white_to_black_tiles=truncnorm.rvs(
-                (0 - 0.5) / 1, (1 - 0.5) / 1, 0.5, 1
-            ),
+        return_environment_of_type(
+            index_of_environment,
+            environment_width,
+            environment_height,
+            random_number_generator,
         ),
     )
+
+
+class CurriculumEnvironmentSource:
+    """
+    Episode environments for the curriculum trainers. Each episode's
+    environment type is drawn on the main thread from the weighting list
+    as it is at reset, then the next environment of that type is built (or
+    taken from that type's EnvironmentPrefetcher). Every type has its own
+    seed sequence, so with a seed the episodes depend neither on thread
+    timing nor on whether they are prefetched.
+    """
+
+    def __init__(
+        self,
+        environment_factory: Callable[[int, np.random.Generator], Any],
+        prefetch_depth: int = 0,
+        seed: Union[int, None] = None,
+    ) -> None:
+        *self.seed_sequences, curriculum_seed_sequence = np.random.SeedSequence(
+            seed
+        ).spawn(len(environment_type_list) + 1)
+        self.curriculum_random_number_generator = np.random.default_rng(
+            curriculum_seed_sequence
+        )
+        self.environment_factory = environment_factory
+        self.environment_prefetchers = (
+            [
+                EnvironmentPrefetcher(
+                    environment_factory=partial(
+                        environment_factory, index_of_environment
+                    ),
+                    queue_depth=prefetch_depth,
+                    seed=seed_sequence,
+                )
+                for index_of_environment, seed_sequence in enumerate(
+                    self.seed_sequences
+                )
+            ]
+            if prefetch_depth
+            else None
+        )
+
+    def return_next_environment(self, weighting_list: List[int]) -> Any:
+        index_of_environment = return_index_of_environment(
+            weighting_list, self.curriculum_random_number_generator
+        )
+
+        if self.environment_prefetchers is not None:
+            return self.environment_prefetchers[
+                index_of_environment
+            ].return_next_environment()
+
+        return self.environment_factory(
+            index_of_environment,
+            return_episode_random_number_generator(
+                self.seed_sequences[index_of_environment]
+            ),
+        )
+
+    def close(self) -> None:
+        if self.environment_prefetchers is not None:
+            for environment_prefetcher in self.environment_prefetchers:
+                environment_prefetcher.close()
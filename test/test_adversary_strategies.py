@@ -0,0 +1,136 @@
+import unittest
+import numpy as np
+
+from environment_agent_modules import (
+    EMPTY_TILE,
+    MaliciousAgent,
+    SwarmAgent,
+    SwarmState,
+    create_nonclustered_tile_grid,
+)
+
+
+def return_malicious_agents(tile_grid, seed, num_of_malicious_agents=6):
+    return [
+        MaliciousAgent(
+            starting_cell=tile_grid[(2 * position, 3)],
+            malicious_opinion=position % 2,
+            random_number_generator=random_number_generator,
+        )
+        for position, random_number_generator in enumerate(
+            np.random.default_rng(seed).spawn(num_of_malicious_agents)
+        )
+    ]
+
+
+class adversary_strategies_tester(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tile_grids = [
+            create_nonclustered_tile_grid(
+                height=12, width=12, random_number_generator=np.random.default_rng(5)
+            )
+            for _ in range(2)
+        ]
+
+    def return_malicious_state(self, adversary_strategy, mode="synchronous"):
+        return SwarmState(
+            self.tile_grids[0],
+            (),
+            return_malicious_agents(self.tile_grids[0], seed=1),
+            mode=mode,
+            random_number_generator=np.random.default_rng(2),
+            adversary_strategy=adversary_strategy,
+            adversary_flip_step=10,
+        )
+
+    def test_ordered_malicious_state_matches_stepping_agents(self):
+        malicious_agents = return_malicious_agents(self.tile_grids[1], seed=1)
+        malicious_state = self.return_malicious_state(
+            "fixed_wrong_opinion", mode="ordered"
+        )
+
+        for _ in range(40):
+            for malicious_agent in malicious_agents:
+                malicious_agent.navigate(self.tile_grids[1])
+
+            malicious_state.step_without_listening()
+
+        np.testing.assert_array_equal(
+            self.tile_grids[0].occupancy, self.tile_grids[1].occupancy
+        )
+        self.assertEqual(
+            [agent.return_opinion() for agent in malicious_state.agents],
+            [agent.return_opinion() for agent in malicious_agents],
+        )
+
+    def test_random_opinions_are_shared_with_the_agents(self):
+        malicious_state = self.return_malicious_state("random_opinion")
+        adversary_opinions = []
+
+        for _ in range(20):
+            malicious_state.step_without_listening()
+            adversary_opinions.append(
+                [agent.return_opinion() for agent in malicious_state.agents]
+            )
+
+            with self.subTest():
+                self.assertEqual(
+                    adversary_opinions[-1], malicious_state.adversary_opinions.tolist()
+                )
+
+        self.assertEqual(set(np.ravel(adversary_opinions)), {0, 1})
+        self.assertEqual(
+            np.count_nonzero(self.tile_grids[0].occupancy != EMPTY_TILE), 6
+        )
+
+    def test_mimic_then_flip(self):
+        malicious_state = self.return_malicious_state("mimic_then_flip")
+        malicious_opinions = [
+            agent.malicious_opinion for agent in malicious_state.agents
+        ]
+
+        for step in range(20):
+            malicious_state.step_without_listening()
+
+            with self.subTest(step=step):
+                self.assertEqual(
+                    [agent.return_opinion() for agent in malicious_state.agents],
+                    [
+                        opinion if step >= 10 else 1 - opinion
+                        for opinion in malicious_opinions
+                    ],
+                )
+
+    def test_swarm_agents_hear_adversary_opinions(self):
+        malicious_state = self.return_malicious_state("mimic_then_flip")
+        swarm_agent = SwarmAgent(starting_cell=self.tile_grids[0][(0, 4)])
+
+        # the malicious agent at (0, 3) holds opinion 0 but mimics opinion 1
+        swarm_agent.recieve_local_opinions(self.tile_grids[0])
+
+        with self.subTest():
+            self.assertAlmostEqual(swarm_agent.calculated_collective_opinion, 0.55)
+            np.testing.assert_array_equal(
+                malicious_state.return_broadcast_opinions(),
+                1 - malicious_state.malicious_opinions,
+            )
+
+    def test_state_without_malicious_agents(self):
+        swarm_state = SwarmState(
+            self.tile_grids[0],
+            (),
+            (),
+            mode="synchronous",
+            adversary_strategy="random_opinion",
+        )
+        swarm_state.step_without_listening()
+
+        self.assertEqual(len(swarm_state.adversary_opinions), 0)
+
+    def test_unknown_adversary_strategy(self):
+        with self.assertRaises(ValueError):
+            self.return_malicious_state("always_agree")
+
+
+if __name__ == "__main__":
+    unittest.main()
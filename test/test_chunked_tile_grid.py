@@ -0,0 +1,130 @@
+import unittest
+import numpy as np
+
+from environment_agent_modules import (
+    SwarmAgent,
+    ChunkedTileGrid,
+    return_ratio_of_white_to_black_tiles,
+    create_nonclustered_tile_grid,
+    create_clustered_inital_observation_useful_tile_grid,
+)
+
+
+class chunked_tile_grid_tester(unittest.TestCase):
+    def setUp(self) -> None:
+        self.chunked_tile_grid = create_nonclustered_tile_grid(
+            height=1000,
+            width=1500,
+            ratio_of_white_to_black_tiles=0.62,
+            random_number_generator=np.random.default_rng(2),
+            chunked=True,
+        )
+
+    def test_chunked_tile_grid_only_allocates_chunks_that_are_used(self):
+        swarm_agent = SwarmAgent(starting_cell=self.chunked_tile_grid[(500, 700)])
+
+        with self.subTest():
+            self.assertIsInstance(self.chunked_tile_grid, ChunkedTileGrid)
+            self.assertEqual(self.chunked_tile_grid.shape, (1000, 1500))
+            self.assertEqual(list(self.chunked_tile_grid.colour.chunks), [(7, 10)])
+            self.assertEqual(list(self.chunked_tile_grid.occupancy.chunks), [(7, 10)])
+
+        swarm_agent.recieve_local_opinions(tile_grid=self.chunked_tile_grid)
+
+        self.assertEqual(len(self.chunked_tile_grid.occupancy.chunks), 1)
+
+    def test_chunked_tile_grid_colours_are_reproducible(self):
+        new_chunked_tile_grid = create_nonclustered_tile_grid(
+            height=1000,
+            width=1500,
+            ratio_of_white_to_black_tiles=0.62,
+            random_number_generator=np.random.default_rng(2),
+            chunked=True,
+        )
+
+        # chunks are read in a different order on each grid
+        for coordinate in ((999, 1499), (0, 0), (640, 65)):
+            with self.subTest(coordinate=coordinate):
+                self.assertEqual(
+                    new_chunked_tile_grid[coordinate]["colour"],
+                    self.chunked_tile_grid[coordinate]["colour"],
+                )
+
+        self.assertEqual(len(new_chunked_tile_grid.colour.chunks), 3)
+
+    def test_chunked_tile_grid_counts_white_tiles_without_keeping_chunks(self):
+        self.assertAlmostEqual(
+            return_ratio_of_white_to_black_tiles(tile_grid=self.chunked_tile_grid),
+            0.62,
+            places=2,
+        )
+        self.assertEqual(len(self.chunked_tile_grid.colour.chunks), 0)
+
+    def test_chunked_tile_grid_white_tile_count_needs_no_chunks(self):
+        huge_chunked_tile_grid = create_nonclustered_tile_grid(
+            height=40000,
+            width=40000,
+            ratio_of_white_to_black_tiles=0.62,
+            random_number_generator=np.random.default_rng(2),
+            chunked=True,
+        )
+
+        with self.subTest():
+            self.assertAlmostEqual(
+                return_ratio_of_white_to_black_tiles(tile_grid=huge_chunked_tile_grid),
+                0.62,
+                places=3,
+            )
+            self.assertEqual(len(huge_chunked_tile_grid.colour.chunks), 0)
+            self.assertEqual(
+                self.chunked_tile_grid.num_of_white_tiles,
+                self.chunked_tile_grid.count_white_tiles(),
+            )
+
+    def test_agents_move_the_same_on_chunked_and_dense_tile_grids(self):
+        tile_grid, chunked_tile_grid = (
+            create_clustered_inital_observation_useful_tile_grid(
+                height=70,
+                width=130,
+                ratio_of_white_to_black_tiles=0.55,
+                chunked=chunked,
+            )
+            for chunked in (False, True)
+        )
+
+        agent_trajectories = []
+
+        for grid in (tile_grid, chunked_tile_grid):
+            swarm_agents = [
+                SwarmAgent(
+                    starting_cell=grid[(row, 63)],
+                    communication_range=2,
+                    random_number_generator=np.random.default_rng(row),
+                )
+                for row in range(0, 70, 3)
+            ]
+
+            for _ in range(200):
+                for swarm_agent in swarm_agents:
+                    swarm_agent.navigate_and_recieve_opinions(tile_grid=grid)
+
+            agent_trajectories.append(
+                [
+                    (
+                        swarm_agent.current_cell,
+                        swarm_agent.num_of_white_cells_observed,
+                        swarm_agent.calculated_collective_opinion,
+                    )
+                    for swarm_agent in swarm_agents
+                ]
+            )
+
+        with self.subTest():
+            self.assertEqual(agent_trajectories[0], agent_trajectories[1])
+            self.assertEqual(
+                chunked_tile_grid.num_of_white_tiles, tile_grid.num_of_white_tiles
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import tempfile
+import unittest
+import numpy as np
+
+from environment_agent_modules import (
+    EnvironmentCorpus,
+    generate_environment_corpus,
+    create_nonclustered_tile_grid,
+    create_clustered_inital_observation_useful_tile_grid,
+)
+
+
+class environment_corpus_tester(unittest.TestCase):
+    def setUp(self) -> None:
+        self.corpus_directory = tempfile.TemporaryDirectory()
+
+        generate_environment_corpus(
+            corpus_directory=self.corpus_directory.name,
+            environment_type_map={
+                "nonclustered_tile_grid": create_nonclustered_tile_grid,
+                "clustered_inital_observation_useful_tile_grid": (
+                    create_clustered_inital_observation_useful_tile_grid
+                ),
+            },
+            ratios_of_white_to_black_tiles=[0.52, 0.72],
+            num_of_grids=3,
+            width=8,
+            height=6,
+            seed=11,
+        )
+
+        self.environment_corpus = EnvironmentCorpus(self.corpus_directory.name)
+
+    def tearDown(self) -> None:
+        del self.environment_corpus
+        self.corpus_directory.cleanup()
+
+    def test_corpus_grids_are_views_of_the_memory_map(self):
+        tile_grid = self.environment_corpus.return_tile_grid(
+            environment_type_name="nonclustered_tile_grid",
+            ratio_of_white_to_black_tiles=0.72,
+            grid_index=2,
+        )
+
+        with self.subTest():
+            self.assertEqual(tile_grid.shape, (6, 8))
+            self.assertFalse(tile_grid.colour.flags.owndata)
+            self.assertTrue(
+                np.may_share_memory(tile_grid.colour, self.environment_corpus.colours)
+            )
+
+    def test_corpus_matches_seeded_generation(self):
+        first_corpus_colours = np.array(self.environment_corpus.colours)
+
+        with tempfile.TemporaryDirectory() as corpus_directory:
+            generate_environment_corpus(
+                corpus_directory=corpus_directory,
+                environment_type_map={
+                    "nonclustered_tile_grid": create_nonclustered_tile_grid,
+                    "clustered_inital_observation_useful_tile_grid": (
+                        create_clustered_inital_observation_useful_tile_grid
+                    ),
+                },
+                ratios_of_white_to_black_tiles=[0.52, 0.72],
+                num_of_grids=3,
+                width=8,
+                height=6,
+                seed=11,
+            )
+
+            self.assertTrue(
+                np.array_equal(
+                    first_corpus_colours,
+                    np.load(f"{corpus_directory}/colours.npy"),
+                )
+            )
+
+    def test_environment_stream_returns_grids_in_order(self):
+        environment_stream = self.environment_corpus.return_environment_stream(
+            "clustered_inital_observation_useful_tile_grid"
+        )
+
+        for grid_index in range(4):
+            self.assertTrue(
+                np.array_equal(
+                    environment_stream(
+                        width=8, height=6, ratio_of_white_to_black_tiles=0.52
+                    ).colour,
+                    self.environment_corpus.colours[1, 0, grid_index % 3],
+                )
+            )
+
+    def test_unknown_ratio_raises_key_error(self):
+        with self.assertRaises(KeyError):
+            self.environment_corpus.return_tile_grid(
+                environment_type_name="nonclustered_tile_grid",
+                ratio_of_white_to_black_tiles=0.62,
+                grid_index=0,
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+import numpy as np
+
+from environment_agent_modules import (
+    EnvironmentPrefetcher,
+    create_nonclustered_tile_grid,
+)
+from skill_training_modules.skill_training_environments.training_environment_utils import (
+    CurriculumEnvironmentSource,
+    return_environment_of_type,
+)
+
+
+class environment_prefetcher_tester(unittest.TestCase):
+    def return_prefetched_colours(self, queue_depth: int, seed: int):
+        environment_prefetcher = EnvironmentPrefetcher(
+            environment_factory=lambda random_number_generator: (
+                create_nonclustered_tile_grid(
+                    width=10,
+                    height=10,
+                    random_number_generator=random_number_generator,
+                )
+            ),
+            queue_depth=queue_depth,
+            seed=seed,
+        )
+
+        colours = [
+            environment_prefetcher.return_next_environment().colour for _ in range(4)
+        ]
+
+        environment_prefetcher.close()
+
+        return colours
+
+    def test_prefetched_environments_are_deterministic_for_a_seed(self):
+        for first_colours, second_colours in zip(
+            self.return_prefetched_colours(queue_depth=1, seed=7),
+            self.return_prefetched_colours(queue_depth=3, seed=7),
+        ):
+            self.assertTrue(np.array_equal(first_colours, second_colours))
+
+    def test_prefetched_environments_differ_between_episodes(self):
+        colours = self.return_prefetched_colours(queue_depth=2, seed=7)
+
+        self.assertFalse(np.array_equal(colours[0], colours[1]))
+
+    def test_factory_errors_are_raised_on_every_return(self):
+        def failing_factory(random_number_generator):
+            raise ValueError("bad environment")
+
+        environment_prefetcher = EnvironmentPrefetcher(
+            environment_factory=failing_factory, queue_depth=1
+        )
+
+        for call in range(2):
+            with self.subTest(call=call):
+                with self.assertRaises(ValueError):
+                    environment_prefetcher.return_next_environment()
+
+        environment_prefetcher.close()
+
+    def return_curriculum_environments(self, prefetch_depth: int):
+        environment_source = CurriculumEnvironmentSource(
+            environment_factory=lambda index_of_environment, random_number_generator: (
+                index_of_environment,
+                return_environment_of_type(
+                    index_of_environment, 10, 10, random_number_generator
+                ).colour,
+            ),
+            prefetch_depth=prefetch_depth,
+            seed=7,
+        )
+        weighting_list = [33, 33, 33]
+        environments = []
+
+        for episode in range(8):
+            environments.append(
+                environment_source.return_next_environment(weighting_list)
+            )
+            # the curriculum moves all of its weight onto one type mid-run
+            if episode == 3:
+                weighting_list = [0, 0, 100]
+
+        environment_source.close()
+
+        return environments
+
+    def test_curriculum_environments_follow_the_current_weighting(self):
+        environments = self.return_curriculum_environments(prefetch_depth=0)
+        prefetched_environments = self.return_curriculum_environments(prefetch_depth=2)
+
+        for (index_of_environment, colours), (
+            prefetched_index_of_environment,
+            prefetched_colours,
+        ) in zip(environments, prefetched_environments):
+            with self.subTest():
+                self.assertEqual(index_of_environment, prefetched_index_of_environment)
+                self.assertTrue(np.array_equal(colours, prefetched_colours))
+
+        self.assertEqual(
+            [index_of_environment for index_of_environment, _ in environments[4:]],
+            [2] * 4,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+import numpy as np
+
+from helper_files import (
+    TRAINED_MODELS_DIRECTORY,
+    NumpyPolicy,
+    compile_lookup_table_policy,
+    return_disagreement_rate,
+    return_sense_broadcast_observations,
+    return_sense_broadcast_observation_samples,
+)
+
+
+class lookup_table_policy_tester(unittest.TestCase):
+    def setUp(self) -> None:
+        self.numpy_policy = NumpyPolicy.load(
+            f"{TRAINED_MODELS_DIRECTORY}/sense_broadcast_model.npz"
+        )
+        self.observations = return_sense_broadcast_observation_samples(
+            20000, np.random.default_rng(0)
+        )
+
+    def test_lookup_table_policy_matches_the_policy_on_grid_points(self):
+        lookup_table_policy = compile_lookup_table_policy(
+            self.numpy_policy, grid_resolution=(5, 2, 9)
+        )
+        grid_observations = np.stack(
+            np.meshgrid(
+                np.linspace(0, 1, 5),
+                (0, 1),
+                np.linspace(0, 1, 9),
+                indexing="ij",
+            ),
+            axis=-1,
+        ).reshape(-1, 3)
+        grid_observations = return_sense_broadcast_observations(grid_observations)
+
+        np.testing.assert_array_equal(
+            lookup_table_policy.predict(grid_observations)[0],
+            self.numpy_policy.predict(grid_observations)[0],
+        )
+
+    def test_finer_lookup_tables_disagree_less(self):
+        coarse_disagreement_rate, fine_disagreement_rate = (
+            return_disagreement_rate(
+                compile_lookup_table_policy(
+                    self.numpy_policy, grid_resolution=grid_resolution
+                ),
+                self.numpy_policy,
+                self.observations,
+            )
+            for grid_resolution in ((5, 2, 5), (41, 2, 41))
+        )
+
+        with self.subTest():
+            self.assertLess(fine_disagreement_rate, coarse_disagreement_rate)
+            self.assertLess(fine_disagreement_rate, 0.02)
+
+
+if __name__ == "__main__":
+    unittest.main()
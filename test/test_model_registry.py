@@ -0,0 +1,63 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from environment_agent_modules import SwarmAgent, create_nonclustered_tile_grid
+from helper_files import TRAINED_MODELS_DIRECTORY, ModelRegistry
+
+
+class model_registry_tester(unittest.TestCase):
+    def setUp(self) -> None:
+        self.models_directory = tempfile.mkdtemp()
+        shutil.copy(
+            f"{TRAINED_MODELS_DIRECTORY}/sense_broadcast_model.zip",
+            self.models_directory,
+        )
+        self.model_registry = ModelRegistry()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.models_directory)
+
+    def test_model_is_loaded_once(self):
+        model = self.model_registry.return_model(
+            "sense_broadcast_model", models_directory=self.models_directory
+        )
+
+        self.assertIs(
+            self.model_registry.return_model(
+                "sense_broadcast_model", models_directory=self.models_directory
+            ),
+            model,
+        )
+
+    def test_model_is_reloaded_when_the_file_changes(self):
+        model = self.model_registry.return_model(
+            "sense_broadcast_model", models_directory=self.models_directory
+        )
+
+        model_file_path = f"{self.models_directory}/sense_broadcast_model.zip"
+        modified_time = os.path.getmtime(model_file_path)
+        os.utime(model_file_path, (modified_time + 10, modified_time + 10))
+
+        self.assertIsNot(
+            self.model_registry.return_model(
+                "sense_broadcast_model", models_directory=self.models_directory
+            ),
+            model,
+        )
+
+    def test_swarm_agents_share_their_models(self):
+        tile_grid = create_nonclustered_tile_grid(width=5, height=5)
+        first_agent, second_agent = (
+            SwarmAgent(starting_cell=tile_grid[(row, 0)], needs_models_loaded=True)
+            for row in range(2)
+        )
+
+        self.assertIs(
+            first_agent.sense_broadcast_model, second_agent.sense_broadcast_model
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
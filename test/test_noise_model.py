@@ -0,0 +1,60 @@
+import unittest
+import numpy as np
+
+from environment_agent_modules import (
+    NoiseModel,
+    SwarmAgent,
+    create_nonclustered_tile_grid,
+    return_flip_mask,
+)
+
+
+class noise_model_tester(unittest.TestCase):
+    def test_noiseless_model_never_draws(self):
+        random_number_generator = np.random.default_rng(0)
+        noise_model = NoiseModel(0.0, random_number_generator)
+
+        self.assertFalse(any(noise_model.return_flip() for _ in range(100)))
+        self.assertIsNone(noise_model.random_number_generator)
+        self.assertIs(return_flip_mask(np.zeros(5), random_number_generator), False)
+        self.assertEqual(
+            random_number_generator.random(),
+            np.random.default_rng(0).random(),
+        )
+
+    def test_flip_rate_matches_noise(self):
+        for noise in (0.1, 0.5):
+            with self.subTest(noise=noise):
+                noise_model = NoiseModel(noise, np.random.default_rng(1))
+
+                self.assertAlmostEqual(
+                    np.mean([noise_model.return_flip() for _ in range(20000)]),
+                    noise,
+                    delta=0.02,
+                )
+
+    def test_noise_does_not_change_navigation(self):
+        swarm_agent_cells = []
+
+        for noise in (0.0, 0.3):
+            tile_grid = create_nonclustered_tile_grid(
+                height=10, width=10, random_number_generator=np.random.default_rng(2)
+            )
+            swarm_agent = SwarmAgent(
+                starting_cell=tile_grid[(4, 4)],
+                sensing_noise=noise,
+                communication_noise=noise,
+                random_number_generator=np.random.default_rng(3),
+            )
+            swarm_agent_cells.append([])
+
+            for _ in range(50):
+                swarm_agent.navigate(tile_grid)
+                swarm_agent.update_collective_opinion(1)
+                swarm_agent_cells[-1].append(swarm_agent.current_cell)
+
+        self.assertEqual(swarm_agent_cells[0], swarm_agent_cells[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
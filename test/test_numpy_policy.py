@@ -0,0 +1,64 @@
+import shutil
+import tempfile
+import unittest
+import numpy as np
+
+from helper_files import (
+    TRAINED_MODELS_DIRECTORY,
+    NumpyPolicy,
+    export_dqn_to_numpy_policy,
+    return_model,
+)
+
+
+class numpy_policy_tester(unittest.TestCase):
+    def setUp(self) -> None:
+        self.models_directory = tempfile.mkdtemp()
+        shutil.copy(
+            f"{TRAINED_MODELS_DIRECTORY}/sense_broadcast_model.zip",
+            self.models_directory,
+        )
+        self.numpy_policy = NumpyPolicy.load(
+            export_dqn_to_numpy_policy(
+                "sense_broadcast_model", models_directory=self.models_directory
+            )
+        )
+        self.dqn = return_model("DQN").load(
+            f"{self.models_directory}/sense_broadcast_model"
+        )
+        self.observations = (
+            np.random.default_rng(0).random((5000, 4)).astype(np.float32)
+        )
+        self.observations[:, 1] = np.round(self.observations[:, 1])
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.models_directory)
+
+    def test_numpy_policy_matches_dqn(self):
+        with self.subTest():
+            np.testing.assert_array_equal(
+                self.numpy_policy.predict(self.observations)[0],
+                self.dqn.predict(self.observations, deterministic=True)[0],
+            )
+            self.assertEqual(
+                self.numpy_policy.predict(self.observations[0])[0],
+                self.dqn.predict(self.observations[0], deterministic=True)[0],
+            )
+            self.assertEqual(
+                self.numpy_policy.exploration_rate, self.dqn.exploration_rate
+            )
+            self.assertEqual(self.numpy_policy.action_space.n, self.dqn.action_space.n)
+
+    def test_numpy_policy_save_and_load(self):
+        self.numpy_policy.save(f"{self.models_directory}/copy.npz")
+
+        np.testing.assert_array_equal(
+            NumpyPolicy.load(f"{self.models_directory}/copy.npz").return_q_values(
+                self.observations
+            ),
+            self.numpy_policy.return_q_values(self.observations),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+import numpy as np
+
+from environment_agent_modules import (
+    OPINION_WEIGHT_HANDLERS,
+    OpinionFusion,
+    return_opinion_weight_handler,
+)
+
+
+class opinion_fusion_tester(unittest.TestCase):
+    def setUp(self) -> None:
+        random_number_generator = np.random.default_rng(0)
+        self.num_of_agents = 6
+        self.opinion_weights = random_number_generator.uniform(
+            0.05, 0.4, (self.num_of_agents, 2)
+        )
+        self.max_new_opinion_weighting = random_number_generator.uniform(
+            0.05, 0.4, self.num_of_agents
+        )
+        self.calculated_collective_opinions = random_number_generator.random(
+            self.num_of_agents
+        )
+
+        # contiguous message sequences of different lengths, one agent hears none
+        self.agent_indices = np.repeat([0, 2, 3, 5], [4, 1, 7, 2])
+        self.opinions = random_number_generator.integers(2, size=14)
+
+    def test_message_sequences_match_fusing_one_message_at_a_time(self):
+        for opinion_weighting_method in OPINION_WEIGHT_HANDLERS:
+            with self.subTest(opinion_weighting_method=opinion_weighting_method):
+                opinion_fusion = OpinionFusion(
+                    opinion_weighting_method,
+                    self.opinion_weights,
+                    self.max_new_opinion_weighting,
+                )
+                fused_in_sequence = self.calculated_collective_opinions.copy()
+                fused_at_once = self.calculated_collective_opinions.copy()
+
+                for agent_index, opinion in zip(self.agent_indices, self.opinions):
+                    opinion_fusion.fuse(
+                        fused_in_sequence, agent_index[None], opinion[None]
+                    )
+                opinion_fusion.fuse_message_sequences(
+                    fused_at_once, self.agent_indices, self.opinions
+                )
+
+                np.testing.assert_allclose(fused_at_once, fused_in_sequence)
+                self.assertEqual(
+                    fused_at_once[1], self.calculated_collective_opinions[1]
+                )
+
+    def test_weights_of_one_are_fused_in_sequence(self):
+        self.opinion_weights[:] = 1.0
+        opinion_fusion = OpinionFusion(
+            "list_of_weights", self.opinion_weights, self.max_new_opinion_weighting
+        )
+
+        opinion_fusion.fuse_message_sequences(
+            self.calculated_collective_opinions, self.agent_indices, self.opinions
+        )
+
+        # each agent ends on the last opinion it heard
+        np.testing.assert_array_equal(
+            self.calculated_collective_opinions[[0, 2, 3, 5]],
+            self.opinions[[3, 4, 11, 13]],
+        )
+
+    def test_unknown_opinion_weighting_method(self):
+        with self.subTest():
+            with self.assertRaises(ValueError):
+                return_opinion_weight_handler("majority_rule")
+
+            with self.assertRaises(ValueError):
+                OpinionFusion(
+                    "majority_rule",
+                    self.opinion_weights,
+                    self.max_new_opinion_weighting,
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
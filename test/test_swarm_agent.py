@@ -1,9 +1,11 @@
 from re import S
 import unittest
+import numpy as np
 from typing import List, Tuple, Union, Dict
 
 from environment_agent_modules import (
     SwarmAgent,
+    MaliciousAgent,
     Direction,
     Turn,
     ObjectType,
@@ -11,6 +13,11 @@ from environment_agent_modules import (
     create_nonclustered_tile_grid,
     create_clustered_inital_observation_not_useful_tile_grid,
     create_clustered_inital_observation_useful_tile_grid,
+    choose_commit_decision_actions,
+    choose_sense_broadcast_actions,
+    ACTION_CACHE_COUNTER,
+    return_next_cell_coordinate,
+    validate_cell,
 )
 
 
@@ -490,6 +497,195 @@ class swarm_agent_tester(unittest.TestCase):
             self.swarm_agent.return_opinion(), 0, "return_opinion should be 0 for black"
         )
 
+    def test_agents_spawned_from_the_same_seed_behave_identically(self):
+        agent_states = []
+
+        for _ in range(2):
+            random_number_generator = np.random.default_rng(7)
+            tile_grid = create_nonclustered_tile_grid(
+                width=8,
+                height=8,
+                ratio_of_white_to_black_tiles=0.6,
+                random_number_generator=random_number_generator,
+            )
+            swarm_agents = [
+                SwarmAgent(
+                    starting_cell=tile_grid[(row, 0)],
+                    sensing_noise=0.3,
+                    communication_noise=0.3,
+                    random_number_generator=agent_random_number_generator,
+                )
+                for row, agent_random_number_generator in enumerate(
+                    random_number_generator.spawn(6)
+                )
+            ]
+
+            for step in range(60):
+                for swarm_agent in swarm_agents:
+                    swarm_agent.sensing = step % 2
+                    swarm_agent.navigate_and_recieve_opinions(tile_grid=tile_grid)
+
+            agent_states.append(
+                [
+                    (
+                        swarm_agent.current_cell,
+                        swarm_agent.num_of_white_cells_observed,
+                        swarm_agent.calculated_collective_opinion,
+                    )
+                    for swarm_agent in swarm_agents
+                ]
+            )
+
+        self.assertEqual(agent_states[0], agent_states[1])
+
+    def test_next_cell_coordinate_and_validation_for_every_direction(self):
+        for direction, next_cell in (
+            (Direction.UP.value, (1, 2)),
+            (Direction.RIGHT.value, (2, 3)),
+            (Direction.DOWN.value, (3, 2)),
+            (Direction.LEFT.value, (2, 1)),
+        ):
+            with self.subTest(direction=direction):
+                self.assertEqual(
+                    return_next_cell_coordinate((2, 2), direction), next_cell
+                )
+
+        for cell, is_valid in (
+            ((0, 0), True),
+            ((4, 4), True),
+            ((-1, 2), False),
+            ((2, 5), False),
+        ):
+            with self.subTest(cell=cell):
+                self.assertEqual(validate_cell(cell, (5, 5)), is_valid)
+
+    def test_agents_have_no_instance_dict(self):
+        malicious_agent = MaliciousAgent(
+            starting_cell=self.tiled_enviro[(4, 4)], malicious_opinion=0
+        )
+
+        for agent in (self.swarm_agent, malicious_agent):
+            with self.subTest(agent=type(agent).__name__):
+                self.assertFalse(hasattr(agent, "__dict__"))
+
+    def test_unchanged_states_reuse_the_cached_action(self):
+        class counting_model:
+            exploration_rate = 0.0
+            action_space = type("action_space", (), {"n": 2})
+            num_of_predictions = 0
+
+            def predict(self, states, deterministic=True):
+                self.num_of_predictions += len(states)
+                return (states[..., 2] > 0.5).astype(np.int64), None
+
+        self.swarm_agent.sense_broadcast_model = counting_model()
+        ACTION_CACHE_COUNTER.reset()
+
+        actions = [self.swarm_agent.choose_sense_broadcast_action() for _ in range(3)]
+        self.swarm_agent.calculated_collective_opinion = 0.9
+        actions.append(self.swarm_agent.choose_sense_broadcast_action())
+
+        with self.subTest():
+            self.assertEqual(actions, [0, 0, 0, 1])
+            self.assertEqual(
+                self.swarm_agent.sense_broadcast_model.num_of_predictions, 2
+            )
+            self.assertEqual(ACTION_CACHE_COUNTER.return_hit_rate(), 0.5)
+
+    def test_batched_sense_broadcast_actions_match_single_agent_actions(self):
+        class threshold_model:
+            exploration_rate = 0.3
+            action_space = type("action_space", (), {"n": 2})
+
+            def predict(self, states, deterministic=True):
+                return (states[..., 2] > 0.5).astype(np.int64), None
+
+        agent_actions = []
+
+        for batched in (False, True):
+            tile_grid = create_nonclustered_tile_grid(height=5, width=5)
+            swarm_agents = [
+                SwarmAgent(
+                    starting_cell=tile_grid[(row, 4)],
+                    calculated_collective_opinion=row / 4,
+                    random_number_generator=np.random.default_rng(row),
+                )
+                for row in range(5)
+            ]
+
+            for swarm_agent in swarm_agents:
+                swarm_agent.sense_broadcast_model = threshold_model()
+
+            agent_actions.append(
+                [
+                    (
+                        list(choose_sense_broadcast_actions(swarm_agents))
+                        if batched
+                        else [
+                            swarm_agent.choose_sense_broadcast_action()
+                            for swarm_agent in swarm_agents
+                        ]
+                    )
+                    for _ in range(20)
+                ]
+            )
+
+        self.assertEqual(agent_actions[0], agent_actions[1])
+
+    def test_batched_commit_decisions_match_single_agent_decisions(self):
+        class threshold_model:
+            exploration_rate = 0.2
+            action_space = type("action_space", (), {"n": 2})
+
+            def predict(self, states, deterministic=True):
+                return (states[..., 3] > 0.6).astype(np.int64), None
+
+        agent_decisions = []
+
+        for batched in (False, True):
+            tile_grid = create_nonclustered_tile_grid(
+                height=5, width=5, random_number_generator=np.random.default_rng(0)
+            )
+            swarm_agents = [
+                SwarmAgent(
+                    starting_cell=tile_grid[(row, 4)],
+                    calculated_collective_opinion=row / 4,
+                    random_number_generator=np.random.default_rng(row),
+                )
+                for row in range(5)
+            ]
+
+            for swarm_agent in swarm_agents:
+                swarm_agent.commit_to_opinion_model = threshold_model()
+
+            decisions = []
+
+            for _ in range(20):
+                committing_agents = [
+                    swarm_agent
+                    for swarm_agent in swarm_agents
+                    if not swarm_agent.committed_to_opinion
+                ]
+                commit_decision_actions = (
+                    choose_commit_decision_actions(committing_agents)
+                    if batched
+                    else [None] * len(committing_agents)
+                )
+
+                for swarm_agent, commit_decision_action in zip(
+                    committing_agents, commit_decision_actions
+                ):
+                    swarm_agent.decide_if_to_commit(commit_decision_action)
+
+                decisions.append(
+                    [swarm_agent.committed_to_opinion for swarm_agent in swarm_agents]
+                )
+
+            agent_decisions.append(decisions)
+
+        self.assertEqual(agent_decisions[0], agent_decisions[1])
+        self.assertNotEqual(agent_decisions[0][0], agent_decisions[0][-1])
+
     def test_recieve_local_opinions_all_filled(self):
         self.swarm_agent.leave_cell(self.tiled_enviro[(0, 0)])
         swarm_agent = SwarmAgent(starting_cell=self.tiled_enviro[(1, 1)])
@@ -540,6 +736,28 @@ class swarm_agent_tester(unittest.TestCase):
             places=9,
         )
 
+    def test_recieve_local_opinions_off_the_diagonal(self):
+        swarm_agent = SwarmAgent(starting_cell=self.tiled_enviro[(0, 3)])
+        right_swarm_agent = SwarmAgent(
+            starting_cell=self.tiled_enviro[(0, 4)], sensing=0
+        )
+        left_swarm_agent = SwarmAgent(
+            starting_cell=self.tiled_enviro[(1, 1)], sensing=0
+        )
+
+        right_swarm_agent.num_of_white_cells_observed += 1
+        right_swarm_agent.num_of_cells_observed += 1
+        left_swarm_agent.num_of_cells_observed += 1
+
+        swarm_agent.recieve_local_opinions(tile_grid=self.tiled_enviro)
+
+        self.assertAlmostEqual(
+            swarm_agent.calculated_collective_opinion,
+            0.55,
+            msg="only the agent at (0, 4) is in range",
+            places=9,
+        )
+
     def test_recieve_local_opinions_in_top_left_corner(self):
         other_swarm_agent = SwarmAgent(
             starting_cell=self.tiled_enviro[(0, 1)], sensing=0
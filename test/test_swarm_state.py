@@ -0,0 +1,247 @@
+import unittest
+import numpy as np
+
+from environment_agent_modules import (
+    EMPTY_TILE,
+    SwarmAgent,
+    MaliciousAgent,
+    SwarmState,
+    create_nonclustered_tile_grid,
+)
+
+
+def return_swarm(tile_grid, seed):
+    random_number_generators = np.random.default_rng(seed).spawn(14)
+
+    malicious_agents = [
+        MaliciousAgent(
+            starting_cell=tile_grid[(row, 4)],
+            malicious_opinion=0,
+            random_number_generator=random_number_generators.pop(),
+        )
+        for row in (2, 9)
+    ]
+    swarm_agents = [
+        SwarmAgent(
+            starting_cell=tile_grid[(row, column)],
+            communication_range=2,
+            sensing_noise=0.1,
+            communication_noise=0.1,
+            opinion_weighting_method="equation_based",
+            random_number_generator=random_number_generators.pop(),
+        )
+        for row, column in ((0, 0), (3, 3), (5, 1), (6, 6), (8, 2), (11, 11))
+        + ((1, 7), (4, 9), (7, 10), (10, 5), (2, 2), (9, 9))
+    ]
+
+    return malicious_agents, swarm_agents
+
+
+class swarm_state_tester(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tile_grids = [
+            create_nonclustered_tile_grid(
+                height=12,
+                width=12,
+                ratio_of_white_to_black_tiles=0.62,
+                random_number_generator=np.random.default_rng(5),
+            )
+            for _ in range(2)
+        ]
+
+    def test_ordered_swarm_state_matches_stepping_agents(self):
+        malicious_agents, swarm_agents = return_swarm(self.tile_grids[0], seed=3)
+        state_malicious_agents, state_swarm_agents = return_swarm(
+            self.tile_grids[1], seed=3
+        )
+        swarm_state = SwarmState(
+            self.tile_grids[1], state_swarm_agents, state_malicious_agents
+        )
+
+        for step in range(60):
+            sensing = np.array(
+                [False] * 2 + [(step + pos) % 3 != 0 for pos in range(12)]
+            )
+            committed_to_opinion = np.array([False] * 2 + [step > 40] * 12)
+            recieving = np.array([False] * 2 + [True] * 12)
+
+            for agent in malicious_agents:
+                agent.navigate(self.tile_grids[0])
+
+            for pos, agent in enumerate(swarm_agents):
+                agent.sensing = int(sensing[pos + 2])
+                agent.committed_to_opinion = int(committed_to_opinion[pos + 2])
+                agent.navigate_and_recieve_opinions(self.tile_grids[0])
+
+            swarm_state.step(sensing, committed_to_opinion, recieving)
+
+            np.testing.assert_array_equal(
+                swarm_state.return_sense_broadcast_states(np.arange(2, 14)),
+                [agent.return_sense_broadcast_states() for agent in swarm_agents],
+            )
+
+        np.testing.assert_array_equal(
+            swarm_state.return_nums_of_cells_visited(),
+            [swarm_agent.return_num_of_cells_visited() for swarm_agent in swarm_agents],
+        )
+        swarm_state.write_back_to_agents()
+
+        for agent, state_agent in zip(
+            malicious_agents + swarm_agents, swarm_state.agents
+        ):
+            with self.subTest(agent=agent):
+                self.assertEqual(agent.current_cell, state_agent.current_cell)
+                self.assertEqual(
+                    agent.current_direction_facing,
+                    state_agent.current_direction_facing,
+                )
+
+        for agent, state_agent in zip(swarm_agents, swarm_state.agents[2:]):
+            with self.subTest(agent=agent):
+                self.assertEqual(
+                    agent.num_of_white_cells_observed,
+                    state_agent.num_of_white_cells_observed,
+                )
+                self.assertEqual(
+                    agent.calculated_collective_opinion,
+                    state_agent.calculated_collective_opinion,
+                )
+                self.assertEqual(
+                    agent.return_num_of_cells_visited(),
+                    state_agent.return_num_of_cells_visited(),
+                )
+                self.assertEqual(
+                    set(agent.cells_visited), set(state_agent.cells_visited)
+                )
+
+        np.testing.assert_array_equal(
+            self.tile_grids[0].occupancy, self.tile_grids[1].occupancy
+        )
+
+    def test_synchronous_swarm_state_keeps_one_agent_per_cell(self):
+        for mode, tile_grid in zip(("synchronous", "box_filter"), self.tile_grids):
+            with self.subTest(mode=mode):
+                self.check_synchronous_swarm_state_keeps_one_agent_per_cell(
+                    mode, tile_grid
+                )
+
+    def check_synchronous_swarm_state_keeps_one_agent_per_cell(self, mode, tile_grid):
+        malicious_agents, swarm_agents = return_swarm(tile_grid, seed=3)
+        swarm_state = SwarmState(
+            tile_grid,
+            swarm_agents,
+            malicious_agents,
+            mode=mode,
+            random_number_generator=np.random.default_rng(4),
+        )
+
+        for _ in range(60):
+            swarm_state.step(
+                swarm_state.sensing,
+                swarm_state.committed_to_opinion,
+                ~swarm_state.is_malicious,
+            )
+
+        swarm_state.write_back_to_agents()
+        np.testing.assert_array_equal(
+            swarm_state.return_sense_broadcast_states(np.arange(2, 14)),
+            [agent.return_sense_broadcast_states() for agent in swarm_state.agents[2:]],
+        )
+        np.testing.assert_array_equal(
+            tile_grid.occupancy[swarm_state.rows, swarm_state.columns],
+            swarm_state.grid_indices,
+        )
+
+        with self.subTest():
+            self.assertEqual(
+                np.count_nonzero(tile_grid.occupancy != EMPTY_TILE),
+                swarm_state.num_of_agents,
+            )
+            self.assertTrue(
+                np.all(
+                    (swarm_state.calculated_collective_opinion >= 0)
+                    & (swarm_state.calculated_collective_opinion <= 1)
+                )
+            )
+            self.assertTrue(
+                np.all(swarm_state.num_of_cells_observed[~swarm_state.is_malicious] > 1)
+            )
+
+    def test_neighbour_pairs_match_scanning_each_window(self):
+        tile_grid = create_nonclustered_tile_grid(
+            height=30, width=40, random_number_generator=np.random.default_rng(6)
+        )
+        random_number_generator = np.random.default_rng(7)
+        cells = random_number_generator.choice(30 * 40, size=150, replace=False)
+        swarm_agents = [
+            SwarmAgent(
+                starting_cell=tile_grid[(int(cell) // 40, int(cell) % 40)],
+                communication_range=int(random_number_generator.integers(1, 6)),
+            )
+            for cell in cells
+        ]
+        swarm_state = SwarmState(tile_grid, swarm_agents)
+        agent_indices = np.flatnonzero(random_number_generator.random(150) < 0.7)
+
+        listener_positions, neighbour_indices = swarm_state.return_neighbour_pairs(
+            agent_indices
+        )
+
+        for position, agent_index in enumerate(agent_indices):
+            row_min, row_max, column_min, column_max = (
+                int(bound)
+                for bound in swarm_state.return_communication_bounds(agent_index)
+            )
+            local_area = tile_grid.occupancy[
+                row_min : row_max + 1, column_min : column_max + 1
+            ]
+            scanned_neighbour_indices = [
+                swarm_state.state_indices[grid_index]
+                for grid_index in local_area[local_area != EMPTY_TILE]
+                if swarm_state.state_indices[grid_index] != agent_index
+            ]
+
+            with self.subTest(agent_index=agent_index):
+                self.assertEqual(
+                    neighbour_indices[listener_positions == position].tolist(),
+                    scanned_neighbour_indices,
+                )
+
+    def test_opinion_counts_match_neighbour_pairs(self):
+        malicious_agents, swarm_agents = return_swarm(self.tile_grids[0], seed=3)
+        swarm_state = SwarmState(
+            self.tile_grids[0],
+            swarm_agents,
+            malicious_agents,
+            mode="box_filter",
+            random_number_generator=np.random.default_rng(4),
+        )
+        agent_indices = np.arange(swarm_state.num_of_agents)
+
+        for step in range(20):
+            swarm_state.step(
+                np.arange(swarm_state.num_of_agents) % 3 == step % 3,
+                swarm_state.committed_to_opinion,
+                np.zeros(swarm_state.num_of_agents, bool),
+            )
+            broadcast_opinions = swarm_state.return_broadcast_opinions()
+            listener_positions, neighbour_indices = swarm_state.return_neighbour_pairs(
+                agent_indices
+            )
+            heard_opinions = broadcast_opinions[neighbour_indices]
+
+            with self.subTest(step=step):
+                np.testing.assert_array_equal(
+                    swarm_state.return_opinion_counts(agent_indices),
+                    [
+                        np.bincount(
+                            listener_positions[heard_opinions == opinion],
+                            minlength=swarm_state.num_of_agents,
+                        )
+                        for opinion in (0, 1)
+                    ],
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
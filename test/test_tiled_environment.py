@@ -1,10 +1,12 @@
 import unittest
+import numpy as np
 from numpy import ndarray
 from typing import List, Tuple
 
 from environment_agent_modules import (
     WallType,
     TileColour,
+    EMPTY_TILE,
     navigate_tile_grid_and_call_function_over_range,
     return_ratio_of_white_to_black_tiles,
     create_nonclustered_tile_grid,
@@ -20,6 +22,26 @@ class tiled_environment_tester(unittest.TestCase):
     def test_tiled_enviro_creates_np_array_with_correct_dimensions(self):
         self.assertEqual(self.tiled_enviro.shape, (10, 10))
 
+    def test_tiled_enviro_stores_tiles_as_arrays(self):
+        with self.subTest():
+            self.assertEqual(self.tiled_enviro.colour.dtype, np.uint8)
+            self.assertEqual(self.tiled_enviro.walls.dtype, np.uint8)
+            self.assertEqual(self.tiled_enviro.occupancy.dtype, np.int32)
+            self.assertTrue(np.all(self.tiled_enviro.occupancy == EMPTY_TILE))
+
+    def test_tile_accessor_sets_and_clears_agent(self):
+        agent = object()
+        self.tiled_enviro[(2, 3)]["agent"] = agent
+
+        with self.subTest():
+            self.assertIs(self.tiled_enviro[(2, 3)]["agent"], agent)
+            self.assertEqual(self.tiled_enviro[(2, 3)]["id"], (2, 3))
+            self.assertNotEqual(self.tiled_enviro.occupancy[(2, 3)], EMPTY_TILE)
+
+        self.tiled_enviro[(2, 3)]["agent"] = None
+
+        self.assertIsNone(self.tiled_enviro[(2, 3)]["agent"])
+
     def wall_tester(
         self,
         correct_walls: List[WallType],
@@ -202,6 +224,36 @@ class tiled_environment_tester(unittest.TestCase):
             func=self.wall_tester,
         )
 
+    def test_tiled_enviro_with_multi_digit_coordinates_has_correct_walls(self):
+        new_tiled_environment = create_nonclustered_tile_grid(height=11, width=12)
+
+        with self.subTest():
+            self.assertEqual(
+                new_tiled_environment[(0, 10)]["walls"], (WallType.TOP_WALL.value,)
+            )
+            self.assertEqual(
+                new_tiled_environment[(5, 11)]["walls"], (WallType.RIGHT_WALL.value,)
+            )
+            self.assertEqual(
+                new_tiled_environment[(10, 5)]["walls"], (WallType.BOTTOM_WALL.value,)
+            )
+            self.assertEqual(
+                new_tiled_environment[(10, 11)]["walls"],
+                (WallType.RIGHT_WALL.value, WallType.BOTTOM_WALL.value),
+            )
+            self.assertEqual(new_tiled_environment[(9, 10)]["walls"], ())
+
+    def test_tiled_enviros_of_same_size_share_skeleton(self):
+        new_tiled_environment = create_nonclustered_tile_grid(height=10, width=10)
+
+        with self.subTest():
+            self.assertIs(new_tiled_environment.skeleton, self.tiled_enviro.skeleton)
+            self.assertIsNot(new_tiled_environment.colour, self.tiled_enviro.colour)
+            self.assertIsNot(
+                new_tiled_environment.occupancy, self.tiled_enviro.occupancy
+            )
+            self.assertFalse(new_tiled_environment.walls.flags.writeable)
+
     def test_tiled_enviro_has_approx_correct_ratio_of_white_black_tiles(self):
         new_tiled_environment = create_nonclustered_tile_grid(
             height=15, width=15, ratio_of_white_to_black_tiles=0.7
@@ -213,6 +265,95 @@ class tiled_environment_tester(unittest.TestCase):
             places=1,
         )
 
+    def test_nonclustered_tile_colours_follow_random_draws(self):
+        np.random.seed(0)
+        new_tiled_environment = create_nonclustered_tile_grid(
+            height=20, width=30, ratio_of_white_to_black_tiles=0.62
+        )
+
+        np.random.seed(0)
+        self.assertTrue(
+            np.array_equal(new_tiled_environment.colour, np.random.rand(20, 30) < 0.62)
+        )
+
+    def test_packed_tile_colours_match_unpacked_tile_colours(self):
+        for create_tile_grid in (
+            create_nonclustered_tile_grid,
+            create_clustered_inital_observation_useful_tile_grid,
+            create_clustered_inital_observation_not_useful_tile_grid,
+        ):
+            tile_grid, packed_tile_grid = (
+                create_tile_grid(
+                    height=13,
+                    width=21,
+                    ratio_of_white_to_black_tiles=0.62,
+                    random_number_generator=np.random.default_rng(4),
+                    packed_colours=packed_colours,
+                )
+                for packed_colours in (False, True)
+            )
+
+            with self.subTest(create_tile_grid=create_tile_grid.__name__):
+                self.assertTrue(
+                    np.array_equal(packed_tile_grid.colour.unpack(), tile_grid.colour)
+                )
+                self.assertEqual(
+                    return_ratio_of_white_to_black_tiles(tile_grid=packed_tile_grid),
+                    return_ratio_of_white_to_black_tiles(tile_grid=tile_grid),
+                )
+                self.assertEqual(
+                    packed_tile_grid[12, 20]["colour"], tile_grid.colour[12, 20]
+                )
+
+    def test_tile_grids_carry_their_white_tile_count(self):
+        for create_tile_grid in (
+            create_nonclustered_tile_grid,
+            create_clustered_inital_observation_useful_tile_grid,
+            create_clustered_inital_observation_not_useful_tile_grid,
+        ):
+            for ratio_of_white_to_black_tiles in (0, 0.27, 0.62, 1):
+                tile_grid = create_tile_grid(
+                    height=11,
+                    width=17,
+                    ratio_of_white_to_black_tiles=ratio_of_white_to_black_tiles,
+                )
+
+                with self.subTest(
+                    create_tile_grid=create_tile_grid.__name__,
+                    ratio_of_white_to_black_tiles=ratio_of_white_to_black_tiles,
+                ):
+                    self.assertEqual(
+                        tile_grid.num_of_white_tiles, tile_grid.count_white_tiles()
+                    )
+
+    def test_white_tile_count_follows_colour_changes(self):
+        white_tile_count = self.tiled_enviro.num_of_white_tiles
+        new_colour = 1 - self.tiled_enviro[(4, 5)]["colour"]
+
+        self.tiled_enviro[(4, 5)]["colour"] = new_colour
+        self.tiled_enviro[(4, 5)]["colour"] = new_colour
+
+        self.assertEqual(
+            self.tiled_enviro.num_of_white_tiles,
+            white_tile_count + (1 if new_colour == TileColour.WHITE.value else -1),
+        )
+
+    def test_packed_tile_colour_can_be_set(self):
+        packed_tile_grid = create_nonclustered_tile_grid(
+            height=3, width=10, ratio_of_white_to_black_tiles=0, packed_colours=True
+        )
+
+        packed_tile_grid[1, 9]["colour"] = TileColour.WHITE.value
+
+        with self.subTest():
+            self.assertEqual(packed_tile_grid[1, 9]["colour"], TileColour.WHITE.value)
+            self.assertEqual(packed_tile_grid.count_white_tiles(), 1)
+
+        packed_tile_grid[1, 9]["colour"] = TileColour.BLACK.value
+
+        with self.subTest():
+            self.assertEqual(packed_tile_grid.count_white_tiles(), 0)
+
     def clustered_initial_observations_tester(
         self,
         tile_grid: ndarray,
@@ -0,0 +1,86 @@
+import unittest
+import numpy as np
+
+from environment_agent_modules import (
+    SwarmAgent,
+    VisitedCells,
+    create_nonclustered_tile_grid,
+)
+
+
+class visited_cells_tester(unittest.TestCase):
+    def setUp(self) -> None:
+        self.visited_cells = VisitedCells((5, 11))
+
+    def test_nothing_is_allocated_before_the_first_visit(self):
+        self.assertIsNone(self.visited_cells.bits)
+        self.assertNotIn((0, 0), self.visited_cells)
+        self.assertEqual(len(self.visited_cells), 0)
+
+    def test_visits_are_counted_once(self):
+        for cell in ((0, 0), (4, 10), (2, 7), (2, 8), (4, 10), (0, 0)):
+            self.visited_cells.add(cell)
+
+        with self.subTest():
+            self.assertEqual(len(self.visited_cells), 4)
+            self.assertEqual(len(self.visited_cells.bits), 5 * 2)
+            self.assertIn((2, 8), self.visited_cells)
+            self.assertNotIn((2, 9), self.visited_cells)
+            self.assertEqual(set(self.visited_cells), {(0, 0), (4, 10), (2, 7), (2, 8)})
+
+    def test_packed_bits_round_trip(self):
+        bitmap = np.random.default_rng(0).random((5, 11)) < 0.4
+        self.visited_cells.set_packed_bits(np.packbits(bitmap, axis=1))
+
+        with self.subTest():
+            np.testing.assert_array_equal(self.visited_cells.return_bitmap(), bitmap)
+            self.assertEqual(len(self.visited_cells), np.count_nonzero(bitmap))
+
+    def test_chunked_visits_match_dense_visits(self):
+        cells = [
+            (int(row), int(column))
+            for row, column in np.random.default_rng(1).integers(
+                0, (130, 200), (300, 2)
+            )
+        ]
+        visited_cells, chunked_visited_cells = (
+            VisitedCells((130, 200), chunked=chunked) for chunked in (False, True)
+        )
+
+        for cell in cells:
+            visited_cells.add(cell)
+            chunked_visited_cells.add(cell)
+
+        with self.subTest():
+            self.assertEqual(len(chunked_visited_cells), len(visited_cells))
+            self.assertEqual(set(chunked_visited_cells), set(visited_cells))
+            self.assertNotIn((129, 199), chunked_visited_cells)
+            np.testing.assert_array_equal(
+                chunked_visited_cells.return_packed_bits(),
+                visited_cells.return_packed_bits(),
+            )
+
+        chunked_visited_cells.set_packed_bits(visited_cells.return_packed_bits())
+
+        self.assertEqual(set(chunked_visited_cells), set(visited_cells))
+
+    def test_agents_on_chunked_tile_grids_only_allocate_visited_chunks(self):
+        chunked_tile_grid = create_nonclustered_tile_grid(
+            height=40000,
+            width=40000,
+            random_number_generator=np.random.default_rng(0),
+            chunked=True,
+        )
+        swarm_agent = SwarmAgent(starting_cell=chunked_tile_grid[(20000, 20000)])
+
+        for _ in range(50):
+            swarm_agent.navigate(chunked_tile_grid)
+
+        with self.subTest():
+            self.assertTrue(swarm_agent.cells_visited.chunked)
+            self.assertLessEqual(len(swarm_agent.cells_visited.bits), 4)
+            self.assertGreater(len(swarm_agent.cells_visited), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()